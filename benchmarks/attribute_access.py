@@ -0,0 +1,74 @@
+"""Microbenchmark for reading attributes on pyrefinebio model objects.
+
+Compares attribute reads on a Sample against the per-access lazy loading check that
+Base used to run in `__getattribute__`, and against a plain object as a lower bound.
+
+Run with:
+
+    $ python -m benchmarks.attribute_access
+"""
+import timeit
+
+import pyrefinebio
+
+ATTRIBUTES = ("accession_code", "title", "technology", "platform_name", "is_processed")
+
+SAMPLE = {
+    "id": 1,
+    "accession_code": "GSM000001",
+    "title": "benchmark sample",
+    "technology": "MICROARRAY",
+    "platform_name": "Affymetrix Human Genome U133 Plus 2.0 Array",
+    "is_processed": True,
+}
+
+
+class LegacySample(pyrefinebio.Sample):
+    """A Sample that runs the lazy loading check Base used on every attribute read"""
+
+    def __getattribute__(self, attr):
+        if (
+            not attr.startswith("_")
+            and (
+                object.__getattribute__(self, attr) is None
+                or object.__getattribute__(self, attr) == []
+            )
+            and not self._fetched
+        ):
+            if self._identifier:
+                self._update_from(self.get(self._identifier))
+
+        return object.__getattribute__(self, attr)
+
+
+class Plain:
+    def __init__(self, **kwargs):
+        self.__dict__.update(kwargs)
+
+
+def read(objects):
+    for obj in objects:
+        for attr in ATTRIBUTES:
+            getattr(obj, attr)
+
+
+def main(count=10000, repeat=5):
+    cases = {
+        "plain object": [Plain(**SAMPLE) for _ in range(count)],
+        "Sample (legacy __getattribute__)": [LegacySample(**SAMPLE) for _ in range(count)],
+        "Sample": [pyrefinebio.Sample(**SAMPLE) for _ in range(count)],
+    }
+
+    reads = count * len(ATTRIBUTES)
+    timings = {}
+
+    for name, objects in cases.items():
+        timings[name] = min(timeit.repeat(lambda: read(objects), number=1, repeat=repeat))
+        print("{0:<35} {1:8.1f} ns/read".format(name, timings[name] / reads * 1e9))
+
+    speedup = timings["Sample (legacy __getattribute__)"] / timings["Sample"]
+    print("speedup over legacy: {0:.1f}x".format(speedup))
+
+
+if __name__ == "__main__":
+    main()
@@ -22,9 +22,14 @@ from pyrefinebio.exceptions import (
     InvalidData,
     NotFound,
     DownloadError,
-    MultipleErrors
+    MultipleErrors,
+    MissingObjects
 )
 
+from pyrefinebio.api_interface import close_session
+from pyrefinebio.base import hydrate
+from pyrefinebio.identity import identity_map
+
 from pyrefinebio.high_level_functions import (
     help,
     download_dataset,
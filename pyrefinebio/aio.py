@@ -0,0 +1,621 @@
+"""Asyncio client for the refine.bio API.
+
+The classes in this module mirror the model classes in `pyrefinebio` but their
+methods that make requests are coroutines. They return the regular pyrefinebio
+model objects so the rest of the package can be used with the results.
+
+Requests made through this module share the rate limiter, retry policy and error handling
+used by the rest of pyrefinebio.
+
+This module requires `aiohttp` which can be installed with:
+
+.. code-block:: shell
+
+    $ pip install pyrefinebio[aio]
+
+Example:
+
+    >>> import asyncio
+    >>> from pyrefinebio import aio
+    >>>
+    >>> async def main():
+    >>>     sample = await aio.Sample.get("GSM000000")
+    >>>     async for sample in await aio.Sample.search(is_processed=True):
+    >>>         print(sample.accession_code)
+    >>>     await aio.close_session()
+    >>>
+    >>> asyncio.run(main())
+
+Objects returned by this module are marked as fetched, so reading an unset attribute
+will not make a blocking request from inside the event loop. Nested objects, like the
+ComputedFiles listed on a Sample, are still fetched lazily and synchronously.
+"""
+import asyncio
+import json
+import math
+
+try:
+    import aiohttp
+    import yarl
+    from multidict import CIMultiDict, CIMultiDictProxy
+except ImportError:
+    raise ImportError(
+        "pyrefinebio.aio requires aiohttp. You can install it with `pip install pyrefinebio[aio]`"
+    )
+
+import pyrefinebio
+from pyrefinebio.api_interface import (
+    MAX_RATE_LIMIT_RETRIES,
+    _PartFile,
+    _raise_for_status_code,
+    limiter,
+    retry_policy,
+    throttle,
+)
+from pyrefinebio.config import Config
+from pyrefinebio.exceptions import DownloadError, ServerError
+from pyrefinebio.rate_limit import retry_after
+from pyrefinebio.response_cache import request_key
+from pyrefinebio.single_flight import AsyncSingleFlight
+from pyrefinebio.util import expand_path, strip_pagination, with_page_size
+
+CONFIG = Config()
+
+in_flight = AsyncSingleFlight()
+
+_sessions = {}
+
+
+class Response:
+    """The parts of an API response that pyrefinebio uses.
+
+    Mirrors the interface of `requests.Response` that the rest of pyrefinebio relies on.
+    """
+
+    def __init__(self, url, status_code, headers, body, request_info=None, history=()):
+        self.url = url
+        self.status_code = status_code
+        self.headers = headers
+        self._body = body
+        self.request_info = request_info
+        self.history = history
+
+    def json(self):
+        return self._body
+
+
+async def get_session():
+    """Get the aiohttp session used by the running event loop.
+
+    Sessions are bound to an event loop, so one is created for each loop that makes requests.
+    The session keeps up to `Config.api_pool_size` connections open.
+
+    Returns:
+        aiohttp.ClientSession
+    """
+    loop = asyncio.get_event_loop()
+    session = _sessions.get(loop)
+
+    if session is None or session.closed:
+        connector = aiohttp.TCPConnector(limit=CONFIG.api_pool_size)
+        session = aiohttp.ClientSession(connector=connector)
+        _sessions[loop] = session
+
+    return session
+
+
+async def close_session():
+    """Close the aiohttp session used by the running event loop."""
+    session = _sessions.pop(asyncio.get_event_loop(), None)
+
+    if session is not None:
+        await session.close()
+
+
+def _prepare_params(params):
+    # aiohttp only accepts strings and numbers as query values, so match what requests
+    # would have sent: drop None values, expand lists, and stringify everything else
+    prepared = []
+
+    for key, value in (params or {}).items():
+        if value is None:
+            continue
+
+        values = value if isinstance(value, (list, tuple)) else [value]
+        prepared.extend((key, str(v)) for v in values)
+
+    return prepared
+
+
+async def _send(method, url, params=None, payload=None, headers=None):
+    session = await get_session()
+
+    async with session.request(
+        method, url, params=_prepare_params(params), data=payload, headers=headers
+    ) as response:
+        text = await response.text()
+
+        try:
+            body = json.loads(text)
+        except json.decoder.JSONDecodeError:
+            body = text
+
+        return Response(
+            str(response.url),
+            response.status,
+            response.headers,
+            body,
+            request_info=response.request_info,
+            history=response.history,
+        )
+
+
+async def _send_throttled(method, url, params=None, payload=None, headers=None):
+    for _ in range(MAX_RATE_LIMIT_RETRIES + 1):
+        remaining = throttle.remaining()
+
+        if remaining:
+            await asyncio.sleep(remaining)
+
+        async with limiter.ratelimit("refinebio", delay=True):
+            response = await _send(method, url, params=params, payload=payload, headers=headers)
+
+        if response.status_code != 429:
+            break
+
+        throttle.pause(retry_after(response))
+
+    return response
+
+
+async def request(method, url, params=None, payload=None):
+    if method != "GET":
+        return await _request(method, url, params=params, payload=payload)
+
+    # concurrent requests for the same url share a single response
+    return await in_flight.do(request_key(url, params), lambda: _request(method, url, params))
+
+
+async def _request(method, url, params=None, payload=None):
+    headers = {"Content-Type": "application/json", "API-KEY": CONFIG.token}
+
+    if payload:
+        payload = json.dumps(payload)
+
+    attempt = 0
+
+    while True:
+        try:
+            response = await _send_throttled(
+                method, url, params=params, payload=payload, headers=headers
+            )
+        except aiohttp.ClientConnectionError:
+            if not retry_policy.should_retry(method, attempt):
+                raise ServerError()
+
+            await asyncio.sleep(retry_policy.delay(attempt))
+        else:
+            if not retry_policy.should_retry(method, attempt, response):
+                break
+
+            await asyncio.sleep(retry_policy.delay(attempt, response))
+
+        attempt += 1
+
+    if response.status_code >= 400:
+        _raise_for_status_code(response.status_code, response.url, response.json())
+
+        request_info = response.request_info or aiohttp.RequestInfo(
+            yarl.URL(response.url), method, CIMultiDictProxy(CIMultiDict())
+        )
+
+        raise aiohttp.ClientResponseError(
+            request_info,
+            response.history,
+            status=response.status_code,
+            message=str(response.json()),
+            headers=response.headers,
+        )
+
+    return response
+
+
+async def get(url, params=None):
+    return await request("GET", url, params=params)
+
+
+async def post(url, payload=None):
+    return await request("POST", url, payload=payload)
+
+
+async def put(url, payload=None):
+    return await request("PUT", url, payload=payload)
+
+
+async def get_by_endpoint(endpoint, params=None):
+    return await get(CONFIG.base_url + endpoint + "/", params=params)
+
+
+async def post_by_endpoint(endpoint, payload=None):
+    return await post(CONFIG.base_url + endpoint + "/", payload=payload)
+
+
+async def put_by_endpoint(endpoint, payload=None):
+    return await put(CONFIG.base_url + endpoint + "/", payload=payload)
+
+
+async def download_file(url, path, chunk_size=1024 * 1024, sha1=None, size_in_bytes=None):
+    """Stream the file at `url` to `path` without blocking the event loop.
+
+    Like `pyrefinebio.api_interface.download_file`, the file is written to `<path>.part`
+    and only moved to `path` once it is complete and matches `sha1` and `size_in_bytes`.
+    The file is written from the loop's default executor so disk I/O doesn't block it.
+    """
+    session = await get_session()
+
+    try:
+        async with session.get(url) as response:
+            response.raise_for_status()
+
+            size = response.content_length if response.content_length is not None else -1
+            part = await _in_executor(_PartFile, path, size, response.headers.get("etag"), sha1)
+            await _in_executor(part.reset)
+
+            f = await _in_executor(open, part.part_path, "r+b")
+
+            try:
+                async for chunk in response.content.iter_chunked(chunk_size):
+                    await _in_executor(_write_chunk, f, part, chunk)
+            finally:
+                # keep whatever was written if the connection drops
+                written = await _in_executor(_close, f)
+
+                if written:
+                    await _in_executor(part.add, 0, written)
+    except aiohttp.ClientError as e:
+        raise DownloadError("file", str(e))
+
+    await _in_executor(part.finish, size_in_bytes)
+
+
+def _in_executor(function, *args):
+    return asyncio.get_running_loop().run_in_executor(None, function, *args)
+
+
+def _write_chunk(f, part, chunk):
+    part.written(f.tell(), chunk)
+    f.write(chunk)
+
+
+def _close(f):
+    written = f.tell()
+    f.close()
+    return written
+
+
+def _build(T, data):
+    instance = T(**data)
+    instance._set_fetched()
+    return instance
+
+
+class PaginatedList:
+    """Async PaginatedList
+
+    Returned by the `search` coroutines in `pyrefinebio.aio`.
+    Use `async for` to iterate through every result - pages are requested as they are needed.
+    Single items can be retrieved with `await paginated_list.get(index)`.
+    """
+
+    def __init__(self, T, response):
+        self.type = T
+        self.base_url = strip_pagination(response.url)
+
+        json = response.json()
+
+        self.total_items = json["count"]
+        self.page_size = len(json["results"])
+
+        self.num_pages = math.ceil(self.total_items / self.page_size) if self.page_size else 1
+
+        self.pages = [None for _ in range(self.num_pages)]
+        self.pages[0] = [_build(T, item) for item in json["results"]]
+
+    def __len__(self):
+        return self.total_items
+
+    async def get_page(self, page):
+        """Get a page of results
+
+        Returns:
+            list
+
+        Parameters:
+            page (int): the index of the page to get
+        """
+        if self.pages[page] is None:
+            params = {"offset": page * self.page_size, "limit": self.page_size}
+
+            response = (await get(self.base_url, params=params)).json()
+
+            if self.total_items != response["count"]:
+                raise RuntimeError("List has changed since creation!")
+
+            self.pages[page] = [_build(self.type, item) for item in response["results"]]
+
+        return self.pages[page]
+
+    async def get(self, index):
+        """Get a single result
+
+        Parameters:
+            index (int): the index of the result to get
+        """
+        if index < 0:
+            index += self.total_items
+
+        if index >= self.total_items or index < 0:
+            raise IndexError("index out of range!")
+
+        page = int(index / self.page_size)
+        return (await self.get_page(page))[index - page * self.page_size]
+
+    async def __aiter__(self):
+        for page in range(self.num_pages):
+            for item in await self.get_page(page):
+                yield item
+
+
+class _Model:
+    model = None
+    endpoint = None
+    search_endpoint = None
+
+    @classmethod
+    async def get(cls, identifier):
+        response = await get_by_endpoint(cls.endpoint + "/" + str(identifier))
+        return _build(cls.model, response.json())
+
+    @classmethod
+    async def search(cls, **kwargs):
+        response = await get_by_endpoint(
+            cls.search_endpoint or cls.endpoint, params=with_page_size(kwargs)
+        )
+        return PaginatedList(cls.model, response)
+
+
+class Compendium(_Model):
+    """Async version of `pyrefinebio.Compendium`"""
+
+    model = pyrefinebio.Compendium
+    endpoint = "compendia"
+
+
+class ComputationalResult(_Model):
+    """Async version of `pyrefinebio.ComputationalResult`"""
+
+    model = pyrefinebio.ComputationalResult
+    endpoint = "computational_results"
+
+
+class ComputedFile(_Model):
+    """Async version of `pyrefinebio.ComputedFile`"""
+
+    model = pyrefinebio.ComputedFile
+    endpoint = "computed_files"
+
+
+class DownloaderJob(_Model):
+    """Async version of `pyrefinebio.DownloaderJob`"""
+
+    model = pyrefinebio.DownloaderJob
+    endpoint = "jobs/downloader"
+
+
+class Experiment(_Model):
+    """Async version of `pyrefinebio.Experiment`"""
+
+    model = pyrefinebio.Experiment
+    endpoint = "experiments"
+    search_endpoint = "search"
+
+
+class Organism(_Model):
+    """Async version of `pyrefinebio.Organism`"""
+
+    model = pyrefinebio.Organism
+    endpoint = "organisms"
+
+
+class OriginalFile(_Model):
+    """Async version of `pyrefinebio.OriginalFile`"""
+
+    model = pyrefinebio.OriginalFile
+    endpoint = "original_files"
+
+
+class Processor(_Model):
+    """Async version of `pyrefinebio.Processor`"""
+
+    model = pyrefinebio.Processor
+    endpoint = "processors"
+
+
+class ProcessorJob(_Model):
+    """Async version of `pyrefinebio.ProcessorJob`"""
+
+    model = pyrefinebio.ProcessorJob
+    endpoint = "jobs/processor"
+
+
+class Sample(_Model):
+    """Async version of `pyrefinebio.Sample`"""
+
+    model = pyrefinebio.Sample
+    endpoint = "samples"
+
+
+class SurveyJob(_Model):
+    """Async version of `pyrefinebio.SurveyJob`"""
+
+    model = pyrefinebio.SurveyJob
+    endpoint = "jobs/survey"
+
+
+class TranscriptomeIndex(_Model):
+    """Async version of `pyrefinebio.TranscriptomeIndex`"""
+
+    model = pyrefinebio.TranscriptomeIndex
+    endpoint = "transcriptome_indices"
+
+
+class QNTarget(_Model):
+    """Async version of `pyrefinebio.QNTarget`"""
+
+    model = pyrefinebio.QNTarget
+    endpoint = "qn_targets"
+
+    @classmethod
+    async def search(cls, **kwargs):
+        response = await get_by_endpoint(cls.endpoint, params=kwargs)
+        return [_build(pyrefinebio.Organism, organism) for organism in response.json()]
+
+
+class Platform:
+    """Async version of `pyrefinebio.Platform`"""
+
+    @classmethod
+    async def search(cls, **kwargs):
+        response = await get_by_endpoint("platforms", params=kwargs)
+        return [pyrefinebio.Platform(**platform) for platform in response.json()]
+
+
+class Institution:
+    """Async version of `pyrefinebio.Institution`"""
+
+    @classmethod
+    async def search(cls):
+        response = await get_by_endpoint("institutions")
+        return [pyrefinebio.Institution(**institution) for institution in response.json()]
+
+
+class Dataset(pyrefinebio.Dataset):
+    """Async version of `pyrefinebio.Dataset`
+
+    Datasets are constructed the same way as `pyrefinebio.Dataset` but `get`, `save`,
+    `process`, `check`, `wait`, and `download` are coroutines.
+
+        >>> from pyrefinebio import aio
+        >>> dataset = aio.Dataset(email_address="example@refine.bio", data={"SRP003819": ["ALL"]})
+        >>> await dataset.process()
+        >>> await dataset.wait()
+        >>> await dataset.download("~/datasets/my_dataset.zip")
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self._fetched = True
+
+    @classmethod
+    async def get(cls, id):
+        """Retrieve a specific Dataset based on id
+
+        Returns:
+            Dataset
+
+        Parameters:
+            id (str): the guid id for the Dataset you want to get
+        """
+        response = await get_by_endpoint("dataset/" + id)
+        return cls(**response.json())
+
+    async def save(self):
+        """Save a Dataset
+
+        See `pyrefinebio.Dataset.save`
+
+        Returns:
+            Dataset
+        """
+        body = self._request_body()
+
+        if self.id is not None:
+            response = await put_by_endpoint("dataset/" + self.id, payload=body)
+        else:
+            response = await post_by_endpoint("dataset", payload=body)
+
+        self._update_from_response(response.json())
+
+        return self
+
+    async def process(self):
+        """Start processing a Dataset
+
+        Returns:
+            void
+        """
+        self.start = True
+        response = await self.save()
+        self.is_processing = response.is_processing
+
+    async def check(self):
+        """Check to see if a Dataset has finished processing
+
+        Returns:
+            bool
+        """
+        response = await self.get(self.id)
+        self.is_processing = response.is_processing
+        self.is_processed = response.is_processed
+        self.download_url = response.download_url
+        return response.is_processed
+
+    async def wait(self, poll_interval=5, timeout=None):
+        """Wait for a Dataset to finish processing without blocking the event loop
+
+        Returns:
+            bool: true if the Dataset was processed, false if processing failed
+
+        Parameters:
+            poll_interval (int): how many seconds to wait between checks
+
+            timeout (int): if specified, raises asyncio.TimeoutError after this many seconds
+        """
+
+        async def poll():
+            while not await self.check():
+                if not self.is_processing:
+                    return False
+                await asyncio.sleep(poll_interval)
+            return True
+
+        return await asyncio.wait_for(poll(), timeout)
+
+    async def download(self, path):
+        """Download a processed Dataset
+
+        Unlike `pyrefinebio.Dataset.download` this never prompts before downloading large files.
+
+        Returns:
+            Dataset
+
+        Parameters:
+            path (str): the path that the Dataset should be downloaded to
+        """
+        dataset = self if self.download_url else await self.get(self.id)
+        download_url = dataset.download_url
+
+        if not download_url:
+            raise DownloadError(
+                "Dataset",
+                "Download url not found - make sure you have set up and activated your Token "
+                "and that the Dataset has been processed.",
+            )
+
+        full_path = expand_path(path, "dataset-" + str(self.id) + ".zip")
+
+        await download_file(download_url, full_path, sha1=dataset.sha1)
+
+        self._downloaded_path = full_path
+
+        return self
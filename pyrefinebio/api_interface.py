@@ -1,13 +1,20 @@
+import atexit
+import hashlib
 import json
-import shutil
+import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 
 import requests
-from pyrate_limiter import Duration, Limiter, RequestRate
+import urllib3
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError
 
 from pyrefinebio.config import Config
+from pyrefinebio.download_cache import DownloadCache
 from pyrefinebio.exceptions import (
     BadRequest,
+    DownloadError,
     InvalidData,
     InvalidFilters,
     InvalidFilterType,
@@ -15,22 +22,168 @@ from pyrefinebio.exceptions import (
     NotFound,
     ServerError,
 )
+from pyrefinebio.rate_limit import create_limiter, create_throttle, retry_after
+from pyrefinebio.response_cache import (
+    ResponseCache,
+    is_fresh,
+    request_key,
+    to_response,
+    validators,
+)
+from pyrefinebio.retry import RetryPolicy
+from pyrefinebio.single_flight import SingleFlight
 
 CONFIG = Config()
 
-# Rate limit the API requests per second.
-limiter = Limiter(RequestRate(CONFIG.api_max_calls_per_second, Duration.SECOND))
+# Rate limit the API requests per second, across processes if `Config.api_rate_limit_path`
+# is set, and pause them when the API responds with 429 Too Many Requests.
+limiter = create_limiter(CONFIG)
+throttle = create_throttle(CONFIG)
+
+# How many times a request is sent again after a 429 response before giving up.
+MAX_RATE_LIMIT_RETRIES = 5
+
+# Retry GET requests that fail with connection errors or 5xx responses.
+retry_policy = RetryPolicy.from_config(CONFIG)
+
+# Cache GET responses from metadata endpoints, if it is turned on in the Config.
+response_cache = ResponseCache.from_config(CONFIG)
+
+# GET requests that are in progress, so identical ones made at the same time are sent once.
+in_flight = SingleFlight()
+
+# A single pooled session is shared by every request so that connections to the API
+# are kept alive and reused instead of being re-established for each call.
+_session = None
+_session_lock = threading.Lock()
+
+
+def get_session():
+    """Get the shared requests.Session used to talk to the refine.bio API.
+
+    The session is created on first use and keeps up to `Config.api_pool_size`
+    connections open per host, or `Config.download_workers` if that is larger.
+
+    Returns:
+        requests.Session
+    """
+    global _session
+
+    with _session_lock:
+        if _session is None:
+            pool_size = max(CONFIG.api_pool_size, CONFIG.download_workers)
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            _session = requests.Session()
+            _session.mount("https://", adapter)
+            _session.mount("http://", adapter)
+
+        return _session
+
+
+def close_session():
+    """Close the shared session and release its pooled connections.
+
+    A new session will be created the next time a request is made.
+    """
+    global _session
+
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+            _session = None
+
+
+atexit.register(close_session)
 
 
 @limiter.ratelimit("refinebio", delay=True)
+def _send(method, url, params=None, data=None, headers=None):
+    return get_session().request(method, url, params=params, data=data, headers=headers)
+
+
+def _send_throttled(method, url, params=None, data=None, headers=None):
+    """Send a request, waiting and sending it again if the API says it is rate limited"""
+    for _ in range(MAX_RATE_LIMIT_RETRIES + 1):
+        throttle.wait()
+
+        response = _send(method, url, params=params, data=data, headers=headers)
+
+        if response.status_code != 429:
+            break
+
+        throttle.pause(retry_after(response))
+
+    return response
+
+
 def request(method, url, params=None, payload=None):
+    if method != "GET":
+        return _request(method, url, params=params, payload=payload)
+
+    # concurrent requests for the same url share a single response
+    return in_flight.do(request_key(url, params), lambda: _get(url, params=params))
+
+
+def _get(url, params=None):
+    if response_cache is not None:
+        return _cached_get(url, params=params)
+
+    return _request("GET", url, params=params)
+
+
+def _cached_get(url, params=None):
+    """GET a url, using the cached response if it is fresh or the API says it hasn't changed"""
+    ttl = response_cache.ttl(url)
+
+    if not ttl:
+        return _request("GET", url, params=params)
+
+    key = response_cache.key(url, params, CONFIG.token)
+    entry = response_cache.get(key)
+
+    if entry and is_fresh(entry):
+        return to_response(entry)
+
+    response = _request("GET", url, params=params, headers=validators(entry) if entry else None)
+
+    if response.status_code == 304 and entry:
+        return to_response(response_cache.refresh(key, entry, ttl))
+
+    if response.status_code == 200:
+        response_cache.store(key, response, ttl)
+
+    return response
+
+
+def _request(method, url, params=None, payload=None, headers=None):
     try:
-        headers = {"Content-Type": "application/json", "API-KEY": CONFIG.token}
+        headers = dict(
+            {"Content-Type": "application/json", "API-KEY": CONFIG.token}, **(headers or {})
+        )
 
         if payload:
             payload = json.dumps(payload)
 
-        response = requests.request(method, url, params=params, data=payload, headers=headers)
+        attempt = 0
+
+        while True:
+            try:
+                response = _send_throttled(
+                    method, url, params=params, data=payload, headers=headers
+                )
+            except ConnectionError:
+                if not retry_policy.should_retry(method, attempt):
+                    raise
+
+                retry_policy.wait(attempt)
+            else:
+                if not retry_policy.should_retry(method, attempt, response):
+                    break
+
+                retry_policy.wait(attempt, response)
+
+            attempt += 1
+
         response.raise_for_status()
 
         return response
@@ -42,19 +195,10 @@ def request(method, url, params=None, payload=None):
         except json.decoder.JSONDecodeError:
             response_body = response.text
 
-        if code == 400:
-            error = _handle_error(response_body)
-            raise error
-
-        elif code == 404:
-            raise NotFound(response.url)
-
-        elif code >= 500:
-            raise ServerError()
+        _raise_for_status_code(code, response.url, response_body)
 
-        else:
-            print(response_body)
-            raise e
+        print(response_body)
+        raise e
     except ConnectionError:
         raise ServerError()
 
@@ -89,11 +233,53 @@ def put_by_endpoint(endpoint, payload=None):
     return put(url, payload=payload)
 
 
-def download_file(url, path, prompt):
-    with requests.get(url, stream=True) as res:
+def download_file(url, path, prompt, sha1=None, size_in_bytes=None):
+    """Download the file at `url` to `path`.
 
-        if prompt:
+    If `sha1` or `size_in_bytes` are given the downloaded file is checked against them
+    before it is moved to `path`, and a DownloadError is raised if it doesn't match. The
+    SHA-1 is computed as the file is written rather than by reading it again afterwards.
+
+    The file is written to `<path>.part` and moved to `path` once it is complete. The byte
+    ranges that have been written are recorded in `<path>.part.json`, so if a download is
+    interrupted, downloading the same file to the same path again resumes where it stopped
+    using Range requests.
+
+    If `Config.download_workers` is more than 1 and the server accepts Range requests,
+    the file is split into `Config.download_chunk_size` chunks that are downloaded
+    concurrently and written in place. Otherwise the file is downloaded in a single stream.
+
+    If `Config.download_cache_dir` is set, files with a `sha1` are kept in a
+    `pyrefinebio.download_cache.DownloadCache` and linked from it when they are
+    downloaded again.
+    """
+    if not (sha1 and CONFIG.download_cache_dir):
+        _download_file(url, path, prompt, sha1, size_in_bytes)
+        return
+
+    cache = DownloadCache(CONFIG.download_cache_dir, CONFIG.download_cache_size)
+
+    with cache.lock(sha1):
+        if cache.fetch(sha1, path):
+            return
+
+        if _download_file(url, path, prompt, sha1, size_in_bytes):
+            cache.store(sha1, path)
+
+
+def _download_file(url, path, prompt, sha1, size_in_bytes):
+    """Download a file, returning False if the download was declined at the prompt"""
+    # asking for the first byte gets the size of the file and whether the server accepts
+    # Range requests without it starting to send the whole file
+    with get_session().get(url, headers={"Range": "bytes=0-0"}, stream=True) as res:
+        if res.status_code == 206:
+            total_size_in_bytes = _content_range_size(res.headers.get("content-range"))
+        elif res.status_code == 200:
             total_size_in_bytes = int(res.headers.get("content-length", -1))
+        else:
+            total_size_in_bytes = -1
+
+        if prompt:
             message = None
 
             if total_size_in_bytes == -1:
@@ -111,10 +297,314 @@ def download_file(url, path, prompt):
                 yn = input(message)
 
                 if yn.lower() not in ("y", "yes"):
-                    return
+                    return False
+
+        part = _PartFile(path, total_size_in_bytes, res.headers.get("etag"), sha1)
+
+        if res.status_code == 200:
+            # the server ignored the Range header and is already sending the whole file
+            part.reset()
+            _write_stream(res, part, 0)
+            part.finish(size_in_bytes)
+            return True
+
+        accepts_ranges = res.status_code == 206 and total_size_in_bytes > 0
+
+    parallel = CONFIG.download_workers > 1 and total_size_in_bytes > CONFIG.download_chunk_size
+
+    if accepts_ranges and (part.completed or parallel):
+        try:
+            _download_ranges(url, part)
+            part.finish(size_in_bytes)
+            return True
+        except _RangeNotSatisfied:
+            # the server ignored the Range header, so fall back to a single stream
+            pass
+
+    with get_session().get(url, stream=True) as res:
+        part.reset()
+        _write_stream(res, part, 0)
+
+    part.finish(size_in_bytes)
+    return True
+
+
+def _content_range_size(content_range):
+    """Get the full size of a file from a `Content-Range: bytes 0-0/<size>` header, or -1"""
+    try:
+        return int(content_range.split("/")[1])
+    except (AttributeError, IndexError, ValueError):
+        return -1
+
+
+# How often progress is recorded in the manifest while a stream is being written.
+_CHECKPOINT_BYTES = 8 * 1024 * 1024
+_READ_BYTES = 1024 * 1024
+
+
+class _RangeNotSatisfied(Exception):
+    pass
+
+
+class _PartFile:
+    """A download in progress
+
+    The data is written to `<path>.part` and the half-open byte ranges that have been
+    written are kept in the `<path>.part.json` manifest. A manifest is only reused if the
+    size and etag of the file being downloaded match the ones it was written for.
+
+    If a `sha1` is expected, data written at the end of the hashed prefix of the file is
+    hashed as it is written. Ranges that finish out of order are hashed from the part file
+    once the ranges before them are complete, while they are still in the page cache.
+    """
+
+    def __init__(self, path, size, etag, sha1=None):
+        self.path = path
+        self.part_path = path + ".part"
+        self.manifest_path = self.part_path + ".json"
+        self.size = size
+        self.etag = etag
+        self.completed = []
+        self._lock = threading.Lock()
+
+        self.sha1 = sha1.lower() if sha1 else None
+        self._hash = None
+        self._hashed = 0
+        self._hash_lock = threading.Lock()
+
+        if size > 0:
+            self._load()
+
+    def _load(self):
+        try:
+            with open(self.manifest_path) as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            return
+
+        if (
+            manifest.get("size") == self.size
+            and manifest.get("etag") == self.etag
+            and os.path.exists(self.part_path)
+            and os.path.getsize(self.part_path) == self.size
+        ):
+            self.completed = [tuple(r) for r in manifest.get("completed", [])]
+
+    def reset(self):
+        """Start over with an empty part file"""
+        self.completed = []
+        self._hash = None
+        self._hashed = 0
+
+        with open(self.part_path, "wb") as f:
+            # preallocate the file so chunks can be written at their own offsets
+            if self.size > 0:
+                f.truncate(self.size)
+
+        self._save()
+
+    def add(self, start, end):
+        """Record that the bytes from `start` up to `end` have been written"""
+        with self._lock:
+            ranges = sorted(self.completed + [(start, end)])
+
+            merged = [ranges[0]]
+            for first, last in ranges[1:]:
+                if first <= merged[-1][1]:
+                    merged[-1] = (merged[-1][0], max(merged[-1][1], last))
+                else:
+                    merged.append((first, last))
+
+            self.completed = merged
+            self._save()
+
+    def written(self, offset, data):
+        """Hash data that has just been written at `offset` if it continues the hashed prefix"""
+        if not self.sha1:
+            return
+
+        with self._hash_lock:
+            if self._hash is None:
+                self._hash = hashlib.sha1()
+
+            if offset == self._hashed:
+                self._hash.update(data)
+                self._hashed += len(data)
+
+    def catch_up(self):
+        """Hash the completed data after the hashed prefix that was written out of order"""
+        if not self.sha1:
+            return
+
+        with self._lock:
+            end = self.completed[0][1] if self.completed and self.completed[0][0] == 0 else 0
+
+        with self._hash_lock:
+            if self._hash is None:
+                self._hash = hashlib.sha1()
+
+            if end <= self._hashed:
+                return
+
+            with open(self.part_path, "rb") as f:
+                f.seek(self._hashed)
+
+                while self._hashed < end:
+                    data = f.read(min(_READ_BYTES, end - self._hashed))
+                    if not data:
+                        break
+
+                    self._hash.update(data)
+                    self._hashed += len(data)
+
+    def missing(self, chunk_size):
+        """Get the inclusive byte ranges that still have to be downloaded"""
+        ranges = []
+        position = 0
+
+        for start, end in self.completed + [(self.size, self.size)]:
+            if start > position:
+                ranges += _byte_ranges(start, chunk_size, position)
+            position = max(position, end)
+
+        return ranges
+
+    def _save(self):
+        if self.size <= 0:
+            return
+
+        manifest = {"size": self.size, "etag": self.etag, "completed": self.completed}
+
+        with open(self.manifest_path + ".tmp", "w") as f:
+            json.dump(manifest, f)
+        os.replace(self.manifest_path + ".tmp", self.manifest_path)
+
+    def finish(self, size_in_bytes=None):
+        """Check the part file and move it to its final path once every byte has been written"""
+        if self.size > 0 and self.completed != [(0, self.size)]:
+            raise DownloadError("file", "The download is incomplete, try downloading it again")
+
+        size = os.path.getsize(self.part_path)
+
+        if size_in_bytes is not None and size != size_in_bytes:
+            self.discard()
+            raise DownloadError(
+                "file", "Expected {0} bytes but downloaded {1}".format(size_in_bytes, size)
+            )
+
+        if self.sha1:
+            self.catch_up()
+
+            # an unknown size is only checked once the whole stream has been hashed
+            sha1 = self._hash.hexdigest() if self._hashed == size else None
+
+            if sha1 != self.sha1:
+                self.discard()
+                raise DownloadError(
+                    "file", "SHA-1 mismatch: expected {0} but got {1}".format(self.sha1, sha1)
+                )
 
-        with open(path, "wb") as f:
-            shutil.copyfileobj(res.raw, f)
+        os.replace(self.part_path, self.path)
+
+        if os.path.exists(self.manifest_path):
+            os.remove(self.manifest_path)
+
+    def discard(self):
+        """Remove a part file that can't be resumed"""
+        for path in (self.part_path, self.manifest_path):
+            if os.path.exists(path):
+                os.remove(path)
+
+
+def _byte_ranges(size, chunk_size, start=0):
+    """Split the bytes from `start` to `size` into inclusive (start, end) ranges of at most
+    `chunk_size` bytes"""
+    return [(i, min(i + chunk_size, size) - 1) for i in range(start, size, chunk_size)]
+
+
+def _write_stream(res, part, start):
+    """Write a response body to the part file at `start`, recording progress as it goes"""
+    with open(part.part_path, "r+b") as f:
+        f.seek(start)
+        checkpoint = start
+
+        try:
+            while True:
+                data = res.raw.read(_READ_BYTES)
+                if not data:
+                    break
+
+                part.written(f.tell(), data)
+                f.write(data)
+
+                if f.tell() - checkpoint >= _CHECKPOINT_BYTES:
+                    f.flush()
+                    part.add(checkpoint, f.tell())
+                    checkpoint = f.tell()
+        except (requests.exceptions.RequestException, urllib3.exceptions.HTTPError) as e:
+            raise DownloadError(
+                "file",
+                "The connection was lost, download the file again to resume it: {0}".format(e),
+            )
+        finally:
+            # keep whatever was written if the connection drops so it isn't fetched again
+            f.flush()
+
+            if f.tell() > checkpoint:
+                part.add(checkpoint, f.tell())
+
+        return f.tell()
+
+
+def _download_range(url, part, start, end):
+    headers = {"Range": "bytes={0}-{1}".format(start, end)}
+
+    with get_session().get(url, headers=headers, stream=True) as res:
+        if res.status_code == 200:
+            raise _RangeNotSatisfied()
+
+        if res.status_code != 206:
+            raise DownloadError(
+                "file", "Range {0}-{1} failed with status {2}".format(start, end, res.status_code)
+            )
+
+        if _write_stream(res, part, start) != end + 1:
+            raise DownloadError("file", "Range {0}-{1} was incomplete".format(start, end))
+
+    part.catch_up()
+
+
+def _download_ranges(url, part):
+    if not part.completed:
+        part.reset()
+
+    ranges = part.missing(CONFIG.download_chunk_size)
+    workers = min(CONFIG.download_workers, len(ranges)) or 1
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(_download_range, url, part, *r) for r in ranges]
+
+        try:
+            for future in futures:
+                future.result()
+        finally:
+            for future in futures:
+                future.cancel()
+
+
+def _raise_for_status_code(code, url, response_body):
+    """Raise the pyrefinebio exception that matches an error response.
+
+    Returns without raising if the status code has no pyrefinebio exception.
+    """
+    if code == 400:
+        raise _handle_error(response_body)
+
+    if code == 404:
+        raise NotFound(url)
+
+    if code >= 500:
+        raise ServerError()
 
 
 def _handle_error(response_body):
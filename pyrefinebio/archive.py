@@ -0,0 +1,122 @@
+"""Read the files in a downloaded archive without unpacking all of it.
+
+Datasets and Compendia are downloaded as zip files that hold a large expression matrix
+alongside small metadata files. These functions list the files in an archive, extract
+only the ones matching a glob, or stream a single file straight out of the archive.
+Zip and tar archives are supported.
+"""
+import fnmatch
+import io
+import os
+import tarfile
+import zipfile
+from contextlib import contextmanager
+
+from pyrefinebio.exceptions import MissingFile
+
+
+def _is_zip(path):
+    return zipfile.is_zipfile(path)
+
+
+def list_members(path):
+    """List the files in an archive
+
+    Returns:
+        list of str
+
+    Parameters:
+        path (str): the path to the archive
+    """
+    if _is_zip(path):
+        with zipfile.ZipFile(path) as archive:
+            return [info.filename for info in archive.infolist() if not info.is_dir()]
+
+    with tarfile.open(path) as archive:
+        return [member.name for member in archive.getmembers() if member.isfile()]
+
+
+def match_members(path, patterns):
+    """Get the files in an archive that match any of the glob `patterns`"""
+    if isinstance(patterns, str):
+        patterns = [patterns]
+
+    return [
+        name
+        for name in list_members(path)
+        if any(fnmatch.fnmatch(name, pattern) for pattern in patterns)
+    ]
+
+
+def extract_members(path, patterns, destination="."):
+    """Extract the files in an archive that match any of the glob `patterns`
+
+    Other files are skipped without being read.
+
+    Returns:
+        list of str: the paths of the extracted files
+
+    Parameters:
+        path (str): the path to the archive
+
+        patterns (str or list of str): globs like `"*.json"` or `"*/metadata_*.tsv"`
+
+        destination (str): the directory to extract the files to
+    """
+    names = match_members(path, patterns)
+
+    if _is_zip(path):
+        with zipfile.ZipFile(path) as archive:
+            return [archive.extract(name, destination) for name in names]
+
+    with tarfile.open(path) as archive:
+        members = [archive.getmember(name) for name in names]
+
+        if hasattr(tarfile, "data_filter"):
+            archive.extractall(destination, members=members, filter="data")
+        else:
+            archive.extractall(destination, members=members)
+
+    return [os.path.join(destination, name) for name in names]
+
+
+@contextmanager
+def open_member(path, name, encoding=None):
+    """Open a file inside an archive for reading
+
+    The file is decompressed as it is read, so it never has to be written to disk.
+
+        >>> with open_member("dataset.zip", "metadata.tsv", encoding="utf-8") as f:
+        >>>     for line in f:
+        >>>         print(line)
+
+    Parameters:
+        path (str): the path to the archive
+
+        name (str): the name of the file in the archive
+
+        encoding (str): if set, the file is opened in text mode with this encoding,
+                        otherwise it is opened in binary mode
+    """
+    if _is_zip(path):
+        with zipfile.ZipFile(path) as archive:
+            try:
+                f = archive.open(name)
+            except KeyError:
+                raise MissingFile(name, "The file was not found in " + path)
+
+            with f:
+                yield io.TextIOWrapper(f, encoding=encoding) if encoding else f
+        return
+
+    with tarfile.open(path) as archive:
+        try:
+            f = archive.extractfile(name)
+        except KeyError:
+            f = None
+
+        if f is None:
+            raise MissingFile(name, "The file was not found in " + path)
+
+        with f:
+            yield io.TextIOWrapper(f, encoding=encoding) if encoding else f
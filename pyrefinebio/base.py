@@ -1,12 +1,95 @@
+import functools
+import inspect
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from pprint import pformat
+from urllib.parse import quote
 
+from pyrefinebio import identity as prb_identity
+from pyrefinebio.config import Config
+from pyrefinebio.exceptions import MissingObjects, NotFound
 
-class Base(object):
+# Batches of identifiers that are sent in a single search are kept short enough that the
+# request url stays well under the length that servers and proxies accept.
+MAX_BATCH_URL_LENGTH = 4000
+
+
+class _ModelType(type):
+    """Returns the shared instance of a new object when an identity map is in use"""
+
+    def __call__(cls, *args, **kwargs):
+        obj = super().__call__(*args, **kwargs)
+        objects = prb_identity.current()
+
+        if objects is None or obj.__dict__.get("_identifier") is None:
+            return obj
+
+        return objects.add(obj, _merge)
+
+
+def _merge(existing, new):
+    # keep what is already known about the object, unless the new response has a value
+    unset = existing.__dict__.get("_unset", {})
+
+    for key, value in new.__dict__.items():
+        if not key.startswith("_") and value is not None and value != []:
+            setattr(existing, key, value)
+            unset.pop(key, None)
+
+
+def _fetched_get(get):
+    """Wrap a model's `get` so that inside an identity map the shared instance it returns is
+    marked as fetched, even if it was an unfetched stub that the response was merged into"""
+
+    @functools.wraps(get)
+    def wrapper(cls, *args, **kwargs):
+        obj = get(cls, *args, **kwargs)
+
+        if prb_identity.current() is not None and isinstance(obj, Base):
+            obj._set_fetched()
+
+        return obj
+
+    return wrapper
+
+
+class Base(object, metaclass=_ModelType):
     """Base class that all pyrefinebio classes inherit from.
 
     Contains helpful methods that relate to all classes.
+
+    Objects that haven't been fetched from the API are lazily loaded: reading an attribute
+    that was None or [] when the object was created retrieves the object with `get`.
+    Those attributes are kept out of the instance `__dict__` until then, so they are the
+    only ones that go through `__getattr__`. Every other attribute read is a plain
+    attribute lookup.
     """
 
+    def __init_subclass__(cls, **kwargs):
+        super().__init_subclass__(**kwargs)
+
+        get = cls.__dict__.get("get")
+
+        # a response from `get` is the whole object, so its unset attributes really are unset
+        if isinstance(get, classmethod) and not inspect.iscoroutinefunction(get.__func__):
+            cls.get = classmethod(_fetched_get(get.__func__))
+
+        if "__init__" not in cls.__dict__:
+            return
+
+        init = cls.__init__
+
+        @functools.wraps(init)
+        def __init__(self, *args, **kwargs):
+            init(self, *args, **kwargs)
+
+            # subclasses of models call their parent's __init__, so only defer once
+            # the outermost __init__ has finished
+            if type(self).__init__ is __init__:
+                self._defer_unset_attributes()
+
+        cls.__init__ = __init__
+
     def __init__(self, identifier=None):
         self._identifier = identifier
         self._fetched = False
@@ -23,7 +106,7 @@ class Base(object):
     def _to_dict(self):
         expanded = {}
 
-        for key, value in self.__dict__.items():
+        for key, value in self._attributes().items():
             if isinstance(value, Base):
                 expanded[key] = value._to_dict()
             elif not key.startswith("_"):
@@ -31,21 +114,212 @@ class Base(object):
 
         return expanded
 
-    def __getattribute__(self, attr):
-        if (
-            not attr.startswith("_")
-            and (
-                object.__getattribute__(self, attr) is None
-                or object.__getattribute__(self, attr) == []
+    def _attributes(self):
+        attributes = dict(self.__dict__.get("_unset", {}))
+        attributes.update(self.__dict__)
+        attributes.pop("_unset", None)
+        return attributes
+
+    def _defer_unset_attributes(self):
+        # if somehow the identifier isn't set we can't fetch
+        # this will only happen with Datasets which can be created by non-api calls
+        if self.__dict__.get("_fetched", True) or not self.__dict__.get("_identifier"):
+            return
+
+        unset = {
+            key: value
+            for key, value in self.__dict__.items()
+            if not key.startswith("_") and (value is None or value == [])
+        }
+
+        for key in unset:
+            del self.__dict__[key]
+
+        self._unset = unset
+
+    def __getattr__(self, attr):
+        # only called when normal attribute lookup fails
+        unset = self.__dict__.get("_unset", {})
+
+        if attr not in unset:
+            raise AttributeError(
+                "'{0}' object has no attribute '{1}'".format(type(self).__name__, attr)
+            )
+
+        if self._fetched:
+            return unset[attr]
+
+        self._update_from(self.get(self._identifier))
+
+        return self.__dict__[attr]
+
+    def _set_fetched(self):
+        """Mark this object as fetched so that its unset attributes are not lazily loaded"""
+        for key, value in self.__dict__.pop("_unset", {}).items():
+            self.__dict__.setdefault(key, value)
+
+        self._fetched = True
+
+    def _update_from(self, other):
+        for key, value in other._attributes().items():
+            setattr(self, key, value)
+
+        self._set_fetched()
+
+    @classmethod
+    def _get_many(cls, identifiers):
+        """Retrieve several objects based on their identifiers
+
+        Models that can filter by many identifiers at once override this to use `search`.
+        By default each object is retrieved with `get` concurrently.
+
+        Returns:
+            dict of identifier to object - identifiers that could not be found are left out
+        """
+
+        def get(identifier):
+            try:
+                return cls.get(identifier)
+            except NotFound:
+                return None
+
+        with ThreadPoolExecutor(max_workers=Config().api_pool_size) as executor:
+            results = executor.map(prb_identity.with_current(get), identifiers)
+
+        return {
+            identifier: result
+            for identifier, result in zip(identifiers, results)
+            if result is not None
+        }
+
+    @classmethod
+    def _search_many(cls, identifiers, search, max_count, overhead):
+        """Retrieve objects with searches that each filter by a batch of identifiers
+
+        The batches are searched concurrently.
+
+        Parameters:
+            identifiers (list): the identifiers to retrieve
+
+            search (function): searches for a batch of identifiers
+
+            max_count (int): the most identifiers in a batch
+
+            overhead (int): the number of characters each identifier adds to the url
+                            besides the identifier itself
+        """
+        batches = list(_batches(identifiers, max_count, overhead))
+
+        with ThreadPoolExecutor(max_workers=Config().api_pool_size) as executor:
+            results = executor.map(
+                prb_identity.with_current(lambda batch: list(search(batch))), batches
             )
-            and not self._fetched
-        ):
-            # if somehow the identifier isn't set we can't fetch
-            # this will only happen with Datasets which can be created by non-api calls
-            if self._identifier:
-                result = self.get(self._identifier)
-                for key, value in result.__dict__.items():
-                    setattr(self, key, value)
-                self._fetched = True
-
-        return object.__getattribute__(self, attr)
+
+        return {obj._identifier: obj for batch in results for obj in batch}
+
+    @classmethod
+    def _get_in_order(cls, identifiers, ignore_missing=False):
+        """Retrieve several objects and return them in the order of `identifiers`"""
+        identifiers = list(identifiers)
+        unique = list(dict.fromkeys(identifiers))
+
+        found = cls._get_many(unique)
+        results = [found.get(identifier) for identifier in identifiers]
+        missing = [identifier for identifier in unique if identifier not in found]
+
+        if missing and not ignore_missing:
+            raise MissingObjects(cls.__name__ + "s", missing, results)
+
+        return results
+
+
+def _batches(identifiers, max_count, overhead):
+    """Split identifiers into batches that fit in a request url"""
+    batch, length = [], 0
+
+    for identifier in identifiers:
+        size = len(quote(str(identifier), safe="")) + overhead
+
+        if batch and (len(batch) == max_count or length + size > MAX_BATCH_URL_LENGTH):
+            yield batch
+            batch, length = [], 0
+
+        batch.append(identifier)
+        length += size
+
+    if batch:
+        yield batch
+
+
+def _unfetched(obj):
+    # look at __dict__ directly so that checking an object doesn't fetch it
+    return (
+        isinstance(obj, Base)
+        and not obj.__dict__.get("_fetched", True)
+        and obj.__dict__.get("_identifier") is not None
+    )
+
+
+def hydrate(objects, fields=None):
+    """Hydrate
+
+    Retrieves the data for many pyrefinebio objects at once so that reading their attributes
+    doesn't make a request per object. Objects are grouped by type and retrieved with as few
+    requests as possible.
+
+    Examples:
+        hydrate Samples and the ComputedFiles that are attached to them:
+
+        >>> samples = pyrefinebio.Sample.search(experiment_accession_code="GSE11111")[:100]
+        >>> pyrefinebio.hydrate(samples, fields=["computed_files", "original_files"])
+        >>> sizes = [f.size_in_bytes for s in samples for f in s.computed_files]
+
+    Returns:
+        list of the objects that were passed in
+
+    Parameters:
+        objects (list): pyrefinebio objects that should be hydrated
+
+        fields (list): names of attributes on `objects` that hold other pyrefinebio objects
+                       (or lists of them) that should also be hydrated
+    """
+    objects = list(objects)
+
+    _hydrate(objects)
+
+    if fields:
+        related = []
+
+        for obj in objects:
+            for field in fields:
+                # objects that still aren't fetched weren't found, and reading a field that
+                # isn't set on them would try to fetch them again
+                if _unfetched(obj) and field not in obj.__dict__:
+                    continue
+
+                value = getattr(obj, field, None)
+
+                if isinstance(value, list):
+                    related.extend(value)
+                else:
+                    related.append(value)
+
+        _hydrate(related)
+
+    return objects
+
+
+def _hydrate(objects):
+    by_type = defaultdict(list)
+
+    for obj in objects:
+        if _unfetched(obj):
+            by_type[type(obj)].append(obj)
+
+    for T, instances in by_type.items():
+        identifiers = list(dict.fromkeys(obj._identifier for obj in instances))
+        found = T._get_many(identifiers)
+
+        for obj in instances:
+            if obj._identifier in found:
+                obj._update_from(found[obj._identifier])
@@ -0,0 +1,154 @@
+"""Columnar export of search results.
+
+Builds NumPy arrays column by column straight from the API's JSON, without creating a
+model object for each result. This requires `numpy`, and `pandas` for DataFrames, which
+can be installed with:
+
+.. code-block:: shell
+
+    $ pip install pyrefinebio[columns]
+"""
+from array import array
+from collections import namedtuple
+
+# Fields that hold a small set of values repeated across many results.
+CATEGORICAL_FIELDS = (
+    "organism__name",
+    "organism_name",
+    "platform_name",
+    "platform_accession_code",
+    "technology",
+    "manufacturer",
+    "source_database",
+)
+
+Categorical = namedtuple("Categorical", ["codes", "categories"])
+Categorical.__doc__ = """A categorical column
+
+codes is an int32 array of indexes into categories, with -1 for missing values.
+categories is the list of distinct values in the order they were first seen.
+"""
+
+
+def _import(module):
+    try:
+        return __import__(module)
+    except ImportError:
+        raise ImportError(
+            "Columnar export requires {0}. "
+            "You can install it with `pip install pyrefinebio[columns]`".format(module)
+        )
+
+
+def flatten(item, prefix=""):
+    """Flatten nested dicts into `parent__child` keys, the same way the API names filters"""
+    flat = {}
+
+    for key, value in item.items():
+        if isinstance(value, dict):
+            flat.update(flatten(value, prefix + key + "__"))
+        else:
+            flat[prefix + key] = value
+
+    return flat
+
+
+class _CategoricalBuilder:
+    def __init__(self):
+        self.codes = array("i")
+        self.lookup = {}
+
+    def append(self, value):
+        if value is None:
+            self.codes.append(-1)
+        else:
+            self.codes.append(self.lookup.setdefault(value, len(self.lookup)))
+
+    def build(self, np):
+        return Categorical(np.frombuffer(self.codes, dtype=np.int32), list(self.lookup))
+
+
+class _Builder:
+    def __init__(self):
+        self.values = []
+
+    def append(self, value):
+        self.values.append(value)
+
+    def build(self, np):
+        values = self.values
+        present = [v for v in values if v is not None]
+        types = {type(v) for v in present}
+
+        if types == {bool} and len(present) == len(values):
+            return np.array(values, dtype=bool)
+
+        if types == {int} and len(present) == len(values):
+            return np.array(values, dtype=np.int64)
+
+        if types and types <= {int, float}:
+            return np.array([np.nan if v is None else v for v in values], dtype=np.float64)
+
+        column = np.empty(len(values), dtype=object)
+        column[:] = values
+        return column
+
+
+class ColumnBuilder:
+    """Collects flattened results into per-field buffers
+
+    Parameters:
+        fields (list): the fields to keep - defaults to every field in the first result
+
+        categorical (list): fields that should be encoded as `Categorical` columns
+    """
+
+    def __init__(self, fields=None, categorical=CATEGORICAL_FIELDS):
+        self.fields = list(fields) if fields else None
+        self.categorical = set(categorical or ())
+        self.count = 0
+        self._builders = {}
+
+        if self.fields:
+            self._add_fields(self.fields)
+
+    def _add_fields(self, fields):
+        for field in fields:
+            if field not in self._builders:
+                builder = _CategoricalBuilder() if field in self.categorical else _Builder()
+
+                # fields first seen part way through are missing from the earlier results
+                for _ in range(self.count):
+                    builder.append(None)
+
+                self._builders[field] = builder
+
+    def extend(self, results):
+        for item in results:
+            item = flatten(item)
+
+            if self.fields is None:
+                self._add_fields(item)
+
+            for field, builder in self._builders.items():
+                builder.append(item.get(field))
+
+            self.count += 1
+
+    def build(self):
+        np = _import("numpy")
+        return {field: builder.build(np) for field, builder in self._builders.items()}
+
+
+def to_dataframe(columns):
+    """Turn columns from `ColumnBuilder.build` into a pandas DataFrame"""
+    pd = _import("pandas")
+
+    data = {}
+    for field, column in columns.items():
+        if isinstance(column, Categorical):
+            data[field] = pd.Categorical.from_codes(column.codes, categories=column.categories)
+        else:
+            data[field] = column
+
+    return pd.DataFrame(data)
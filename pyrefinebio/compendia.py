@@ -1,10 +1,14 @@
 import shutil
 
-from pyrefinebio import computed_file as prb_computed_file
+from pyrefinebio import (
+    archive as prb_archive,
+    computed_file as prb_computed_file,
+    matrix as prb_matrix,
+)
 from pyrefinebio.api_interface import download_file, get_by_endpoint
 from pyrefinebio.base import Base
 from pyrefinebio.exceptions import DownloadError, MissingFile
-from pyrefinebio.util import create_paginated_list, expand_path
+from pyrefinebio.util import create_paginated_list, expand_path, with_page_size
 
 
 class Compendium(Base):
@@ -87,7 +91,7 @@ class Compendium(Base):
             latest_version (bool): true will only return the highest
                                    compendium_version for each primary_organism
         """
-        response = get_by_endpoint("compendia", params=kwargs)
+        response = get_by_endpoint("compendia", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
 
     def download(self, path, prompt=True):
@@ -111,23 +115,123 @@ class Compendium(Base):
 
         full_path = expand_path(path, "compendium-" + str(self.id) + ".zip")
 
-        download_file(self.computed_file.download_url, full_path, prompt)
+        download_file(
+            self.computed_file.download_url,
+            full_path,
+            prompt,
+            sha1=self.computed_file.sha1,
+            size_in_bytes=self.computed_file.size_in_bytes,
+        )
 
         self._downloaded_path = full_path
 
         return self
 
-    def extract(self):
+    def extract(self, pattern=None, path=None):
         """Extract a downloaded Compendium
 
+        By default every file in the Compendium is extracted. Pass `pattern` to only extract
+        the files that match a glob, without reading the rest of the archive.
+
+            >>> compendium.extract(pattern="*.json", path="./metadata")
+
         Returns:
             Compendium
+
+        Parameters:
+            pattern (str or list of str): only extract files matching these globs
+
+            path (str): the directory to extract to - defaults to the current directory
         """
+        archive_path = self._archive_path()
+
+        if pattern:
+            prb_archive.extract_members(archive_path, pattern, path or ".")
+        else:
+            shutil.unpack_archive(archive_path, path)
+
+        return self
+
+    def list_files(self):
+        """List the files in a downloaded Compendium
+
+        Returns:
+            list of str
+        """
+        return prb_archive.list_members(self._archive_path())
+
+    def open_file(self, name, encoding=None):
+        """Open a file in a downloaded Compendium without extracting it
+
+        The file is decompressed as it is read. Use it as a context manager:
+
+            >>> with compendium.open_file("metadata.tsv", encoding="utf-8") as f:
+            >>>     header = f.readline()
+
+        Returns:
+            file object
+
+        Parameters:
+            name (str): the name of the file, as returned by `list_files`
+
+            encoding (str): if set, the file is opened in text mode with this encoding,
+                            otherwise it is opened in binary mode
+        """
+        return prb_archive.open_member(self._archive_path(), name, encoding)
+
+    def load_matrix(self, name=None, by="gene"):
+        """Load an expression matrix from a downloaded Compendium without reading it into memory
+
+        The matrix is converted to a binary float32 file next to the download the first time
+        it is loaded, then memory-mapped, so only the genes or samples that are used are read.
+        A Compendium has a single matrix.
+
+        Requires numpy, see `pyrefinebio.matrix`.
+
+            >>> matrix = compendium.load_matrix()
+            >>> matrix.subset(genes=["ENSG00000141510"]).values
+
+        Returns:
+            pyrefinebio.matrix.Matrix
+
+        Parameters:
+            name (str): the matrix to load, as returned by `list_files`
+
+            by (str): "gene" makes reading a subset of genes fast and "sample" makes reading
+                      a subset of samples fast
+        """
+        return prb_matrix.load_matrix(self._archive_path(), name, by)
+
+    def read_matrix(self, genes=None, samples=None, name=None):
+        """Read part of an expression matrix from a downloaded Compendium
+
+        The first time a matrix is read it is extracted next to the download and the position
+        of each gene's row is indexed. After that only the rows for the requested genes are
+        read, so repeated queries are fast.
+
+        Requires numpy, see `pyrefinebio.matrix`.
+
+            >>> matrix = compendium.read_matrix(genes=["ENSG00000141510", "ENSG00000012048"])
+            >>> matrix.values
+
+        Returns:
+            pyrefinebio.matrix.Matrix
+
+        Parameters:
+            genes (list): the genes to read - defaults to every gene
+
+            samples (list): the samples to read - defaults to every sample
+
+            name (str): the matrix to read, as returned by `list_files`
+        """
+        reader = prb_matrix.open_matrix(self._archive_path(), name)
+        return reader.read(genes, samples)
+
+    def _archive_path(self):
         if not self._downloaded_path:
             raise MissingFile(
                 "Compendium downloaded file",
                 "Make sure you have successfully downloaded the Compendium before extracting.",
             )
 
-        shutil.unpack_archive(self._downloaded_path)
-        return self
+        return self._downloaded_path
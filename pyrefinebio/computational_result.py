@@ -6,7 +6,7 @@ from pyrefinebio import (
 )
 from pyrefinebio.api_interface import get_by_endpoint
 from pyrefinebio.base import Base
-from pyrefinebio.util import create_paginated_list, parse_date
+from pyrefinebio.util import create_paginated_list, parse_date, with_page_size
 
 
 class ComputationalResult(Base):
@@ -87,5 +87,5 @@ class ComputationalResult(Base):
 
             offset (int): the initial index from which to return the results
         """
-        response = get_by_endpoint("computational_results", params=kwargs)
+        response = get_by_endpoint("computational_results", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
@@ -1,10 +1,14 @@
 import shutil
 
-from pyrefinebio import computational_result as prb_computational_result, sample as prb_sample
+from pyrefinebio import (
+    archive as prb_archive,
+    computational_result as prb_computational_result,
+    sample as prb_sample,
+)
 from pyrefinebio.api_interface import download_file, get_by_endpoint
 from pyrefinebio.base import Base
 from pyrefinebio.exceptions import DownloadError, MissingFile
-from pyrefinebio.util import create_paginated_list, expand_path, parse_date
+from pyrefinebio.util import create_paginated_list, expand_path, parse_date, with_page_size
 
 
 class ComputedFile(Base):
@@ -83,6 +87,24 @@ class ComputedFile(Base):
         response = get_by_endpoint("computed_files/" + str(id)).json()
         return ComputedFile(**response)
 
+    @classmethod
+    def get_many(cls, ids, ignore_missing=False):
+        """Retrieve several ComputedFiles based on their ids
+
+        The API can't filter ComputedFiles by many ids at once, so they are retrieved
+        with concurrent requests.
+
+        Returns:
+            list of ComputedFile: in the same order as `ids`
+
+        Parameters:
+            ids (list of int): the ids for the ComputedFiles you want to get
+
+            ignore_missing (bool): if True, ComputedFiles that can't be found are None in the list,
+                                   otherwise MissingObjects is raised with their ids
+        """
+        return cls._get_in_order(ids, ignore_missing)
+
     @classmethod
     def search(cls, **kwargs):
         """Retrieve a list of a ComputedFiles based on filters
@@ -127,7 +149,7 @@ class ComputedFile(Base):
 
             offset (int): the initial index from which to return the results
         """
-        response = get_by_endpoint("computed_files", params=kwargs)
+        response = get_by_endpoint("computed_files", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
 
     def download(self, path, prompt=True):
@@ -151,23 +173,75 @@ class ComputedFile(Base):
 
         full_path = expand_path(path, "computedfile-" + str(self.id) + ".zip")
 
-        download_file(self.download_url, full_path, prompt)
+        download_file(
+            self.download_url,
+            full_path,
+            prompt,
+            sha1=self.sha1,
+            size_in_bytes=self.size_in_bytes,
+        )
 
         self._downloaded_path = full_path
 
         return self
 
-    def extract(self):
+    def extract(self, pattern=None, path=None):
         """Extract a downloaded ComputedFile
 
+        By default every file in the ComputedFile is extracted. Pass `pattern` to only extract
+        the files that match a glob, without reading the rest of the archive.
+
+            >>> computedfile.extract(pattern="*.json", path="./metadata")
+
         Returns:
             ComputedFile
+
+        Parameters:
+            pattern (str or list of str): only extract files matching these globs
+
+            path (str): the directory to extract to - defaults to the current directory
+        """
+        archive_path = self._archive_path()
+
+        if pattern:
+            prb_archive.extract_members(archive_path, pattern, path or ".")
+        else:
+            shutil.unpack_archive(archive_path, path)
+
+        return self
+
+    def list_files(self):
+        """List the files in a downloaded ComputedFile
+
+        Returns:
+            list of str
+        """
+        return prb_archive.list_members(self._archive_path())
+
+    def open_file(self, name, encoding=None):
+        """Open a file in a downloaded ComputedFile without extracting it
+
+        The file is decompressed as it is read. Use it as a context manager:
+
+            >>> with computedfile.open_file("metadata.tsv", encoding="utf-8") as f:
+            >>>     header = f.readline()
+
+        Returns:
+            file object
+
+        Parameters:
+            name (str): the name of the file, as returned by `list_files`
+
+            encoding (str): if set, the file is opened in text mode with this encoding,
+                            otherwise it is opened in binary mode
         """
+        return prb_archive.open_member(self._archive_path(), name, encoding)
+
+    def _archive_path(self):
         if not self._downloaded_path:
             raise MissingFile(
                 "ComputedFile downloaded file",
                 "Make sure you have successfully downloaded the ComputedFile before extracting.",
             )
 
-        shutil.unpack_archive(self._downloaded_path)
-        return self
+        return self._downloaded_path
@@ -3,6 +3,9 @@ from pathlib import Path
 
 import yaml
 
+# The largest `limit` that the refine.bio API will accept for paginated endpoints.
+MAX_PAGE_SIZE = 1000
+
 
 class Config:
     """Config for pyrefinebio.
@@ -31,6 +34,101 @@ class Config:
 
             environment variable: `REFINEBIO_API_MAX_CALLS_PER_SECOND`
 
+        api_pool_size:
+            The number of connections to the refine.bio API that are kept open and reused
+            between requests. This should be at least the number of threads making requests
+            at the same time. The default is `10`.
+
+            environment variable: `REFINEBIO_API_POOL_SIZE`
+
+        api_rate_limit_path:
+            A file where the API rate limit is tracked. Every process that uses the same file
+            shares `api_max_calls_per_second` between them, and they all pause when the API
+            responds with `429 Too Many Requests`. By default the limit is tracked separately
+            by each process.
+
+            environment variable: `REFINEBIO_API_RATE_LIMIT_PATH`
+
+        api_max_retries:
+            The most times a GET request is sent again after it fails to connect or gets one
+            of `api_retry_statuses` back. The default is `3`.
+
+            environment variable: `REFINEBIO_API_MAX_RETRIES`
+
+        api_retry_backoff:
+            The base in seconds of the exponential backoff between retries. Retry `n` waits a
+            random time up to `api_retry_backoff * 2 ** n`, or longer if the response has a
+            `Retry-After` header. The default is `0.5`.
+
+            environment variable: `REFINEBIO_API_RETRY_BACKOFF`
+
+        api_retry_statuses:
+            The response status codes that are retried. The default is
+            `[500, 502, 503, 504]`.
+
+            environment variable: `REFINEBIO_API_RETRY_STATUSES` (comma separated)
+
+        api_cache_size:
+            The number of API responses that are cached in memory. Responses from metadata
+            endpoints like organisms and platforms are reused until they expire, then
+            revalidated with the API. The default is `0`, which turns the memory cache off.
+
+            environment variable: `REFINEBIO_API_CACHE_SIZE`
+
+        api_cache_path:
+            A SQLite database where API responses are also cached, so they can be reused by
+            later runs. The cache is off by default.
+
+            environment variable: `REFINEBIO_API_CACHE_PATH`
+
+        api_cache_path_size:
+            The number of API responses that are kept in the `api_cache_path` database. The
+            least recently used responses are removed once there are more, and expired ones
+            are removed when it is opened. `0` means there is no limit. The default is `10000`.
+
+            environment variable: `REFINEBIO_API_CACHE_PATH_SIZE`
+
+        api_cache_ttls:
+            How many seconds cached responses are used for before they are revalidated, by
+            endpoint - for example `{"organisms": 86400, "samples": 0}`. These are added to
+            the defaults in `pyrefinebio.response_cache.DEFAULT_TTLS`. This can only be set
+            in the config file.
+
+        page_size:
+            The number of results that are requested per page by `search` methods that return
+            a PaginatedList. This is used when `limit` is not passed to `search`. The default is
+            `1000`, the largest page size the API accepts, which keeps the number of requests
+            needed to go through a search as low as possible.
+
+            environment variable: `REFINEBIO_PAGE_SIZE`
+
+        download_workers:
+            The number of connections used to download a file. When this is more than `1`
+            and the server supports HTTP Range requests, files are downloaded in chunks
+            in parallel. The default is `1`, which downloads files in a single stream.
+
+            environment variable: `REFINEBIO_DOWNLOAD_WORKERS`
+
+        download_chunk_size:
+            The size in bytes of each chunk requested when downloading a file in parallel.
+            The default is `67108864` (64MB).
+
+            environment variable: `REFINEBIO_DOWNLOAD_CHUNK_SIZE`
+
+        download_cache_dir:
+            A directory where downloaded files are cached by their SHA-1. Downloading a file
+            that is already in the cache links it to the requested path instead of
+            downloading it again. The cache is off by default.
+
+            environment variable: `REFINEBIO_DOWNLOAD_CACHE_DIR`
+
+        download_cache_size:
+            The most bytes that are kept in the download cache. The least recently used
+            files are removed when the cache grows past this. The default is `53687091200`
+            (50GB).
+
+            environment variable: `REFINEBIO_DOWNLOAD_CACHE_SIZE`
+
     These config values can be modified directly in code, but it recommended that you
     set them by using environment variables, by modifying them in Config file, or by
     using other class methods provided - like `pyrefinebio.Token` for example.
@@ -42,6 +140,21 @@ class Config:
         token: foo-bar-baz
         base_url: https://api.refine.bio/v1/
         api_max_calls_per_second: 10
+        api_pool_size: 10
+        api_rate_limit_path: ~/.cache/refinebio/rate_limit.sqlite
+        api_max_retries: 3
+        api_retry_backoff: 0.5
+        api_retry_statuses: [500, 502, 503, 504]
+        api_cache_size: 1000
+        api_cache_path: ~/.cache/refinebio/responses.sqlite
+        api_cache_path_size: 10000
+        api_cache_ttls:
+            experiments: 86400
+        page_size: 1000
+        download_workers: 1
+        download_chunk_size: 67108864
+        download_cache_dir: ~/.cache/refinebio
+        download_cache_size: 53687091200
     """
 
     _instance = None
@@ -76,6 +189,52 @@ class Config:
                 os.getenv("REFINEBIO_API_MAX_CALLS_PER_SECOND")
                 or config.get("api_max_calls_per_second", 10)
             )
+            cls.api_pool_size = int(
+                os.getenv("REFINEBIO_API_POOL_SIZE") or config.get("api_pool_size", 10)
+            )
+            cls.api_rate_limit_path = os.getenv("REFINEBIO_API_RATE_LIMIT_PATH") or config.get(
+                "api_rate_limit_path"
+            )
+            cls.api_max_retries = int(
+                os.getenv("REFINEBIO_API_MAX_RETRIES") or config.get("api_max_retries", 3)
+            )
+            cls.api_retry_backoff = float(
+                os.getenv("REFINEBIO_API_RETRY_BACKOFF") or config.get("api_retry_backoff", 0.5)
+            )
+            statuses = os.getenv("REFINEBIO_API_RETRY_STATUSES")
+            cls.api_retry_statuses = (
+                [int(status) for status in statuses.split(",")]
+                if statuses
+                else config.get("api_retry_statuses", [500, 502, 503, 504])
+            )
+            cls.api_cache_size = int(
+                os.getenv("REFINEBIO_API_CACHE_SIZE") or config.get("api_cache_size", 0)
+            )
+            cls.api_cache_path = os.getenv("REFINEBIO_API_CACHE_PATH") or config.get(
+                "api_cache_path"
+            )
+            cls.api_cache_path_size = int(
+                os.getenv("REFINEBIO_API_CACHE_PATH_SIZE")
+                or config.get("api_cache_path_size", 10000)
+            )
+            cls.api_cache_ttls = config.get("api_cache_ttls") or {}
+            cls.page_size = int(
+                os.getenv("REFINEBIO_PAGE_SIZE") or config.get("page_size", MAX_PAGE_SIZE)
+            )
+            cls.download_workers = int(
+                os.getenv("REFINEBIO_DOWNLOAD_WORKERS") or config.get("download_workers", 1)
+            )
+            cls.download_chunk_size = int(
+                os.getenv("REFINEBIO_DOWNLOAD_CHUNK_SIZE")
+                or config.get("download_chunk_size", 64 * 1024 * 1024)
+            )
+            cls.download_cache_dir = os.getenv("REFINEBIO_DOWNLOAD_CACHE_DIR") or config.get(
+                "download_cache_dir"
+            )
+            cls.download_cache_size = int(
+                os.getenv("REFINEBIO_DOWNLOAD_CACHE_SIZE")
+                or config.get("download_cache_size", 50 * 1024 * 1024 * 1024)
+            )
 
         return cls._instance
 
@@ -89,6 +248,20 @@ class Config:
             "token": self.token,
             "base_url": self.base_url,
             "api_max_calls_per_second": self.api_max_calls_per_second,
+            "api_pool_size": self.api_pool_size,
+            "api_rate_limit_path": self.api_rate_limit_path,
+            "api_max_retries": self.api_max_retries,
+            "api_retry_backoff": self.api_retry_backoff,
+            "api_retry_statuses": self.api_retry_statuses,
+            "api_cache_size": self.api_cache_size,
+            "api_cache_path": self.api_cache_path,
+            "api_cache_path_size": self.api_cache_path_size,
+            "api_cache_ttls": self.api_cache_ttls,
+            "page_size": self.page_size,
+            "download_workers": self.download_workers,
+            "download_chunk_size": self.download_chunk_size,
+            "download_cache_dir": self.download_cache_dir,
+            "download_cache_size": self.download_cache_size,
         }
 
         with open(self.config_file, "w") as config_file:
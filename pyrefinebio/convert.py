@@ -0,0 +1,182 @@
+"""Convert the expression matrices in a downloaded Dataset to columnar formats.
+
+Matrices are streamed out of the downloaded zip about `CHUNK_CELLS` values at a time, so
+converting uses a bounded amount of memory however large the Dataset is. The sample metadata
+files in the zip are copied next to the converted matrices.
+
+The supported formats are:
+
+    npy:
+        Each matrix becomes a directory of float32 `.npy` chunks, with the genes and samples
+        in `index.json`. Requires `numpy`. Load it back with `load_npy`.
+
+    parquet:
+        Each matrix becomes a zstd compressed Parquet file with a `Gene` column and a float32
+        column for each sample. Requires `pyarrow`.
+"""
+import json
+import os
+
+from pyrefinebio import archive as prb_archive, matrix as prb_matrix
+
+FORMATS = ("npy", "parquet")
+
+# The number of values that are held in memory and written at a time. Each chunk has as
+# many genes as fit in this, so a matrix with many samples is written in smaller chunks.
+CHUNK_CELLS = 10000000
+
+
+def _pyarrow():
+    try:
+        import pyarrow
+        import pyarrow.parquet
+    except ImportError:
+        raise ImportError(
+            "Converting to parquet requires pyarrow. "
+            "You can install it with `pip install pyrefinebio[parquet]`"
+        )
+
+    return pyarrow
+
+
+def _chunks(archive_path, name, np):
+    """Read a matrix from an archive as its samples then (genes, values) chunks"""
+    with prb_archive.open_member(archive_path, name, encoding="utf-8") as f:
+        samples = prb_matrix.parse_header(f.readline())
+        yield samples
+
+        chunk_rows = max(1, CHUNK_CELLS // max(1, len(samples)))
+        genes, rows = [], []
+
+        for line in f:
+            if not line.strip():
+                continue
+
+            gene, values = prb_matrix.parse_row(line, np)
+
+            if len(values) != len(samples):
+                raise ValueError(
+                    "Row for {0} has {1} values but there are {2} samples".format(
+                        gene, len(values), len(samples)
+                    )
+                )
+
+            genes.append(gene)
+            rows.append(values)
+
+            if len(rows) == chunk_rows:
+                yield genes, np.vstack(rows)
+                genes, rows = [], []
+
+        if rows:
+            yield genes, np.vstack(rows)
+
+
+def _to_npy(archive_path, name, directory, np):
+    os.makedirs(directory, exist_ok=True)
+
+    chunks = _chunks(archive_path, name, np)
+    samples = next(chunks)
+
+    index = {"samples": samples, "chunks": []}
+
+    for i, (genes, values) in enumerate(chunks):
+        filename = "values-{0:05d}.npy".format(i)
+        np.save(os.path.join(directory, filename), values)
+        index["chunks"].append({"file": filename, "genes": genes})
+
+    with open(os.path.join(directory, "index.json"), "w") as f:
+        json.dump(index, f)
+
+    return directory
+
+
+def _to_parquet(archive_path, name, path, np):
+    pa = _pyarrow()
+
+    chunks = _chunks(archive_path, name, np)
+    samples = next(chunks)
+
+    schema = pa.schema(
+        [pa.field("Gene", pa.string())] + [pa.field(sample, pa.float32()) for sample in samples]
+    )
+
+    with pa.parquet.ParquetWriter(path, schema, compression="zstd") as writer:
+        for genes, values in chunks:
+            columns = [pa.array(genes, pa.string())]
+            columns += [pa.array(values[:, i]) for i in range(len(samples))]
+
+            writer.write_table(pa.Table.from_arrays(columns, schema=schema))
+
+    return path
+
+
+def convert(archive_path, format, destination=None):
+    """Convert every expression matrix in a downloaded archive
+
+    Returns:
+        list of str: the paths of the converted matrices
+
+    Parameters:
+        archive_path (str): the path to the downloaded zip
+
+        format (str): "npy" or "parquet"
+
+        destination (str): the directory to write to - defaults to `<archive>_<format>`
+                           next to the archive
+    """
+    if format not in FORMATS:
+        raise ValueError("format must be one of: " + ", ".join(FORMATS))
+
+    np = prb_matrix._numpy()
+
+    destination = destination or os.path.splitext(archive_path)[0] + "_" + format
+    os.makedirs(destination, exist_ok=True)
+
+    names = prb_matrix.expression_files(archive_path)
+    converted = []
+
+    for name in names:
+        base = os.path.join(destination, os.path.splitext(name)[0])
+        os.makedirs(os.path.dirname(base), exist_ok=True)
+
+        if format == "npy":
+            converted.append(_to_npy(archive_path, name, base, np))
+        else:
+            converted.append(_to_parquet(archive_path, name, base + ".parquet", np))
+
+    # the sample metadata sidecars are small, so they are copied as they are
+    metadata = [
+        name
+        for name in prb_archive.list_members(archive_path)
+        if name not in names
+        and (name.endswith(".json") or os.path.basename(name).startswith("metadata"))
+    ]
+    prb_archive.extract_members(archive_path, metadata, destination)
+
+    return converted
+
+
+def load_npy(directory):
+    """Load a matrix that was converted to npy
+
+    Returns:
+        pyrefinebio.matrix.Matrix
+
+    Parameters:
+        directory (str): a directory returned by `convert`
+    """
+    np = prb_matrix._numpy()
+
+    with open(os.path.join(directory, "index.json")) as f:
+        index = json.load(f)
+
+    genes = [gene for chunk in index["chunks"] for gene in chunk["genes"]]
+    chunks = [np.load(os.path.join(directory, chunk["file"])) for chunk in index["chunks"]]
+
+    if chunks:
+        values = np.concatenate(chunks)
+    else:
+        values = np.zeros((0, len(index["samples"])), dtype=np.float32)
+
+    return prb_matrix.Matrix(values, genes, index["samples"])
@@ -1,6 +1,12 @@
 import shutil
 
-from pyrefinebio import experiment as prb_experiment, sample as prb_sample
+from pyrefinebio import (
+    archive as prb_archive,
+    convert as prb_convert,
+    experiment as prb_experiment,
+    matrix as prb_matrix,
+    sample as prb_sample,
+)
 from pyrefinebio.api_interface import (
     download_file,
     get_by_endpoint,
@@ -183,6 +189,18 @@ class Dataset(Base):
         Returns:
             Dataset
         """
+        body = self._request_body()
+
+        if self.id is not None:
+            response = put_by_endpoint("dataset/" + self.id, payload=body).json()
+        else:
+            response = post_by_endpoint("dataset", payload=body).json()
+
+        self._update_from_response(response)
+
+        return self
+
+    def _request_body(self):
         body = {}
         body["data"] = self.data
         if self.aggregate_by is not None:
@@ -204,11 +222,9 @@ class Dataset(Base):
         if self.notify_me is not None:
             body["notify_me"] = self.notify_me
 
-        if self.id is not None:
-            response = put_by_endpoint("dataset/" + self.id, payload=body).json()
-        else:
-            response = post_by_endpoint("dataset", payload=body).json()
+        return body
 
+    def _update_from_response(self, response):
         # add fields that aren't returned by the api
         response["email_address"] = self.email_address
         response["email_ccdl_ok"] = self.email_ccdl_ok
@@ -216,8 +232,6 @@ class Dataset(Base):
         for key, value in response.items():
             setattr(self, key, value)
 
-        return self
-
     def process(self):
         """Start processing a Dataset
 
@@ -256,7 +270,8 @@ class Dataset(Base):
 
             prompt (bool): if true, will prompt before downloading files bigger than 1GB
         """
-        download_url = self.download_url or self.get(self.id).download_url
+        dataset = self if self.download_url else self.get(self.id)
+        download_url = dataset.download_url
 
         if not download_url:
             if self.check():
@@ -274,23 +289,144 @@ class Dataset(Base):
 
         full_path = expand_path(path, "dataset-" + str(self.id) + ".zip")
 
-        download_file(download_url, full_path, prompt)
+        download_file(
+            download_url,
+            full_path,
+            prompt,
+            sha1=dataset.sha1,
+            size_in_bytes=dataset.size_in_bytes,
+        )
 
         self._downloaded_path = full_path
 
         return self
 
-    def extract(self):
+    def extract(self, pattern=None, path=None):
         """Extract a downloaded Dataset
 
+        By default every file in the Dataset is extracted. Pass `pattern` to only extract
+        the files that match a glob, without reading the rest of the archive.
+
+            >>> dataset.extract(pattern="*.json", path="./metadata")
+
         Returns:
             Dataset
+
+        Parameters:
+            pattern (str or list of str): only extract files matching these globs
+
+            path (str): the directory to extract to - defaults to the current directory
+        """
+        archive_path = self._archive_path()
+
+        if pattern:
+            prb_archive.extract_members(archive_path, pattern, path or ".")
+        else:
+            shutil.unpack_archive(archive_path, path)
+
+        return self
+
+    def list_files(self):
+        """List the files in a downloaded Dataset
+
+        Returns:
+            list of str
+        """
+        return prb_archive.list_members(self._archive_path())
+
+    def open_file(self, name, encoding=None):
+        """Open a file in a downloaded Dataset without extracting it
+
+        The file is decompressed as it is read. Use it as a context manager:
+
+            >>> with dataset.open_file("metadata.tsv", encoding="utf-8") as f:
+            >>>     header = f.readline()
+
+        Returns:
+            file object
+
+        Parameters:
+            name (str): the name of the file, as returned by `list_files`
+
+            encoding (str): if set, the file is opened in text mode with this encoding,
+                            otherwise it is opened in binary mode
+        """
+        return prb_archive.open_member(self._archive_path(), name, encoding)
+
+    def load_matrix(self, name=None, by="gene"):
+        """Load an expression matrix from a downloaded Dataset without reading it into memory
+
+        The matrix is converted to a binary float32 file next to the download the first time
+        it is loaded, then memory-mapped, so only the genes or samples that are used are read.
+        A Dataset has a matrix for each experiment or species, depending on how
+        it was aggregated, so `name` is needed if there is more than one.
+
+        Requires numpy, see `pyrefinebio.matrix`.
+
+            >>> matrix = dataset.load_matrix()
+            >>> matrix.subset(genes=["ENSG00000141510"]).values
+
+        Returns:
+            pyrefinebio.matrix.Matrix
+
+        Parameters:
+            name (str): the matrix to load, as returned by `list_files`
+
+            by (str): "gene" makes reading a subset of genes fast and "sample" makes reading
+                      a subset of samples fast
         """
+        return prb_matrix.load_matrix(self._archive_path(), name, by)
+
+    def read_matrix(self, genes=None, samples=None, name=None):
+        """Read part of an expression matrix from a downloaded Dataset
+
+        The first time a matrix is read it is extracted next to the download and the position
+        of each gene's row is indexed. After that only the rows for the requested genes are
+        read, so repeated queries are fast.
+
+        Requires numpy, see `pyrefinebio.matrix`.
+
+            >>> matrix = dataset.read_matrix(genes=["ENSG00000141510", "ENSG00000012048"])
+            >>> matrix.values
+
+        Returns:
+            pyrefinebio.matrix.Matrix
+
+        Parameters:
+            genes (list): the genes to read - defaults to every gene
+
+            samples (list): the samples to read - defaults to every sample
+
+            name (str): the matrix to read, as returned by `list_files`
+        """
+        reader = prb_matrix.open_matrix(self._archive_path(), name)
+        return reader.read(genes, samples)
+
+    def convert(self, format, path=None):
+        """Convert the expression matrices in a downloaded Dataset to a columnar format
+
+        Matrices are streamed out of the zip a chunk of genes at a time, so this works in a
+        bounded amount of memory. The sample metadata files are copied alongside them.
+        See `pyrefinebio.convert` for the formats.
+
+            >>> dataset.convert("parquet")
+
+        Returns:
+            list of str: the paths of the converted matrices
+
+        Parameters:
+            format (str): "npy" or "parquet"
+
+            path (str): the directory to write to - defaults to a directory named after the
+                        downloaded zip
+        """
+        return prb_convert.convert(self._archive_path(), format, path)
+
+    def _archive_path(self):
         if not self._downloaded_path:
             raise MissingFile(
-                "Dataset downloaded file"
-                "Make sure you have successfully downloaded the Dataset before extracting."
+                "Dataset downloaded file",
+                "Make sure you have successfully downloaded the Dataset before extracting.",
             )
 
-        shutil.unpack_archive(self._downloaded_path)
-        return self
+        return self._downloaded_path
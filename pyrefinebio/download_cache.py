@@ -0,0 +1,153 @@
+"""A content-addressed cache of downloaded files.
+
+Files are stored under `Config.download_cache_dir` by their SHA-1, so a file that is
+downloaded by several jobs on the same host is only fetched once. Cached files are
+hardlinked to the path they are requested at, or reflinked or copied if they can't be
+hardlinked, for example when the path is on a different filesystem.
+
+Since a hardlinked file shares its data with the cache, downloaded files should not be
+modified in place. Extracting them is fine.
+
+The cache can be used by several processes at once. Each file is downloaded by one
+process at a time while the others wait for it, and eviction is done under a lock.
+"""
+import os
+import shutil
+import uuid
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+
+from pyrefinebio.file_lock import FileLock
+
+# The Linux ioctl that makes a copy-on-write clone of a file on filesystems that support it.
+FICLONE = 0x40049409
+
+
+def _reflink(source, destination):
+    if not fcntl:
+        raise OSError("reflinks are not supported")
+
+    with open(source, "rb") as src, open(destination, "wb") as dst:
+        fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+
+
+def link_file(source, destination):
+    """Put a copy of `source` at `destination` without copying the data if possible
+
+    Tries a hardlink, then a reflink, then falls back to copying the file. The file is
+    created under a temporary name and moved into place so `destination` is never partial.
+    """
+    tmp = "{0}.{1}.tmp".format(destination, uuid.uuid4().hex)
+
+    try:
+        try:
+            os.link(source, tmp)
+        except OSError:
+            try:
+                _reflink(source, tmp)
+            except OSError:
+                shutil.copyfile(source, tmp)
+
+        os.replace(tmp, destination)
+    finally:
+        if os.path.exists(tmp):
+            os.remove(tmp)
+
+
+class DownloadCache:
+    """A directory of files named by their SHA-1
+
+    Parameters:
+        directory (str): where the cached files are kept
+
+        max_size (int): the most bytes to keep - least recently used files are removed first
+    """
+
+    def __init__(self, directory, max_size):
+        self.directory = os.path.abspath(os.path.expanduser(directory))
+        self.max_size = max_size
+
+        os.makedirs(self.directory, exist_ok=True)
+
+    def path(self, sha1):
+        sha1 = sha1.lower()
+        return os.path.join(self.directory, sha1[:2], sha1)
+
+    @contextmanager
+    def lock(self, sha1):
+        """Lock a single cache entry, so only one process downloads a file at a time"""
+        path = self.path(sha1)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        with FileLock(path + ".lock"):
+            yield
+
+    def fetch(self, sha1, destination):
+        """Link the cached file with `sha1` to `destination`
+
+        Returns:
+            bool: True if the file was in the cache
+        """
+        path = self.path(sha1)
+
+        if not os.path.exists(path):
+            return False
+
+        try:
+            # the modification time of an entry is when it was last used
+            os.utime(path)
+            link_file(path, destination)
+        except FileNotFoundError:
+            # evicted by another process
+            return False
+
+        return True
+
+    def store(self, sha1, source):
+        """Add the downloaded file at `source` to the cache and evict old files if needed"""
+        path = self.path(sha1)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+
+        link_file(source, path)
+        self.evict()
+
+    def entries(self):
+        """Get the (path, size, last used) of every cached file"""
+        entries = []
+
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if name.endswith((".lock", ".tmp")):
+                    continue
+
+                path = os.path.join(root, name)
+
+                try:
+                    stat = os.stat(path)
+                except FileNotFoundError:
+                    continue
+
+                entries.append((path, stat.st_size, stat.st_mtime))
+
+        return entries
+
+    def evict(self):
+        """Remove the least recently used files until the cache fits in `max_size`"""
+        with FileLock(os.path.join(self.directory, ".lock")):
+            entries = sorted(self.entries(), key=lambda entry: entry[2])
+            size = sum(entry[1] for entry in entries)
+
+            for path, entry_size, _ in entries:
+                if size <= self.max_size:
+                    break
+
+                try:
+                    os.remove(path)
+                except FileNotFoundError:
+                    pass
+
+                size -= entry_size
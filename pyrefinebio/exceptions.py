@@ -67,3 +67,11 @@ class MissingFile(Exception):
         if extra_info:
             self.base_message += "\n" + extra_info
         super().__init__(self.base_message.format(file_name))
+
+
+class MissingObjects(Exception):
+    base_message = "{0} could not be found: {1}"
+    def __init__(self, type, missing, results=None):
+        self.missing = missing
+        self.results = results
+        super().__init__(self.base_message.format(type, ", ".join(str(m) for m in missing)))
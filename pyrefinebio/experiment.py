@@ -1,7 +1,11 @@
 from pyrefinebio import annotation as prb_annotation, sample as prb_sample
 from pyrefinebio.api_interface import get_by_endpoint
 from pyrefinebio.base import Base
-from pyrefinebio.util import create_paginated_list, parse_date
+from pyrefinebio.util import create_paginated_list, parse_date, with_page_size
+
+# How many accession codes are sent in a single `accession_code` search
+# so that the request url stays a reasonable length.
+ACCESSION_CODES_PER_REQUEST = 100
 
 
 class Experiment(Base):
@@ -100,6 +104,35 @@ class Experiment(Base):
         response = get_by_endpoint("experiments/" + accession_code).json()
         return Experiment(**response)
 
+    @classmethod
+    def get_many(cls, accession_codes, ignore_missing=False):
+        """Retrieve several Experiments based on their accession codes
+
+        The Experiments are retrieved with a few concurrent searches instead of one request each.
+
+            >>> experiments = pyrefinebio.Experiment.get_many(["GSE000001", "SRP000002"])
+
+        Returns:
+            list of Experiment: in the same order as `accession_codes`
+
+        Parameters:
+            accession_codes (list of str): the accession codes for the Experiments you want to get
+
+            ignore_missing (bool): if True, Experiments that can't be found are None in the list,
+                                   otherwise MissingObjects is raised with their accession codes
+        """
+        return cls._get_in_order(accession_codes, ignore_missing)
+
+    @classmethod
+    def _get_many(cls, accession_codes):
+        # each accession code is sent as its own `&accession_code=` param
+        return cls._search_many(
+            accession_codes,
+            lambda batch: cls.search(accession_code=batch),
+            ACCESSION_CODES_PER_REQUEST,
+            len("&accession_code="),
+        )
+
     @classmethod
     def search(cls, **kwargs):
         """Search for Experiments based on various filters
@@ -145,5 +178,5 @@ class Experiment(Base):
 
             offset (int): the initial index from which to return the results
         """
-        response = get_by_endpoint("search", params=kwargs)
+        response = get_by_endpoint("search", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
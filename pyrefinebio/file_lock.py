@@ -0,0 +1,67 @@
+import threading
+
+try:
+    import fcntl
+except ImportError:  # Windows
+    fcntl = None
+    import msvcrt
+
+
+class FileLock:
+    """An exclusive lock that is held across threads and processes
+
+    The lock is a file at `path`. It is re-entrant in the thread that holds it.
+
+        >>> with FileLock("/tmp/refinebio.lock"):
+        >>>     ...
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._lock = threading.RLock()
+        self._depth = 0
+        self._file = None
+
+    def acquire(self):
+        self._lock.acquire()
+
+        if self._depth == 0:
+            f = open(self.path, "a+b")
+
+            try:
+                if fcntl:
+                    fcntl.flock(f.fileno(), fcntl.LOCK_EX)
+                else:
+                    f.seek(0)
+                    msvcrt.locking(f.fileno(), msvcrt.LK_LOCK, 1)
+            except BaseException:
+                f.close()
+                self._lock.release()
+                raise
+
+            self._file = f
+
+        self._depth += 1
+
+    def release(self):
+        self._depth -= 1
+
+        if self._depth == 0:
+            f, self._file = self._file, None
+
+            if fcntl:
+                fcntl.flock(f.fileno(), fcntl.LOCK_UN)
+            else:
+                f.seek(0)
+                msvcrt.locking(f.fileno(), msvcrt.LK_UNLCK, 1)
+
+            f.close()
+
+        self._lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *args):
+        self.release()
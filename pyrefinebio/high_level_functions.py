@@ -56,6 +56,7 @@ def download_dataset(
     extract=False,
     prompt=True,
     notify_me=False,
+    convert=None,
 ):
     """download_dataset
 
@@ -106,6 +107,9 @@ def download_dataset(
 
         notify_me (bool): if true, refine.bio will send you an email when the dataset has finished processing.
                           Defaults to False.
+
+        convert (str): if set, the downloaded expression matrices will be converted to this
+                       format - `npy` or `parquet`. See `Dataset.convert`.
     """
     if dataset_dict and experiments:
         raise DownloadError(
@@ -162,6 +166,10 @@ def download_dataset(
         print("Extracting Dataset...")
         dataset.extract()
 
+    if convert:
+        print("Converting Dataset...")
+        dataset.convert(convert)
+
     return dataset
 
 
@@ -0,0 +1,103 @@
+"""Share one instance of each refine.bio object.
+
+By default every response is turned into new objects, so the same Sample returned by `get`
+and by a search, or referenced by several ComputedFiles, is a different Python object each
+time, and each one is fetched separately when an unset attribute is read.
+
+Inside `identity_map()` every object with the same type and identifier is the same instance.
+When the API returns an object that is already in the map, the values that are set in the
+new response are copied onto the existing instance and it is returned instead. Objects
+returned by `get` are marked as fetched, so reading an attribute that the response left empty
+doesn't request the object again.
+
+    >>> import pyrefinebio
+    >>> with pyrefinebio.identity_map():
+    >>>     sample = pyrefinebio.Sample.get("GSM000001")
+    >>>     assert pyrefinebio.Sample.search(accession_codes="GSM000001")[0] is sample
+
+The map is kept in a context variable, so blocks in different threads or asyncio tasks each
+have their own map. The thread pools used by `hydrate`, `get_many` and PaginatedList pass the
+caller's map on to their worker threads.
+"""
+import contextvars
+import threading
+from contextlib import contextmanager
+
+_current = contextvars.ContextVar("pyrefinebio_identity_map", default=None)
+
+
+class IdentityMap:
+    """The objects in a session, by (type, identifier)"""
+
+    def __init__(self):
+        self._objects = {}
+        self._lock = threading.RLock()
+
+    def __len__(self):
+        return len(self._objects)
+
+    def add(self, obj, merge):
+        """Add an object, or merge it into the instance that is already in the map
+
+        Returns:
+            the instance that should be used for `obj`
+
+        Parameters:
+            obj: a newly created object with an `_identifier`
+
+            merge (function): called with the existing instance and `obj` to update it
+        """
+        key = (type(obj), obj._identifier)
+
+        with self._lock:
+            existing = self._objects.get(key)
+
+            if existing is None:
+                self._objects[key] = obj
+                return obj
+
+            merge(existing, obj)
+            return existing
+
+    def clear(self):
+        with self._lock:
+            self._objects.clear()
+
+
+def current():
+    """Get the identity map that is in use, if any"""
+    return _current.get()
+
+
+def with_current(function):
+    """Wrap `function` so it uses the caller's identity map when run in another thread"""
+    objects = _current.get()
+
+    def run(*args, **kwargs):
+        token = _current.set(objects)
+
+        try:
+            return function(*args, **kwargs)
+        finally:
+            _current.reset(token)
+
+    return run
+
+
+@contextmanager
+def identity_map(objects=None):
+    """Use an identity map for the objects created inside the block
+
+    Parameters:
+        objects (IdentityMap): an existing map to keep using, by default a new one is made
+
+    Yields:
+        IdentityMap
+    """
+    objects = objects if objects is not None else IdentityMap()
+    token = _current.set(objects)
+
+    try:
+        yield objects
+    finally:
+        _current.reset(token)
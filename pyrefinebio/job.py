@@ -1,7 +1,7 @@
 from pyrefinebio import original_file as prb_original_file
 from pyrefinebio.api_interface import get_by_endpoint
 from pyrefinebio.base import Base
-from pyrefinebio.util import create_paginated_list, parse_date
+from pyrefinebio.util import create_paginated_list, parse_date, with_page_size
 
 
 class DownloaderJob(Base):
@@ -134,7 +134,7 @@ class DownloaderJob(Base):
 
             sample_accession_code (str): filter based on the Samples associated with the job
         """
-        response = get_by_endpoint("jobs/downloader", params=kwargs)
+        response = get_by_endpoint("jobs/downloader", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
 
 
@@ -271,7 +271,7 @@ class ProcessorJob(Base):
 
             sample_accession_code (str): filter based on the samples associated with the job
         """
-        response = get_by_endpoint("jobs/processor", params=kwargs)
+        response = get_by_endpoint("jobs/processor", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
 
 
@@ -361,5 +361,5 @@ class SurveyJob(Base):
 
             offset (int): the initial index from which to return the results.
         """
-        response = get_by_endpoint("jobs/survey", params=kwargs)
+        response = get_by_endpoint("jobs/survey", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
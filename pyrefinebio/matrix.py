@@ -0,0 +1,511 @@
+"""Load the expression matrices in downloaded Datasets and Compendia.
+
+Expression matrices are tab separated files with a row for each gene and a column for each
+sample. `load_matrix` converts a matrix into a binary file of float32 values the first time
+it is loaded, and memory-maps that file afterwards, so only the parts of the matrix that are
+used are read into memory.
+
+`open_matrix` works on the tab separated file itself. It extracts the matrix and indexes the
+position of each gene's row once, then reads just the rows that are asked for.
+
+This requires `numpy`, which can be installed with:
+
+.. code-block:: shell
+
+    $ pip install pyrefinebio[matrix]
+"""
+import json
+import os
+import threading
+
+from pyrefinebio import archive as prb_archive
+from pyrefinebio.exceptions import MissingFile
+
+# The number of rows that are transposed at a time when a matrix is stored by sample.
+TRANSPOSE_ROWS = 4096
+
+MISSING_VALUES = ("", "NA", "NaN", "nan", "null")
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "Loading matrices requires numpy. "
+            "You can install it with `pip install pyrefinebio[matrix]`"
+        )
+
+    return numpy
+
+
+def expression_files(archive_path):
+    """List the expression matrices in a downloaded archive
+
+    Returns:
+        list of str
+    """
+    return [
+        name
+        for name in prb_archive.list_members(archive_path)
+        if name.endswith(".tsv") and not os.path.basename(name).startswith("metadata")
+    ]
+
+
+def _expression_file(archive_path, name):
+    names = expression_files(archive_path)
+
+    if name is None:
+        if len(names) == 1:
+            return names[0]
+
+        if not names:
+            raise MissingFile("expression matrix", "No expression matrix found in " + archive_path)
+
+        raise ValueError(
+            "There is more than one expression matrix, choose one with `name`: " + ", ".join(names)
+        )
+
+    if name not in names:
+        raise MissingFile(name, "The expression matrix was not found in " + archive_path)
+
+    return name
+
+
+def parse_row(line, np):
+    """Split a matrix row into its gene and a float32 array of its values"""
+    fields = line.rstrip("\r\n").split("\t")
+
+    try:
+        values = np.array(fields[1:], dtype=np.float32)
+    except ValueError:
+        values = np.array(
+            [np.nan if value in MISSING_VALUES else value for value in fields[1:]],
+            dtype=np.float32,
+        )
+
+    return fields[0], values
+
+
+def parse_header(line):
+    """Get the sample names from a matrix header"""
+    return line.rstrip("\r\n").split("\t")[1:]
+
+
+class Matrix:
+    """An expression matrix with a row for each gene and a column for each sample
+
+    `values` is a 2D numpy array, or a memory-mapped one if the Matrix came from
+    `load_matrix`. Use `subset` to read the values for some genes or samples.
+
+        >>> matrix = compendium.load_matrix()
+        >>> subset = matrix.subset(genes=["ENSG00000141510", "ENSG00000012048"])
+        >>> subset.values
+
+    Parameters:
+        values (numpy.ndarray): the values, with shape (genes, samples)
+
+        genes (list): the gene for each row
+
+        samples (list): the sample for each column
+    """
+
+    def __init__(self, values, genes, samples):
+        self.values = values
+        self.genes = list(genes)
+        self.samples = list(samples)
+
+        self._gene_index = None
+        self._sample_index = None
+
+    @property
+    def shape(self):
+        return self.values.shape
+
+    def gene_positions(self, genes):
+        """Get the row of each gene"""
+        if self._gene_index is None:
+            self._gene_index = {gene: i for i, gene in enumerate(self.genes)}
+
+        return _positions(self._gene_index, genes, "genes")
+
+    def sample_positions(self, samples):
+        """Get the column of each sample"""
+        if self._sample_index is None:
+            self._sample_index = {sample: i for i, sample in enumerate(self.samples)}
+
+        return _positions(self._sample_index, samples, "samples")
+
+    def subset(self, genes=None, samples=None):
+        """Get the values for some genes and/or samples
+
+        Only the rows, or the columns of a Matrix stored by sample, that are needed are read.
+
+        Returns:
+            Matrix
+
+        Parameters:
+            genes (list): the genes to keep - defaults to every gene
+
+            samples (list): the samples to keep - defaults to every sample
+        """
+        np = _numpy()
+
+        rows = self.gene_positions(genes) if genes is not None else None
+        columns = self.sample_positions(samples) if samples is not None else None
+
+        values = self.values
+
+        # select along the stored axis first so that only the needed pages are read
+        if _stored_by_sample(values):
+            if columns is not None:
+                values = values[:, columns]
+            if rows is not None:
+                values = values[rows]
+        else:
+            if rows is not None:
+                values = values[rows]
+            if columns is not None:
+                values = values[:, columns]
+
+        return Matrix(
+            np.array(values),
+            self.genes if genes is None else genes,
+            self.samples if samples is None else samples,
+        )
+
+    def to_dataframe(self):
+        """Get the Matrix as a pandas DataFrame indexed by gene
+
+        Returns:
+            pandas.DataFrame
+        """
+        try:
+            import pandas
+        except ImportError:
+            raise ImportError(
+                "Matrix.to_dataframe requires pandas. "
+                "You can install it with `pip install pandas`"
+            )
+
+        return pandas.DataFrame(self.values, index=self.genes, columns=self.samples)
+
+
+def _positions(index, keys, kind):
+    missing = [key for key in keys if key not in index]
+
+    if missing:
+        raise KeyError("Unknown {0}: {1}".format(kind, ", ".join(map(str, missing))))
+
+    return [index[key] for key in keys]
+
+
+def _stored_by_sample(values):
+    # a matrix stored by sample is the transpose of a C ordered array
+    return values.ndim == 2 and values.flags.f_contiguous and not values.flags.c_contiguous
+
+
+def _matrix_path(archive_path, name, by):
+    directory = os.path.splitext(archive_path)[0] + "_matrices"
+    base = os.path.splitext(name)[0].replace("/", "__")
+
+    return os.path.join(directory, "{0}.{1}".format(base, by))
+
+
+def _source(archive_path, name):
+    stat = os.stat(archive_path)
+    return {"name": name, "size": stat.st_size, "mtime": stat.st_mtime}
+
+
+def convert_matrix(archive_path, name, path, by="gene"):
+    """Convert an expression matrix in an archive into a binary file of float32 values
+
+    The matrix is read straight from the archive one row at a time. The values are written
+    to `<path>.f32`, in C order with a row per gene if `by` is "gene" or a row per sample if
+    `by` is "sample", and the genes and samples are written to `<path>.json`.
+    """
+    np = _numpy()
+
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    genes = []
+    by_gene = path + ".f32.tmp"
+
+    with prb_archive.open_member(archive_path, name, encoding="utf-8") as f:
+        samples = parse_header(f.readline())
+
+        with open(by_gene, "wb") as out:
+            for line in f:
+                if not line.strip():
+                    continue
+
+                gene, values = parse_row(line, np)
+
+                if len(values) != len(samples):
+                    raise ValueError(
+                        "Row for {0} has {1} values but there are {2} samples".format(
+                            gene, len(values), len(samples)
+                        )
+                    )
+
+                out.write(values.tobytes())
+                genes.append(gene)
+
+    shape = (len(genes), len(samples))
+
+    if by == "sample":
+        by_sample = path + ".T.f32.tmp"
+
+        if all(shape):
+            source = np.memmap(by_gene, dtype=np.float32, mode="r", shape=shape)
+            target = np.memmap(by_sample, dtype=np.float32, mode="w+", shape=shape[::-1])
+
+            for start in range(0, shape[0], TRANSPOSE_ROWS):
+                target[:, start : start + TRANSPOSE_ROWS] = source[start : start + TRANSPOSE_ROWS].T
+
+            target.flush()
+            del source, target
+        else:
+            open(by_sample, "wb").close()
+
+        os.remove(by_gene)
+        os.replace(by_sample, path + ".f32")
+    else:
+        os.replace(by_gene, path + ".f32")
+
+    index = {
+        "source": _source(archive_path, name),
+        "by": by,
+        "genes": genes,
+        "samples": samples,
+    }
+
+    # the index is written last so a partly converted matrix is never used
+    with open(path + ".json.tmp", "w") as f:
+        json.dump(index, f)
+    os.replace(path + ".json.tmp", path + ".json")
+
+
+def load_matrix(archive_path, name=None, by="gene"):
+    """Memory-map an expression matrix from a downloaded archive
+
+    The matrix is converted with `convert_matrix` the first time it is loaded, and again if
+    the archive changes. The converted files are kept in a `<archive>_matrices` directory
+    next to the archive.
+
+    Returns:
+        Matrix
+
+    Parameters:
+        archive_path (str): the path to the downloaded zip
+
+        name (str): the expression matrix to load - required if there is more than one
+
+        by (str): "gene" to store the values gene by gene, which makes reading a subset of
+                  genes fast, or "sample" to store them sample by sample, which makes
+                  reading a subset of samples fast
+    """
+    if by not in ("gene", "sample"):
+        raise ValueError('`by` must be "gene" or "sample"')
+
+    np = _numpy()
+
+    name = _expression_file(archive_path, name)
+    path = _matrix_path(archive_path, name, by)
+
+    index = None
+    if os.path.exists(path + ".json"):
+        with open(path + ".json") as f:
+            index = json.load(f)
+
+    if index is None or index["source"] != _source(archive_path, name):
+        convert_matrix(archive_path, name, path, by)
+
+        with open(path + ".json") as f:
+            index = json.load(f)
+
+    genes, samples = index["genes"], index["samples"]
+
+    if not genes or not samples:
+        values = np.zeros((len(genes), len(samples)), dtype=np.float32)
+    elif by == "sample":
+        values = np.memmap(
+            path + ".f32", dtype=np.float32, mode="r", shape=(len(samples), len(genes))
+        ).T
+    else:
+        values = np.memmap(
+            path + ".f32", dtype=np.float32, mode="r", shape=(len(genes), len(samples))
+        )
+
+    return Matrix(values, genes, samples)
+
+
+class MatrixReader:
+    """Reads the rows of an extracted expression matrix by seeking to them
+
+    The byte offset of every row is found once and saved to `<path>.index.json`, so later
+    readers of the same file start without scanning it.
+
+    Parameters:
+        path (str): the path to the extracted tab separated matrix
+    """
+
+    def __init__(self, path):
+        self.path = path
+
+        index = None
+        if os.path.exists(path + ".index.json"):
+            with open(path + ".index.json") as f:
+                index = json.load(f)
+
+        if index is None or index["size"] != os.path.getsize(path):
+            index = self._build_index()
+
+        self.samples = index["samples"]
+        self.genes = index["genes"]
+        self.offsets = index["offsets"]
+
+        self._gene_index = {gene: i for i, gene in enumerate(self.genes)}
+        self._sample_index = {sample: i for i, sample in enumerate(self.samples)}
+
+    def _build_index(self):
+        genes = []
+        offsets = []
+
+        with open(self.path, "rb") as f:
+            header = f.readline()
+            position = len(header)
+
+            for line in f:
+                if line.strip():
+                    genes.append(line.split(b"\t", 1)[0].decode("utf-8"))
+                    offsets.append(position)
+
+                position += len(line)
+
+        index = {
+            "size": os.path.getsize(self.path),
+            "samples": parse_header(header.decode("utf-8")),
+            "genes": genes,
+            "offsets": offsets,
+        }
+
+        with open(self.path + ".index.json.tmp", "w") as f:
+            json.dump(index, f)
+        os.replace(self.path + ".index.json.tmp", self.path + ".index.json")
+
+        return index
+
+    def read(self, genes=None, samples=None):
+        """Read the values for some genes and/or samples
+
+        Selecting genes reads only their rows. Selecting only samples reads every row but
+        only parses the values for those samples.
+
+        Returns:
+            Matrix
+
+        Parameters:
+            genes (list): the genes to read - defaults to every gene
+
+            samples (list): the samples to read - defaults to every sample
+        """
+        np = _numpy()
+
+        rows = range(len(self.genes))
+        if genes is not None:
+            rows = _positions(self._gene_index, genes, "genes")
+
+        columns = None
+        if samples is not None:
+            columns = _positions(self._sample_index, samples, "samples")
+
+        width = len(self.samples) if columns is None else len(columns)
+        values = np.empty((len(rows), width), dtype=np.float32)
+
+        with open(self.path, "rb") as f:
+            if genes is None:
+                f.seek(self.offsets[0] if self.offsets else 0)
+                lines = (line for line in f if line.strip())
+            else:
+                lines = self._seek_lines(f, rows)
+
+            for i, line in enumerate(lines):
+                line = line.decode("utf-8")
+
+                if columns is not None:
+                    fields = line.rstrip("\r\n").split("\t")
+                    line = "\t".join([fields[0]] + [fields[c + 1] for c in columns])
+
+                values[i] = parse_row(line, np)[1]
+
+        return Matrix(
+            values,
+            self.genes if genes is None else genes,
+            self.samples if samples is None else samples,
+        )
+
+    def _seek_lines(self, f, rows):
+        # read in file order, then put the rows back in the order they were asked for
+        order = sorted(range(len(rows)), key=lambda i: self.offsets[rows[i]])
+        lines = [None] * len(rows)
+
+        for i in order:
+            f.seek(self.offsets[rows[i]])
+            lines[i] = f.readline()
+
+        return lines
+
+
+_readers = {}
+_readers_lock = threading.Lock()
+
+
+def _extracted_source(path):
+    """Get the source of a matrix that has been extracted to `path`"""
+    if not os.path.exists(path):
+        return None
+
+    try:
+        with open(path + ".source.json") as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def open_matrix(archive_path, name=None):
+    """Get a MatrixReader for an expression matrix in a downloaded archive
+
+    The matrix is extracted to a `<archive>_matrices` directory next to the archive the first
+    time it is opened. Readers are kept for the life of the process, so repeated queries
+    against the same matrix only read the rows they need.
+
+    Returns:
+        MatrixReader
+
+    Parameters:
+        archive_path (str): the path to the downloaded zip
+
+        name (str): the expression matrix to open - required if there is more than one
+    """
+    name = _expression_file(archive_path, name)
+    source = _source(archive_path, name)
+    directory = os.path.splitext(archive_path)[0] + "_matrices"
+    path = os.path.join(directory, name)
+
+    with _readers_lock:
+        reader, reader_source = _readers.get(path, (None, None))
+
+        if reader is not None and reader_source == source:
+            return reader
+
+        if _extracted_source(path) != source:
+            prb_archive.extract_members(archive_path, [name], directory)
+
+            with open(path + ".source.json", "w") as f:
+                json.dump(source, f)
+
+        reader = MatrixReader(path)
+        _readers[path] = (reader, source)
+
+        return reader
@@ -1,6 +1,6 @@
 from pyrefinebio.api_interface import get_by_endpoint
 from pyrefinebio.base import Base
-from pyrefinebio.util import create_paginated_list
+from pyrefinebio.util import create_paginated_list, with_page_size
 
 
 class Organism(Base):
@@ -56,5 +56,5 @@ class Organism(Base):
             has_quantfile_compendia (bool): filter based on if this Organism has an
                                             RNA-seq Sample Compendium associated with it
         """
-        response = get_by_endpoint("organisms", params=kwargs)
+        response = get_by_endpoint("organisms", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
@@ -1,7 +1,7 @@
 from pyrefinebio import job as prb_job, sample as prb_sample
 from pyrefinebio.api_interface import get_by_endpoint
 from pyrefinebio.base import Base
-from pyrefinebio.util import create_paginated_list, parse_date
+from pyrefinebio.util import create_paginated_list, parse_date, with_page_size
 
 
 class OriginalFile(Base):
@@ -94,6 +94,24 @@ class OriginalFile(Base):
         response = get_by_endpoint("original_files/" + str(id)).json()
         return OriginalFile(**response)
 
+    @classmethod
+    def get_many(cls, ids, ignore_missing=False):
+        """Retrieve several OriginalFiles based on their ids
+
+        The API can't filter OriginalFiles by many ids at once, so they are retrieved
+        with concurrent requests.
+
+        Returns:
+            list of OriginalFile: in the same order as `ids`
+
+        Parameters:
+            ids (list of int): the ids for the OriginalFiles you want to get
+
+            ignore_missing (bool): if True, OriginalFiles that can't be found are None in the list,
+                                   otherwise MissingObjects is raised with their ids
+        """
+        return cls._get_in_order(ids, ignore_missing)
+
     @classmethod
     def search(cls, **kwargs):
         """Retrieve a list of OriginalFiles based on various filters
@@ -137,5 +155,5 @@ class OriginalFile(Base):
             offset (int): the initial index from which to return the results.
         """
 
-        response = get_by_endpoint("original_files", params=kwargs)
+        response = get_by_endpoint("original_files", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
@@ -1,6 +1,6 @@
 from pyrefinebio.api_interface import get_by_endpoint
 from pyrefinebio.base import Base
-from pyrefinebio.util import create_paginated_list
+from pyrefinebio.util import create_paginated_list, with_page_size
 
 
 class Processor(Base):
@@ -49,5 +49,5 @@ class Processor(Base):
 
         Since there are no filters, this method always returns all Processors
         """
-        response = get_by_endpoint("processors", params=kwargs)
+        response = get_by_endpoint("processors", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
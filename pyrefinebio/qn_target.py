@@ -1,7 +1,8 @@
 from pyrefinebio import organism as prb_organism
-from pyrefinebio.api_interface import get_by_endpoint
+from pyrefinebio.api_interface import download_file, get_by_endpoint
 from pyrefinebio.base import Base
-from pyrefinebio.util import parse_date
+from pyrefinebio.exceptions import DownloadError
+from pyrefinebio.util import expand_path, parse_date
 
 
 class QNTarget(Base):
@@ -17,6 +18,12 @@ class QNTarget(Base):
 
         >>> import pyrefinebio
         >>> qn_target_organisms = pyrefinebio.QNTarget.search()
+
+    Download a QN target
+
+        >>> import pyrefinebio
+        >>> qn_target = pyrefinebio.QNTarget.get("GORILLA")
+        >>> qn_target.download("./")
     """
 
     def __init__(
@@ -47,6 +54,8 @@ class QNTarget(Base):
         self.last_modified = parse_date(last_modified)
         self.result = result
 
+        self._downloaded_path = None
+
     @classmethod
     def get(cls, organism_name):
         """Retrieve a QNTarget based on organism name
@@ -71,3 +80,33 @@ class QNTarget(Base):
         """
         response = get_by_endpoint("qn_targets", params=kwargs).json()
         return [prb_organism.Organism(**qn_organism) for qn_organism in response]
+
+    def download(self, path, prompt=True):
+        """Download a QNTarget
+
+        The downloaded file is checked against the QNTarget's `sha1` and `size_in_bytes`
+
+        Returns:
+            QNTarget
+
+        Parameters:
+            path (str): the path that the QNTarget should be downloaded to
+
+            prompt (bool): if true, will prompt before downloading files bigger than 1GB
+        """
+        if not self.s3_url:
+            raise DownloadError("QNTarget", "Download url not found")
+
+        full_path = expand_path(path, self.filename or "qn-target-" + str(self.id) + ".tsv")
+
+        download_file(
+            self.s3_url,
+            full_path,
+            prompt,
+            sha1=self.sha1,
+            size_in_bytes=self.size_in_bytes,
+        )
+
+        self._downloaded_path = full_path
+
+        return self
@@ -0,0 +1,129 @@
+"""Rate limiting for requests to the refine.bio API.
+
+The API limits the number of requests per second from each IP address. By default the limit
+is tracked in memory, which only works if a single process is making requests. Set
+`Config.api_rate_limit_path` to track it in a SQLite database that is shared by every
+process on the machine that uses the same path.
+
+When the API responds with `429 Too Many Requests`, every process sharing the limit waits
+for the time in the response's `Retry-After` header before sending more requests.
+"""
+import email.utils
+import os
+import threading
+import time
+
+from pyrate_limiter import Duration, Limiter, RequestRate
+from pyrate_limiter.sqlite_bucket import SQLiteBucket
+
+from pyrefinebio.file_lock import FileLock
+
+# How long to wait after a 429 response that doesn't say how long to wait.
+DEFAULT_RETRY_AFTER = 1
+
+
+class SharedBucket(SQLiteBucket):
+    """A SQLite bucket that can be used by several processes at once
+
+    Each transaction holds a lock on `<path>.lock`, and the bucket's size is read from the
+    database every time since other processes change it.
+    """
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = FileLock(str(self._path) + ".lock")
+
+    def size(self):
+        return self._query_size()
+
+    def _update_size(self, amount):
+        pass
+
+
+def create_limiter(config):
+    """Create the Limiter for the configured rate, shared across processes if configured"""
+    rate = RequestRate(config.api_max_calls_per_second, Duration.SECOND)
+
+    if not config.api_rate_limit_path:
+        return Limiter(rate)
+
+    path = os.path.abspath(os.path.expanduser(config.api_rate_limit_path))
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+
+    # monotonic clocks aren't comparable between processes
+    return Limiter(
+        rate, bucket_class=SharedBucket, bucket_kwargs={"path": path}, time_function=time.time
+    )
+
+
+def retry_after(response):
+    """Get the number of seconds a response says to wait before trying again"""
+    value = (response.headers or {}).get("Retry-After")
+
+    if value is None:
+        return DEFAULT_RETRY_AFTER
+
+    try:
+        return max(float(value), 0)
+    except ValueError:
+        pass
+
+    try:
+        return max(email.utils.parsedate_to_datetime(value).timestamp() - time.time(), 0)
+    except (TypeError, ValueError):
+        return DEFAULT_RETRY_AFTER
+
+
+class Throttle:
+    """Pauses requests after the API asks for them to slow down
+
+    If `path` is set, the time that requests can start again is written to it so that other
+    processes pause as well.
+    """
+
+    def __init__(self, path=None):
+        self.path = path
+        self._until = 0
+        self._lock = threading.Lock()
+
+    def pause(self, seconds):
+        """Stop requests from being sent for `seconds`"""
+        until = time.time() + seconds
+
+        with self._lock:
+            if until <= self._until:
+                return
+
+            self._until = until
+
+            if self.path:
+                with open(self.path + ".tmp{0}".format(os.getpid()), "w") as f:
+                    f.write(str(until))
+                os.replace(self.path + ".tmp{0}".format(os.getpid()), self.path)
+
+    def remaining(self):
+        """Get how long to wait before sending a request"""
+        until = self._until
+
+        if self.path:
+            try:
+                with open(self.path) as f:
+                    until = max(until, float(f.read()))
+            except (OSError, ValueError):
+                pass
+
+        return max(until - time.time(), 0)
+
+    def wait(self):
+        remaining = self.remaining()
+
+        if remaining:
+            time.sleep(remaining)
+
+
+def create_throttle(config):
+    if not config.api_rate_limit_path:
+        return Throttle()
+
+    path = os.path.abspath(os.path.expanduser(config.api_rate_limit_path))
+    return Throttle(path + ".retry-after")
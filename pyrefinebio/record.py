@@ -0,0 +1,75 @@
+import inspect
+
+_record_types = {}
+
+
+class Record:
+    """Record
+
+    Records are compact, read only versions of model objects that are used for bulk results.
+    They store the values returned by the API as-is in `__slots__`: nested objects are kept
+    as dicts, dates are kept as strings, and nothing is lazily loaded.
+
+    A record costs `32 + 8 * number of fields` bytes plus the size of its values, compared
+    to a model object which also carries a `__dict__`, nested model objects, and parsed
+    datetimes. For a Sample, with its 42 fields, that is 368 bytes per record.
+
+    Records can be turned into full model objects with `to_model()`.
+
+        >>> samples = pyrefinebio.Sample.search(organism__name="HOMO_SAPIENS").compact()
+        >>> record = samples[0]
+        >>> record.accession_code
+        >>> sample = record.to_model()
+    """
+
+    __slots__ = ()
+    model = None
+
+    def __init__(self, **kwargs):
+        for field in self.__slots__:
+            object.__setattr__(self, field, kwargs.get(field))
+
+    def __setattr__(self, attr, value):
+        raise AttributeError("Records are immutable")
+
+    def __repr__(self):
+        return "{0}({1})".format(type(self).__name__, self.to_dict())
+
+    def __eq__(self, other):
+        return type(self) is type(other) and self.to_dict() == other.to_dict()
+
+    def to_dict(self):
+        """Get the values of the record
+
+        Returns:
+            dict
+        """
+        return {field: getattr(self, field) for field in self.__slots__}
+
+    def to_model(self):
+        """Get the full model object for this record
+
+        Returns:
+            the model object, e.g. Sample for a SampleRecord
+        """
+        return self.model(**self.to_dict())
+
+
+def record_type(T):
+    """Get the Record type for a model class
+
+    The record's fields are the parameters of the model's `__init__`.
+
+    Returns:
+        type
+    """
+    if T not in _record_types:
+        fields = tuple(
+            name for name in inspect.signature(T.__init__).parameters if name != "self"
+        )
+
+        _record_types[T] = type(
+            T.__name__ + "Record", (Record,), {"__slots__": fields, "model": T}
+        )
+
+    return _record_types[T]
@@ -0,0 +1,288 @@
+"""A cache of responses from the refine.bio API.
+
+Metadata like Organisms, Platforms and Processors rarely changes, but it is requested again
+every time a script runs and whenever an unfetched object is read. When the cache is on,
+GET responses are kept in memory, and in a SQLite database if `Config.api_cache_path` is set,
+and reused until they are older than the time to live for their endpoint.
+
+Once a response expires it is revalidated with `If-None-Match` or `If-Modified-Since` using
+the `ETag` and `Last-Modified` headers it was sent with. If the API answers `304 Not Modified`
+the cached response is used again without the API sending it a second time.
+
+The times to live, in seconds, are in `DEFAULT_TTLS` by the first part of each endpoint.
+Endpoints that aren't listed, like jobs and datasets, are never cached. They can be changed
+with `Config.api_cache_ttls`.
+"""
+import hashlib
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urlencode
+
+import requests
+
+HOUR = 60 * 60
+DAY = 24 * HOUR
+
+DEFAULT_TTLS = {
+    "organisms": DAY,
+    "platforms": DAY,
+    "processors": DAY,
+    "qn_targets": DAY,
+    "institutions": DAY,
+    "transcriptome_indices": DAY,
+    "compendia": DAY,
+    "experiments": HOUR,
+    "samples": HOUR,
+    "search": HOUR,
+    "computed_files": HOUR,
+    "original_files": HOUR,
+    "computational_results": HOUR,
+}
+
+
+class MemoryStore:
+    """Keeps the `max_entries` most recently used responses in memory"""
+
+    def __init__(self, max_entries):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+
+            if entry is not None:
+                self._entries.move_to_end(key)
+
+            return entry
+
+    def set(self, key, entry):
+        if self.max_entries <= 0:
+            return
+
+        with self._lock:
+            self._entries[key] = entry
+            self._entries.move_to_end(key)
+
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class SQLiteStore:
+    """Keeps responses in a SQLite database so they can be used by later runs
+
+    Responses that have expired are removed when the database is opened, and only the
+    `max_entries` most recently used responses are kept. If `max_entries` is 0 or less the
+    number of responses isn't limited.
+    """
+
+    def __init__(self, path, max_entries=10000):
+        self.path = os.path.abspath(os.path.expanduser(path))
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(self.path), exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(self.path, check_same_thread=False)
+
+        with self._lock, self._connection:
+            self._connection.execute(
+                "CREATE TABLE IF NOT EXISTS responses "
+                "(key TEXT PRIMARY KEY, entry TEXT, expires REAL, used INTEGER)"
+            )
+            self._connection.execute(
+                "CREATE INDEX IF NOT EXISTS responses_used ON responses (used)"
+            )
+            self._connection.execute("DELETE FROM responses WHERE expires <= ?", (time.time(),))
+
+    def get(self, key):
+        with self._lock, self._connection:
+            row = self._connection.execute(
+                "SELECT entry FROM responses WHERE key = ?", (key,)
+            ).fetchone()
+
+            if row:
+                self._connection.execute(
+                    "UPDATE responses SET used = (SELECT MAX(used) + 1 FROM responses) "
+                    "WHERE key = ?",
+                    (key,),
+                )
+
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, entry):
+        with self._lock, self._connection:
+            self._connection.execute(
+                "INSERT OR REPLACE INTO responses (key, entry, expires, used) "
+                "VALUES (?, ?, ?, (SELECT COALESCE(MAX(used), 0) + 1 FROM responses))",
+                (key, json.dumps(entry), entry.get("expires")),
+            )
+
+            if self.max_entries > 0:
+                self._connection.execute(
+                    "DELETE FROM responses WHERE key IN "
+                    "(SELECT key FROM responses ORDER BY used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,),
+                )
+
+    def clear(self):
+        with self._lock, self._connection:
+            self._connection.execute("DELETE FROM responses")
+
+
+class ResponseCache:
+    """Caches GET responses in memory and optionally on disk
+
+    Parameters:
+        base_url (str): the API's base url, which is stripped to find a url's endpoint
+
+        max_entries (int): the most responses to keep in memory
+
+        path (str): a SQLite database to also keep responses in
+
+        ttls (dict): times to live in seconds by endpoint, which are added to `DEFAULT_TTLS`
+
+        max_path_entries (int): the most responses to keep in the SQLite database, 0 for no
+                                limit
+    """
+
+    def __init__(self, base_url, max_entries=1000, path=None, ttls=None, max_path_entries=10000):
+        self.base_url = base_url
+        self.ttls = dict(DEFAULT_TTLS, **(ttls or {}))
+
+        self.stores = [MemoryStore(max_entries)]
+
+        if path:
+            self.stores.append(SQLiteStore(path, max_path_entries))
+
+    @classmethod
+    def from_config(cls, config):
+        """Create the cache described by `config`, or return None if it is off"""
+        if config.api_cache_size <= 0 and not config.api_cache_path:
+            return None
+
+        return cls(
+            config.base_url,
+            max_entries=config.api_cache_size,
+            path=config.api_cache_path,
+            ttls=config.api_cache_ttls,
+            max_path_entries=config.api_cache_path_size,
+        )
+
+    def ttl(self, url):
+        """Get how long responses from `url` are fresh for, 0 if they aren't cached"""
+        if not url.startswith(self.base_url):
+            return 0
+
+        endpoint = url[len(self.base_url) :].split("/")[0]
+        return self.ttls.get(endpoint, 0)
+
+    def key(self, url, params=None, token=None):
+        """Get the cache key for a request
+
+        Responses like compendia and computed files include a `download_url` only for an
+        activated token, so responses are cached separately for each token. A hash of the
+        token is used so that it isn't stored in the cache.
+        """
+        key = request_key(url, params)
+
+        if token:
+            key += "#" + hashlib.sha256(str(token).encode("utf-8")).hexdigest()
+
+        return key
+
+    def get(self, key):
+        """Get a cached entry, which may have expired"""
+        for i, store in enumerate(self.stores):
+            entry = store.get(key)
+
+            if entry is not None:
+                for faster in self.stores[:i]:
+                    faster.set(key, entry)
+
+                return entry
+
+        return None
+
+    def set(self, key, entry):
+        for store in self.stores:
+            store.set(key, entry)
+
+    def clear(self):
+        for store in self.stores:
+            store.clear()
+
+    def store(self, key, response, ttl):
+        """Cache a response
+
+        Returns:
+            dict: the cache entry
+        """
+        entry = {
+            "url": response.url,
+            "body": response.content.decode("utf-8"),
+            "etag": response.headers.get("ETag"),
+            "last_modified": response.headers.get("Last-Modified"),
+            "expires": time.time() + ttl,
+        }
+        self.set(key, entry)
+
+        return entry
+
+    def refresh(self, key, entry, ttl):
+        """Mark an entry as fresh again after it was revalidated"""
+        entry = dict(entry, expires=time.time() + ttl)
+        self.set(key, entry)
+
+        return entry
+
+
+def request_key(url, params=None):
+    """Get a string that is the same for every request for the same url and params"""
+    if not params:
+        return url
+
+    return url + "?" + urlencode(sorted(params.items()), doseq=True)
+
+
+def is_fresh(entry):
+    return entry["expires"] > time.time()
+
+
+def validators(entry):
+    """Get the headers that make a request conditional on an entry having changed"""
+    headers = {}
+
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+
+    return headers
+
+
+def to_response(entry):
+    """Make a requests.Response from a cache entry"""
+    response = requests.Response()
+    response.status_code = 200
+    response.url = entry["url"]
+    response.encoding = "utf-8"
+    response._content = entry["body"].encode("utf-8")
+    response.headers["Content-Type"] = "application/json"
+
+    if entry.get("etag"):
+        response.headers["ETag"] = entry["etag"]
+
+    if entry.get("last_modified"):
+        response.headers["Last-Modified"] = entry["last_modified"]
+
+    return response
@@ -0,0 +1,127 @@
+"""Retrying API requests that fail for reasons that are likely to be temporary.
+
+Idempotent requests that fail with a connection error or one of `Config.api_retry_statuses`
+are sent again after an exponential backoff, up to `Config.api_max_retries` times. The
+backoff before retry `n` is a random time between zero and `api_retry_backoff * 2 ** n`
+seconds (capped at `max_backoff`), so that clients that failed together don't all retry
+at the same moment. If the response has a `Retry-After` header, at least that long is waited.
+
+The number of retries is counted, so long running jobs can report how often they happen.
+
+    >>> from pyrefinebio import api_interface
+    >>> api_interface.retry_policy.stats()
+    {'retries': 2, 'gave up': 0, 'connection error': 1, 503: 1}
+"""
+import random
+import threading
+import time
+from collections import Counter
+
+from pyrefinebio.rate_limit import retry_after
+
+CONNECTION_ERROR = "connection error"
+
+
+class RetryPolicy:
+    """Decides which requests are retried and how long to wait before retrying them
+
+    Parameters:
+        max_retries (int): the most times a request is sent again
+
+        backoff (float): the base of the exponential backoff in seconds
+
+        max_backoff (float): the longest backoff in seconds, not counting `Retry-After`
+
+        jitter (bool): if True, each backoff is a random time up to the exponential backoff
+
+        statuses (list of int): the response status codes that are retried
+
+        methods (list of str): the HTTP methods that are safe to retry
+    """
+
+    def __init__(
+        self,
+        max_retries=3,
+        backoff=0.5,
+        max_backoff=60,
+        jitter=True,
+        statuses=(500, 502, 503, 504),
+        methods=("GET", "HEAD"),
+    ):
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_backoff = max_backoff
+        self.jitter = jitter
+        self.statuses = set(statuses)
+        self.methods = {method.upper() for method in methods}
+
+        self._counts = Counter()
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, config):
+        return cls(
+            max_retries=config.api_max_retries,
+            backoff=config.api_retry_backoff,
+            statuses=config.api_retry_statuses,
+        )
+
+    def should_retry(self, method, attempt, response=None):
+        """Check if a request should be sent again
+
+        Parameters:
+            method (str): the request's HTTP method
+
+            attempt (int): the number of times the request has already been retried
+
+            response: the response, or None if the request failed to connect
+        """
+        if method.upper() not in self.methods:
+            return False
+
+        if response is not None and response.status_code not in self.statuses:
+            return False
+
+        if attempt >= self.max_retries:
+            self._count("gave up")
+            return False
+
+        return True
+
+    def delay(self, attempt, response=None):
+        """Get how long to wait before sending a request again and count the retry"""
+        delay = min(self.backoff * 2 ** attempt, self.max_backoff)
+
+        if self.jitter:
+            delay = random.uniform(0, delay)
+
+        if response is not None and response.headers and "Retry-After" in response.headers:
+            delay = max(delay, retry_after(response))
+
+        self._count("retries")
+        self._count(CONNECTION_ERROR if response is None else response.status_code)
+
+        return delay
+
+    def wait(self, attempt, response=None):
+        time.sleep(self.delay(attempt, response))
+
+    def _count(self, key):
+        with self._lock:
+            self._counts[key] += 1
+
+    def stats(self):
+        """Get the number of retries, by the error that caused them
+
+        Returns:
+            dict: with "retries" and "gave up" totals, and a count for each status code
+                  or "connection error"
+        """
+        with self._lock:
+            stats = {"retries": 0, "gave up": 0}
+            stats.update(self._counts)
+            return stats
+
+    def reset_stats(self):
+        with self._lock:
+            self._counts.clear()
@@ -8,8 +8,12 @@ from pyrefinebio import (
     job as prb_job,
 )
 from pyrefinebio.api_interface import get_by_endpoint
-from pyrefinebio.base import Base
-from pyrefinebio.util import create_paginated_list, parse_date
+from pyrefinebio.base import Base, hydrate
+from pyrefinebio.util import create_paginated_list, parse_date, with_page_size
+
+# How many accession codes are sent in a single `accession_codes` search
+# so that the request url stays a reasonable length.
+ACCESSION_CODES_PER_REQUEST = 100
 
 
 class Sample(Base):
@@ -142,7 +146,12 @@ class Sample(Base):
         
     @property
     def experiments(self):
-        if not self._experiments:
+        """The Experiments that this Sample is in.
+
+        Reading it searches for the Experiments, and the PaginatedList of results is kept.
+        After `Sample.resolve_experiments` it is a list of Experiment instead.
+        """
+        if self._experiments is None:
             self._experiments = prb_experiment.Experiment.search(
                 accession_code=self.experiment_accession_codes
             )
@@ -166,6 +175,81 @@ class Sample(Base):
         response = get_by_endpoint("samples/" + accession_code).json()
         return cls(**response)
 
+    @classmethod
+    def resolve_experiments(cls, samples):
+        """Retrieve the Experiments for many Samples at once.
+
+        Reading `experiments` on a Sample searches for its Experiments, so reading it on many
+        Samples makes a search for each one. This collects the Experiment accession codes from
+        every Sample, retrieves each Experiment once with a few batched searches, and sets
+        `experiments` on all of the Samples from those results.
+
+            >>> samples = pyrefinebio.Sample.get_many(accession_codes)
+            >>> pyrefinebio.Sample.resolve_experiments(samples)
+            >>> titles = [e.title for s in samples for e in s.experiments]
+
+        `experiments` is set to a list of Experiment on each Sample. Samples that can't be
+        found are given an empty list.
+
+        Returns:
+            list of Sample: the Samples that were passed in
+
+        Parameters:
+            samples (list of Sample): the Samples whose Experiments should be retrieved
+        """
+        samples = list(samples)
+
+        # Samples that don't have their experiment accession codes yet are hydrated together
+        hydrate(
+            [
+                sample
+                for sample in samples
+                if "experiment_accession_codes" in sample.__dict__.get("_unset", {})
+            ]
+        )
+
+        # read the codes from __dict__ so that Samples that weren't found aren't fetched again
+        sample_codes = [
+            sample.__dict__.get("experiment_accession_codes") or [] for sample in samples
+        ]
+
+        codes = list(dict.fromkeys(code for codes in sample_codes for code in codes))
+        experiments = prb_experiment.Experiment._get_many(codes)
+
+        for sample, codes in zip(samples, sample_codes):
+            sample.experiments = [experiments[code] for code in codes if code in experiments]
+
+        return samples
+
+    @classmethod
+    def get_many(cls, accession_codes, ignore_missing=False):
+        """Retrieve several Samples based on their accession codes.
+
+        The Samples are retrieved with a few concurrent searches instead of one request each.
+
+            >>> samples = pyrefinebio.Sample.get_many(["GSM000001", "GSM000002"])
+
+        Returns:
+            list of Sample: in the same order as `accession_codes`
+
+        Parameters:
+            accession_codes (list of str): the accession codes for the Samples to be retrieved
+
+            ignore_missing (bool): if True, Samples that can't be found are None in the list,
+                                   otherwise MissingObjects is raised with their accession codes
+        """
+        return cls._get_in_order(accession_codes, ignore_missing)
+
+    @classmethod
+    def _get_many(cls, accession_codes):
+        # the accession codes are sent comma separated, and each comma is encoded as %2C
+        return cls._search_many(
+            accession_codes,
+            lambda batch: cls.search(accession_codes=",".join(batch)),
+            ACCESSION_CODES_PER_REQUEST,
+            3,
+        )
+
     @classmethod
     def search(cls, **kwargs):
         """Retrieve a list of Samples based on various filters
@@ -234,5 +318,5 @@ class Sample(Base):
 
             accession_codes (str): filter based on multiple accession codes at once
         """
-        response = get_by_endpoint("samples", params=kwargs)
+        response = get_by_endpoint("samples", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
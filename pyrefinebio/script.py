@@ -119,6 +119,12 @@ def describe(entity=None):
     is_flag=True,
     help="Control whether or not refine.bio should send you an email when your Dataset has finished processing.",
 )
+@click.option(
+    "--convert",
+    default=None,
+    type=click.Choice(("npy", "parquet"), case_sensitive=True),
+    help="Convert the downloaded expression matrices to chunked npy files or Parquet.",
+)
 def download_dataset(
     email_address,
     path,
@@ -129,6 +135,7 @@ def download_dataset(
     skip_quantile_normalization,
     timeout,
     notify_me,
+    convert,
 ):
     """
     Automatically constructs a Dataset, processes it, waits for it
@@ -145,6 +152,7 @@ def download_dataset(
             skip_quantile_normalization,
             timeout=timeout,
             notify_me=notify_me,
+            convert=convert,
         )
     except DownloadError as e:
         raise click.ClickException(str(e))
@@ -0,0 +1,101 @@
+"""Coalesce identical requests that are made at the same time.
+
+When several threads, or several tasks on an event loop, GET the same url with the same
+params at once, only the first one sends the request. The others wait for it and get the
+same response, or the same exception if it fails.
+"""
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class SingleFlight:
+    """Runs a function at most once at a time for each key, across threads"""
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, function):
+        """Call `function`, or wait for the call that is already running for `key`
+
+        Returns:
+            the result of the call
+        """
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.coalesced += 1
+
+        if not leader:
+            call.done.wait()
+
+            if call.error is not None:
+                raise call.error
+
+            return call.result
+
+        try:
+            call.result = function()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                del self._calls[key]
+
+            call.done.set()
+
+        return call.result
+
+
+class AsyncSingleFlight:
+    """Runs a coroutine function at most once at a time for each key on an event loop"""
+
+    def __init__(self):
+        self.coalesced = 0
+        self._calls = {}
+
+    async def do(self, key, function):
+        """Await `function()`, or wait for the call that is already running for `key`
+
+        Returns:
+            the result of the call
+        """
+        loop = asyncio.get_running_loop()
+        key = (loop, key)
+
+        future = self._calls.get(key)
+
+        if future is not None:
+            self.coalesced += 1
+            return await asyncio.shield(future)
+
+        future = self._calls[key] = loop.create_future()
+
+        try:
+            result = await function()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # the waiters raise it, so it doesn't need to be logged if there are none
+            future.exception()
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            del self._calls[key]
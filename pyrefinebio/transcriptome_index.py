@@ -1,7 +1,7 @@
 from pyrefinebio import computational_result as prb_computational_result
 from pyrefinebio.api_interface import get_by_endpoint
 from pyrefinebio.base import Base
-from pyrefinebio.util import create_paginated_list, parse_date
+from pyrefinebio.util import create_paginated_list, parse_date, with_page_size
 
 
 class TranscriptomeIndex(Base):
@@ -86,5 +86,5 @@ class TranscriptomeIndex(Base):
             length (str): short hand for index_type eg. `short` or `long`
                           see `index_type` for more information
         """
-        response = get_by_endpoint("transcriptome_indices", params=kwargs)
+        response = get_by_endpoint("transcriptome_indices", params=with_page_size(kwargs))
         return create_paginated_list(cls, response)
@@ -1,13 +1,37 @@
+import copy
+import math
 import os
+import threading
+from collections import OrderedDict, deque
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
 
 import iso8601
 from pyrefinebio.api_interface import get
+from pyrefinebio import columns as prb_columns, identity as prb_identity
+from pyrefinebio.config import MAX_PAGE_SIZE, Config
+from pyrefinebio.record import record_type
 
 
 def create_paginated_list(T, response):
     return PaginatedList(T, response)
 
 
+def with_page_size(params):
+    """Add the configured page size to search params that don't specify a `limit`"""
+    if params.get("limit") is None:
+        params = dict(params, limit=Config().page_size)
+
+    return params
+
+
+def strip_pagination(url):
+    """Remove the `limit` and `offset` query params from a url"""
+    parts = urlsplit(url)
+    query = [(k, v) for k, v in parse_qsl(parts.query) if k not in ("limit", "offset")]
+    return urlunsplit(parts._replace(query=urlencode(query)))
+
+
 def parse_date(date):
     try:
         parsed = None
@@ -32,45 +56,71 @@ class PaginatedList:
     PaginatedLists are returned by all model class `search` methods that deal
     with paginated api responses. PaginatedLists can be indexed like lists and
     iterated through like generators.
+
+    By default every page that has been requested is kept in memory. Set
+    `max_cached_pages` to limit how many pages are kept - the least recently used
+    pages are dropped first. The first page is always kept.
+
+    Walk through a large search without keeping the results in memory
+
+        >>> samples = pyrefinebio.Sample.search(organism__name="HOMO_SAPIENS")
+        >>> samples.max_cached_pages = 0
+        >>> for sample in samples:
+        >>>     print(sample.accession_code)
+
+    Use `compact()` to get the results as compact records instead of model objects when
+    loading a large number of results into memory. See `pyrefinebio.record.Record`.
     """
 
-    def __init__(self, T, response):
+    def __init__(self, T, response, max_cached_pages=None):
         self.cur = 0
         self.type = T
+        self.max_cached_pages = max_cached_pages
 
-        self.base_url = response.url
+        # page requests set their own limit and offset
+        self.base_url = strip_pagination(response.url)
 
         json = response.json()
 
         self.total_items = json["count"]
+        # the server may return fewer results than were requested if the requested limit
+        # is bigger than it allows, so the page size comes from the response
         self.page_size = len(json["results"])
 
-        max_pages = int(self.total_items / self.page_size) if self.page_size else 0
+        self.num_pages = math.ceil(self.total_items / self.page_size) if self.page_size else 1
 
-        self.pages = [None for _ in range(max_pages + 1)]
-        self.pages[0] = [T(**item) for item in json["results"]]
+        # the first page's items are built when they are first needed
+        self._first_results = json["results"]
+        self._first_page = None
+        self._pages = OrderedDict()
+        self._pages_lock = threading.Lock()
 
-    def __getitem__(self, index):
+    def compact(self):
+        """Get a version of this list that returns compact records instead of model objects
 
-        if isinstance(index, slice):
-            step = index.step or 1
-
-            default_start = 0 if step > 0 else self.total_items - 1
-            default_stop = self.total_items - 1 if step > 0 else 0
+        The new list makes the same requests but builds a `Record` for each result, which
+        uses a fraction of the memory of a model object. Records can be turned into model
+        objects with `to_model()`.
 
-            start = index.start or default_start
-            stop = index.stop or default_stop
+        Returns:
+            PaginatedList
+        """
+        compact = copy.copy(self)
+        compact.cur = 0
+        compact.type = record_type(self.type)
+        compact._first_page = None
+        compact._pages = OrderedDict()
+        compact._pages_lock = threading.Lock()
+        return compact
 
-            if start < 0:
-                start += self.total_items
+    def __getitem__(self, index):
 
-            if stop < 0:
-                stop += self.total_items
+        if isinstance(index, slice):
+            indices = range(*index.indices(self.total_items))
 
-            if start < 0 or stop < 0:
-                raise IndexError("index out of range!")
+            pages = self._get_pages(sorted({i // self.page_size for i in indices}))
 
-            return [self[i] for i in range(start, stop, step)]
+            return [pages[i // self.page_size][i % self.page_size] for i in indices]
 
         if index < 0:
             index += self.total_items
@@ -81,21 +131,165 @@ class PaginatedList:
         page = int(index / self.page_size)
         page_index = index - page * self.page_size
 
-        try:
-            result = self.pages[page][page_index]
-        except:
-            params = {"offset": page * self.page_size, "limit": self.page_size}
+        return self._get_page(page)[page_index]
+
+    def _fetch_results(self, page, count=1):
+        """Fetch the raw results for `count` consecutive pages starting at `page`"""
+        params = {"offset": page * self.page_size, "limit": count * self.page_size}
+
+        response = get(self.base_url, params=params).json()
+
+        if self.total_items != response["count"]:
+            raise RuntimeError("List has changed since creation!")
+
+        return response["results"]
+
+    def _fetch_page(self, page):
+        return [self.type(**item) for item in self._fetch_results(page)]
+
+    def _fetch_page_range(self, first, count):
+        """Fetch `count` consecutive pages starting at `first` using a single request"""
+        items = [self.type(**item) for item in self._fetch_results(first, count)]
+
+        pages = {}
+        for page in range(first, first + count):
+            start = (page - first) * self.page_size
+            page_items = items[start : start + self.page_size]
+
+            # the server can return fewer items than were asked for if it caps `limit`
+            # so any page that didn't come back whole is fetched on its own
+            expected = min(self.page_size, self.total_items - page * self.page_size)
+            if len(page_items) < expected:
+                page_items = self._fetch_page(page)
+
+            pages[page] = page_items
+
+        return pages
+
+    def _get_pages(self, pages):
+        """Get several pages, requesting the missing ones in as few requests as possible
+
+        Consecutive missing pages are requested together, up to `MAX_PAGE_SIZE` items per
+        request, and the requests are made concurrently.
+        """
+        found = {}
+        missing = []
+
+        for page in pages:
+            items = self._cached_page(page)
+
+            if items is None:
+                missing.append(page)
+            else:
+                found[page] = items
+
+        pages_per_request = max(MAX_PAGE_SIZE // self.page_size, 1) if self.page_size else 1
+
+        ranges = []
+        for page in missing:
+            first, count = ranges[-1] if ranges else (None, 0)
+
+            if ranges and first + count == page and count < pages_per_request:
+                ranges[-1] = (first, count + 1)
+            else:
+                ranges.append((page, 1))
+
+        if len(ranges) == 1:
+            results = [self._fetch_page_range(*ranges[0])]
+        elif ranges:
+            workers = min(len(ranges), Config().api_pool_size)
+
+            with ThreadPoolExecutor(max_workers=workers) as executor:
+                fetch = prb_identity.with_current(lambda r: self._fetch_page_range(*r))
+                results = list(executor.map(fetch, ranges))
+        else:
+            results = []
+
+        for result in results:
+            for page, items in result.items():
+                self._store_page(page, items)
+                found[page] = items
+
+        return found
+
+    def _cached_page(self, page):
+        if page == 0:
+            if self._first_page is None:
+                self._first_page = [self.type(**item) for item in self._first_results]
+            return self._first_page
 
-            response = get(self.base_url, params=params).json()
+        with self._pages_lock:
+            items = self._pages.get(page)
 
-            if self.total_items != response["count"]:
-                raise RuntimeError("List has changed since creation!")
+            if items is not None:
+                self._pages.move_to_end(page)
 
-            self.pages[page] = [self.type(**item) for item in response["results"]]
+            return items
 
-            result = self.pages[page][page_index]
+    def _store_page(self, page, items):
+        if self.max_cached_pages == 0:
+            return
 
-        return result
+        with self._pages_lock:
+            self._pages[page] = items
+            self._pages.move_to_end(page)
+
+            if self.max_cached_pages is not None:
+                while len(self._pages) > self.max_cached_pages:
+                    self._pages.popitem(last=False)
+
+    def _get_page(self, page):
+        items = self._cached_page(page)
+
+        if items is None:
+            items = self._fetch_page(page)
+            self._store_page(page, items)
+
+        return items
+
+    def iterate(self, prefetch=0):
+        """Iterate through every item in the list
+
+        Pages are requested as they are needed. If `prefetch` is set, up to that many of the
+        upcoming pages are requested in background threads while the current page is being
+        consumed. Prefetched requests still count towards `api_max_calls_per_second`.
+
+            >>> samples = pyrefinebio.Sample.search(organism__name="HOMO_SAPIENS")
+            >>> for sample in samples.iterate(prefetch=4):
+            >>>     print(sample.accession_code)
+
+        Returns:
+            generator
+
+        Parameters:
+            prefetch (int): the number of pages to request ahead of the current page
+        """
+        if not prefetch:
+            for page in range(self.num_pages):
+                yield from self._get_page(page)
+            return
+
+        futures = {}
+        fetch = prb_identity.with_current(self._fetch_page)
+
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            try:
+                for page in range(self.num_pages):
+                    for upcoming in range(page, min(page + prefetch + 1, self.num_pages)):
+                        if upcoming not in futures and self._cached_page(upcoming) is None:
+                            futures[upcoming] = executor.submit(fetch, upcoming)
+
+                    if page in futures:
+                        items = futures.pop(page).result()
+                        self._store_page(page, items)
+                    else:
+                        items = self._get_page(page)
+
+                    yield from items
+            finally:
+                # don't wait on pages that haven't been started if iteration stops early
+                for future in futures.values():
+                    future.cancel()
 
     def __setitem__(self, index, value):
         raise AttributeError("PaginatedLists are immutable")
@@ -103,9 +297,87 @@ class PaginatedList:
     def __delitem__(self, index, value):
         raise AttributeError("PaginatedLists are immutable")
 
+    def _iterate_results(self, prefetch=0):
+        """Iterate through the raw results of each page without building any objects"""
+        yield self._first_results
+
+        if not prefetch:
+            for page in range(1, self.num_pages):
+                yield self._fetch_results(page)
+            return
+
+        futures = deque()
+
+        with ThreadPoolExecutor(max_workers=prefetch) as executor:
+            try:
+                for page in range(1, self.num_pages):
+                    futures.append(executor.submit(self._fetch_results, page))
+
+                    if len(futures) > prefetch:
+                        yield futures.popleft().result()
+
+                while futures:
+                    yield futures.popleft().result()
+            finally:
+                for future in futures:
+                    future.cancel()
+
+    def to_columns(self, fields=None, categorical=prb_columns.CATEGORICAL_FIELDS, prefetch=0):
+        """Get every result as NumPy columns
+
+        Pages are read straight into column buffers without creating a model object for
+        each result. Nested objects are flattened into `parent__child` columns, so a
+        Sample's organism name is in `organism__name`. Integer, float, and boolean fields
+        become typed arrays, other fields become object arrays.
+
+        Requires numpy, see `pyrefinebio.columns`.
+
+            >>> samples = pyrefinebio.Sample.search(organism__name="HOMO_SAPIENS")
+            >>> columns = samples.to_columns(fields=["accession_code", "technology"])
+
+        Returns:
+            dict of field name to numpy array, or to `pyrefinebio.columns.Categorical`
+            for categorical fields
+
+        Parameters:
+            fields (list): the fields to include - defaults to every field in the first result
+
+            categorical (list): fields with repeated values that should be stored as
+                                integer codes and a list of categories
+
+            prefetch (int): the number of pages to request ahead of the current page
+        """
+        builder = prb_columns.ColumnBuilder(fields, categorical)
+
+        for results in self._iterate_results(prefetch):
+            builder.extend(results)
+
+        return builder.build()
+
+    def to_dataframe(self, fields=None, categorical=prb_columns.CATEGORICAL_FIELDS, prefetch=0):
+        """Get every result as a pandas DataFrame
+
+        Built from `to_columns` with categorical fields as pandas Categoricals.
+        Requires numpy and pandas, see `pyrefinebio.columns`.
+
+        Returns:
+            pandas.DataFrame
+
+        Parameters:
+            fields (list): the fields to include - defaults to every field in the first result
+
+            categorical (list): fields with repeated values that should be stored as categoricals
+
+            prefetch (int): the number of pages to request ahead of the current page
+        """
+        return prb_columns.to_dataframe(self.to_columns(fields, categorical, prefetch))
+
     def __len__(self):
         return self.total_items
 
+    def __iter__(self):
+        return self.iterate()
+
     def __next__(self):
         if self.cur < self.total_items:
             n = self[self.cur]
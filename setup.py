@@ -22,6 +22,12 @@ setuptools.setup(
     ],
     python_requires=">=3.6",
     install_requires=["iso8601", "PyYAML", "requests", "Click", "pytimeparse", "pyrate-limiter<3"],
+    extras_require={
+        "aio": ["aiohttp"],
+        "columns": ["numpy", "pandas"],
+        "matrix": ["numpy"],
+        "parquet": ["numpy", "pyarrow"],
+    },
     entry_points="""
         [console_scripts]
         refinebio=pyrefinebio.script:cli
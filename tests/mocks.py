@@ -1,5 +1,11 @@
+from unittest.mock import patch
+
 from requests.exceptions import HTTPError
 
+from pyrefinebio import api_interface
+from pyrefinebio.retry import RetryPolicy
+
+
 class MockResponse:
     def __init__(self, json_data, url, status=200, headers=None):
         self.json_data = json_data
@@ -13,3 +19,66 @@ class MockResponse:
     def raise_for_status(self):
         if self.status_code != 200:
             raise HTTPError
+
+
+def no_retries(test):
+    """Don't retry failed requests in a test that expects an error response, so that the
+    error is raised without waiting for the retries to back off"""
+    return patch.object(api_interface, "retry_policy", RetryPolicy(max_retries=0))(test)
+
+
+# A fake refine.bio API for the tests that retrieve many related objects, like hydrate,
+# get_many and the identity map. Every Sample, Experiment and file exists except for the
+# ones in MISSING.
+MISSING = {"MISSING", 404}
+
+sample_computed_files = {"SAMPLE1": [1, 2], "SAMPLE2": [2]}
+
+sample_experiment_codes = {"SAMPLE1": ["GSE1", "GSE2"], "SAMPLE2": ["GSE2"], "SAMPLE3": ["MISSING"]}
+
+
+def computed_file(id):
+    return {"id": id, "filename": "file-{0}.tsv".format(id), "size_in_bytes": id * 100}
+
+
+def sample(accession_code):
+    return {
+        "id": 1,
+        "accession_code": accession_code,
+        "title": "test " + accession_code,
+        "computed_files": sample_computed_files.get(accession_code, []),
+        "experiment_accession_codes": sample_experiment_codes.get(accession_code, []),
+    }
+
+
+def page(url, results):
+    return MockResponse({"count": len(results), "next": None, "results": results}, url)
+
+
+def mock_request(method, url, **kwargs):
+    params = kwargs.get("params") or {}
+
+    if url == "https://api.refine.bio/v1/samples/":
+        codes = params["accession_codes"].split(",")
+        return page(url, [sample(code) for code in codes if code not in MISSING])
+
+    if url == "https://api.refine.bio/v1/search/":
+        codes = params["accession_code"]
+        return page(url, [{"accession_code": code} for code in codes if code not in MISSING])
+
+    if url.startswith("https://api.refine.bio/v1/samples/"):
+        accession_code = url.split("/")[-2]
+
+        if accession_code in MISSING:
+            return MockResponse(None, url, status=404)
+
+        return MockResponse(sample(accession_code), url)
+
+    for endpoint in ("computed_files", "original_files"):
+        if url.startswith("https://api.refine.bio/v1/{0}/".format(endpoint)):
+            id = int(url.split("/")[-2])
+
+            if id in MISSING:
+                return MockResponse(None, url, status=404)
+
+            return MockResponse(computed_file(id), url)
@@ -0,0 +1,225 @@
+import asyncio
+import hashlib
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+import aiohttp
+
+import pyrefinebio
+from pyrefinebio import aio, api_interface
+from pyrefinebio.retry import RetryPolicy
+from pyrefinebio.exceptions import DownloadError
+from tests.custom_assertions import CustomAssertions
+
+sample_object = {"id": 1, "accession_code": "GSM000001", "title": "test sample"}
+
+page1 = {
+    "count": 3,
+    "next": "page2",
+    "previous": None,
+    "results": [{"id": 1, "name": "test-1"}, {"id": 2, "name": "test-2"}],
+}
+
+page2 = {"count": 3, "next": None, "previous": "page1", "results": [{"id": 3, "name": "test-3"}]}
+
+
+async def mock_send(method, url, params=None, payload=None, headers=None):
+    if url == "https://api.refine.bio/v1/samples/GSM000001/":
+        return aio.Response(url, 200, {}, sample_object)
+
+    if url == "https://api.refine.bio/v1/samples/GSM000000/":
+        return aio.Response(url, 404, {}, {"detail": "Not found."})
+
+    if url == "https://api.refine.bio/v1/processors/" and params == {"limit": 1000}:
+        return aio.Response(url, 200, {}, page1)
+
+    if url == "https://api.refine.bio/v1/processors/" and params == {"offset": 2, "limit": 2}:
+        return aio.Response(url, 200, {}, page2)
+
+    if url == "https://api.refine.bio/v1/samples/" and params == {"limit": 1000}:
+        samples = [{"accession_code": "GSM000001"}, {"accession_code": "GSM000002"}]
+        return aio.Response(url, 200, {}, {"count": 2, "next": None, "results": samples})
+
+    if url == "https://api.refine.bio/v1/dataset/test-id/":
+        dataset = {"id": "test-id", "is_processing": False, "is_processed": True}
+        return aio.Response(url, 200, {}, dataset)
+
+    if url == "https://api.refine.bio/v1/token/test-token/":
+        return aio.Response(url, 403, {}, {"detail": "Forbidden."})
+
+    if url == "https://api.refine.bio/v1/organisms/":
+        return aio.Response(url, 500, {}, "")
+
+
+class MockDownload:
+    """Stands in for an aiohttp session that sends `body`, dropping the connection after
+    `drop_after` bytes if it is set"""
+
+    def __init__(self, body, drop_after=None):
+        self.body = body
+        self.drop_after = drop_after
+        self.content_length = len(body)
+        self.headers = {}
+        self.content = self
+
+    def get(self, url):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *args):
+        return False
+
+    def raise_for_status(self):
+        pass
+
+    async def iter_chunked(self, chunk_size):
+        for i in range(0, len(self.body), chunk_size):
+            if self.drop_after is not None and i >= self.drop_after:
+                raise aiohttp.ClientPayloadError("Response payload is not completed")
+
+            yield self.body[i : i + chunk_size]
+
+
+def run(coroutine):
+    return asyncio.get_event_loop().run_until_complete(coroutine)
+
+
+class AioTests(unittest.TestCase, CustomAssertions):
+    @patch("pyrefinebio.aio._send", side_effect=mock_send)
+    def test_get(self, mock_send):
+        sample = run(aio.Sample.get("GSM000001"))
+
+        self.assertIsInstance(sample, pyrefinebio.Sample)
+        self.assertObject(sample, sample_object)
+
+    @patch("pyrefinebio.aio._send", side_effect=mock_send)
+    def test_get_does_not_fetch_lazily(self, mock_send):
+        sample = run(aio.Sample.get("GSM000001"))
+
+        self.assertIsNone(sample.sex)
+        self.assertEqual(len(mock_send.call_args_list), 1)
+
+    @patch.object(aio, "retry_policy", RetryPolicy(max_retries=0))
+    @patch("pyrefinebio.aio._send", side_effect=mock_send)
+    def test_errors(self, mock_send):
+        with self.assertRaises(pyrefinebio.exceptions.NotFound):
+            run(aio.Sample.get("GSM000000"))
+
+        with self.assertRaises(pyrefinebio.exceptions.ServerError):
+            run(aio.Organism.search())
+
+    @patch("pyrefinebio.aio.asyncio.sleep")
+    @patch("pyrefinebio.aio._send")
+    def test_retry(self, mock_send, mock_sleep):
+        url = "https://api.refine.bio/v1/samples/GSM000001/"
+        mock_send.side_effect = [
+            aio.Response(url, 502, {}, ""),
+            aio.Response(url, 503, {"Retry-After": "10"}, ""),
+            aio.Response(url, 200, {}, sample_object),
+        ]
+
+        with patch.object(aio, "retry_policy", RetryPolicy(max_retries=2)):
+            sample = run(aio.Sample.get("GSM000001"))
+
+        self.assertObject(sample, sample_object)
+        self.assertEqual(mock_send.call_count, 3)
+        mock_sleep.assert_any_call(10)
+
+    @patch("pyrefinebio.aio._send", side_effect=mock_send)
+    def test_unmapped_error(self, mock_send):
+        with self.assertRaises(aiohttp.ClientResponseError) as context:
+            run(aio.get_by_endpoint("token/test-token"))
+
+        self.assertEqual(context.exception.status, 403)
+        # the error can be printed and logged
+        self.assertIn("Forbidden", str(context.exception))
+        self.assertIn("api.refine.bio", repr(context.exception))
+
+    @patch("pyrefinebio.aio._send", side_effect=mock_send)
+    def test_search_iteration(self, mock_send):
+        async def collect():
+            return [processor async for processor in await aio.Processor.search()]
+
+        processors = run(collect())
+
+        self.assertEqual([p.id for p in processors], [1, 2, 3])
+        self.assertEqual(len(mock_send.call_args_list), 2)
+
+    @patch("pyrefinebio.aio._send", side_effect=mock_send)
+    def test_search_exact_pages(self, mock_send):
+        async def collect():
+            return [sample async for sample in await aio.Sample.search()]
+
+        samples = run(collect())
+
+        self.assertEqual([s.accession_code for s in samples], ["GSM000001", "GSM000002"])
+        # every result is on the first page so no empty page is requested
+        self.assertEqual(len(mock_send.call_args_list), 1)
+
+    @patch("pyrefinebio.aio._send", side_effect=mock_send)
+    def test_search_get(self, mock_send):
+        processors = run(aio.Processor.search())
+
+        self.assertEqual(len(processors), 3)
+        self.assertEqual(run(processors.get(-1)).id, 3)
+
+        with self.assertRaises(IndexError):
+            run(processors.get(3))
+
+    @patch("pyrefinebio.aio._send", side_effect=mock_send)
+    def test_dataset_check(self, mock_send):
+        dataset = aio.Dataset(id="test-id")
+
+        self.assertTrue(run(dataset.check()))
+        self.assertTrue(run(dataset.wait(poll_interval=0)))
+
+    def test_prepare_params(self):
+        self.assertEqual(
+            aio._prepare_params({"is_processed": True, "limit": 10, "foo": None, "id": [1, 2]}),
+            [("is_processed", "True"), ("limit", "10"), ("id", "1"), ("id", "2")],
+        )
+
+    def test_download_file(self):
+        body = os.urandom(2500)
+        sha1 = hashlib.sha1(body).hexdigest()
+
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, "file")
+
+            async def get_session():
+                return MockDownload(body)
+
+            with patch("pyrefinebio.aio.get_session", side_effect=get_session):
+                run(aio.download_file("url", path, chunk_size=1000, sha1=sha1))
+
+                with open(path, "rb") as f:
+                    self.assertEqual(f.read(), body)
+
+                with self.assertRaises(DownloadError):
+                    run(aio.download_file("url", path, chunk_size=1000, sha1="0" * 40))
+
+                # a file that doesn't match isn't left behind
+                self.assertFalse(os.path.exists(path + ".part"))
+
+    def test_download_file_dropped(self):
+        body = os.urandom(2500)
+
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, "file")
+
+            async def get_session():
+                return MockDownload(body, drop_after=2000)
+
+            with patch("pyrefinebio.aio.get_session", side_effect=get_session):
+                with self.assertRaises(DownloadError):
+                    run(aio.download_file("url", path, chunk_size=1000))
+
+            self.assertFalse(os.path.exists(path))
+
+            # what was written is kept so the download can be resumed
+            part = api_interface._PartFile(path, 2500, None)
+            self.assertEqual(part.completed, [(0, 2000)])
@@ -1,10 +1,21 @@
+import hashlib
+import io
+import os
+import tempfile
 import threading
 import time
 import unittest
 from unittest.mock import patch
 
+from requests.exceptions import ConnectionError as RequestsConnectionError
+from requests.exceptions import HTTPError
+from urllib3.exceptions import ProtocolError
+
 import pyrefinebio
-from pyrefinebio.exceptions import BadRequest, NotFound
+from pyrefinebio import api_interface
+from pyrefinebio.exceptions import BadRequest, DownloadError, NotFound, ServerError
+from pyrefinebio.rate_limit import Throttle
+from pyrefinebio.retry import RetryPolicy
 from tests.custom_assertions import CustomAssertions
 from tests.mocks import MockResponse
 
@@ -29,6 +40,50 @@ def mock_200_request(method, url, **kwargs):
         return MockResponse(sample, url, 200)
 
 
+CONTENT = bytes(range(256)) * 40
+
+
+def mock_download(url, headers=None, stream=False, accept_ranges=True):
+    response = MockResponse(None, url, headers={"content-length": str(len(CONTENT))})
+
+    if not accept_ranges:
+        response.raw = io.BytesIO(CONTENT)
+        return response
+
+    response.headers["accept-ranges"] = "bytes"
+
+    if headers and "Range" in headers:
+        start, end = (int(b) for b in headers["Range"][len("bytes=") :].split("-"))
+        response.status_code = 206
+        response.headers["content-range"] = "bytes {0}-{1}/{2}".format(start, end, len(CONTENT))
+        response.raw = io.BytesIO(CONTENT[start : end + 1])
+    else:
+        response.raw = io.BytesIO(CONTENT)
+
+    return response
+
+
+def mock_download_ignores_range(url, headers=None, stream=False):
+    response = MockResponse(
+        None, url, headers={"content-length": str(len(CONTENT)), "accept-ranges": "bytes"}
+    )
+    response.raw = io.BytesIO(CONTENT)
+    return response
+
+
+class DroppedConnection(io.BytesIO):
+    """A response body that fails after `limit` bytes"""
+
+    def __init__(self, data, limit):
+        super().__init__(data[:limit])
+
+    def read(self, size=-1):
+        data = super().read(size)
+        if not data:
+            raise ProtocolError("Connection broken: IncompleteRead")
+        return data
+
+
 def mock_400_request(method, url, **kwargs):
     return MockResponse(
         "we're not home right now", "https://api.refine.bio/v1/organisms/GORILLA", 400
@@ -41,6 +96,12 @@ def mock_404_request(method, url, **kwargs):
     )
 
 
+def mock_429_request(method, url, **kwargs):
+    return MockResponse(
+        "slow down", "https://api.refine.bio/v1/organisms/GORILLA", 429, {"Retry-After": "7"}
+    )
+
+
 class ApiInterfaceTests(unittest.TestCase, CustomAssertions):
     PERIOD_SECONDS = 1
 
@@ -52,17 +113,84 @@ class ApiInterfaceTests(unittest.TestCase, CustomAssertions):
         def __exit__(self, *args, **kwargs):
             self.duration = time.time() - self.start
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_400_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_400_request)
     def test_400(self, mock_request):
         with self.assertRaises(BadRequest):
             pyrefinebio.Organism.get("GORILLA")
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_404_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_404_request)
     def test_404(self, mock_request):
         with self.assertRaises(NotFound):
             pyrefinebio.Organism.get("GORILLA")
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_200_request)
+    @patch("pyrefinebio.rate_limit.Throttle.wait")
+    @patch("pyrefinebio.api_interface.requests.Session.request")
+    def test_429_retry_after(self, mock_request, mock_wait):
+        mock_request.side_effect = [
+            mock_429_request("GET", "https://api.refine.bio/v1/organisms/GORILLA/"),
+            MockResponse({"name": "GORILLA"}, "https://api.refine.bio/v1/organisms/GORILLA/"),
+        ]
+
+        with patch.object(api_interface, "throttle", Throttle()) as throttle:
+            organism = pyrefinebio.Organism.get("GORILLA")
+
+        self.assertEqual(organism.name, "GORILLA")
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_wait.call_count, 2)
+        self.assertAlmostEqual(throttle.remaining(), 7, delta=1)
+
+    @patch("pyrefinebio.rate_limit.Throttle.wait")
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_429_request)
+    def test_429_gives_up(self, mock_request, mock_wait):
+        with patch.object(api_interface, "throttle", Throttle()):
+            with self.assertRaises(HTTPError):
+                pyrefinebio.Organism.get("GORILLA")
+
+        self.assertEqual(mock_request.call_count, api_interface.MAX_RATE_LIMIT_RETRIES + 1)
+
+    @patch("pyrefinebio.retry.RetryPolicy.wait")
+    @patch("pyrefinebio.api_interface.requests.Session.request")
+    def test_retry(self, mock_request, mock_wait):
+        url = "https://api.refine.bio/v1/organisms/GORILLA/"
+        mock_request.side_effect = [
+            RequestsConnectionError(),
+            MockResponse(None, url, 503),
+            MockResponse({"name": "GORILLA"}, url),
+        ]
+
+        with patch.object(api_interface, "retry_policy", RetryPolicy(max_retries=2)):
+            organism = pyrefinebio.Organism.get("GORILLA")
+
+        self.assertEqual(organism.name, "GORILLA")
+        self.assertEqual(mock_request.call_count, 3)
+        self.assertEqual(mock_wait.call_count, 2)
+        self.assertEqual(mock_wait.call_args_list[0][0], (0,))
+        self.assertEqual(mock_wait.call_args_list[1][0][0], 1)
+        self.assertEqual(mock_wait.call_args_list[1][0][1].status_code, 503)
+
+    @patch("pyrefinebio.retry.RetryPolicy.wait")
+    @patch("pyrefinebio.api_interface.requests.Session.request")
+    def test_retry_gives_up(self, mock_request, mock_wait):
+        mock_request.side_effect = RequestsConnectionError()
+
+        with patch.object(api_interface, "retry_policy", RetryPolicy(max_retries=2)):
+            with self.assertRaises(ServerError):
+                pyrefinebio.Organism.get("GORILLA")
+
+        self.assertEqual(mock_request.call_count, 3)
+
+    @patch("pyrefinebio.retry.RetryPolicy.wait")
+    @patch("pyrefinebio.api_interface.requests.Session.request")
+    def test_no_retry_post(self, mock_request, mock_wait):
+        mock_request.return_value = MockResponse(None, "https://api.refine.bio/v1/dataset/", 503)
+
+        with self.assertRaises(ServerError):
+            api_interface.post_by_endpoint("dataset", payload={"data": {}})
+
+        self.assertEqual(mock_request.call_count, 1)
+        mock_wait.assert_not_called()
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_200_request)
     def test_rate_limit(self, mock_request):
         time.sleep(self.PERIOD_SECONDS)
         threads = []
@@ -83,3 +211,198 @@ class ApiInterfaceTests(unittest.TestCase, CustomAssertions):
                 t.start()
             [t.join() for t in threads]
         self.assertGreater(timer.duration, self.PERIOD_SECONDS, timer.duration)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_200_request)
+    def test_session_is_reused(self, mock_request):
+        pyrefinebio.Sample.get("TEST_SAMPLE")
+        session = api_interface.get_session()
+        pyrefinebio.Sample.get("TEST_SAMPLE")
+
+        self.assertIs(api_interface.get_session(), session)
+        self.assertEqual(len(mock_request.call_args_list), 2)
+
+        pyrefinebio.close_session()
+
+        self.assertIsNot(api_interface.get_session(), session)
+
+
+@patch.object(api_interface.CONFIG, "download_chunk_size", 1000)
+@patch.object(api_interface.CONFIG, "download_workers", 4)
+class DownloadTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "file")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def read(self):
+        with open(self.path, "rb") as f:
+            return f.read()
+
+    def test_byte_ranges(self):
+        self.assertEqual(
+            api_interface._byte_ranges(2500, 1000), [(0, 999), (1000, 1999), (2000, 2499)]
+        )
+        self.assertEqual(api_interface._byte_ranges(1000, 1000), [(0, 999)])
+        self.assertEqual(api_interface._byte_ranges(2500, 1000, 1500), [(1500, 2499)])
+
+    def test_part_file_missing_ranges(self):
+        part = api_interface._PartFile(self.path, 5000, None)
+        part.reset()
+        part.add(0, 1200)
+        part.add(3000, 4000)
+        part.add(1200, 1500)
+
+        self.assertEqual(part.completed, [(0, 1500), (3000, 4000)])
+        self.assertEqual(part.missing(1000), [(1500, 2499), (2500, 2999), (4000, 4999)])
+
+        # the manifest is picked up by a new download of the same file
+        self.assertEqual(api_interface._PartFile(self.path, 5000, None).completed, part.completed)
+        self.assertEqual(api_interface._PartFile(self.path, 5000, "etag").completed, [])
+        self.assertEqual(api_interface._PartFile(self.path, 6000, None).completed, [])
+
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_download_in_parallel_ranges(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: MockContext(mock_download(*args, **kwargs))
+
+        api_interface.download_file("test_url", self.path, False)
+
+        self.assertEqual(self.read(), CONTENT)
+
+        # the first request only asks for the first byte to find the size
+        self.assertEqual(mock_get.call_args_list[0][1]["headers"], {"Range": "bytes=0-0"})
+
+        ranges = sorted(call[1]["headers"]["Range"] for call in mock_get.call_args_list[1:])
+        self.assertEqual(len(ranges), 11)
+        self.assertIn("bytes=10000-10239", ranges)
+
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_download_without_range_support(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: MockContext(
+            mock_download(*args, accept_ranges=False, **kwargs)
+        )
+
+        api_interface.download_file("test_url", self.path, False)
+
+        self.assertEqual(self.read(), CONTENT)
+        # the whole file is sent in response to the first request
+        mock_get.assert_called_once_with("test_url", headers={"Range": "bytes=0-0"}, stream=True)
+
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_download_single_stream(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: MockContext(mock_download(*args, **kwargs))
+
+        with patch.object(api_interface.CONFIG, "download_workers", 1):
+            api_interface.download_file("test_url", self.path, False)
+
+        self.assertEqual(self.read(), CONTENT)
+        self.assertEqual(len(mock_get.call_args_list), 2)
+        mock_get.assert_called_with("test_url", stream=True)
+
+    def test_content_range_size(self):
+        self.assertEqual(api_interface._content_range_size("bytes 0-0/10240"), 10240)
+        self.assertEqual(api_interface._content_range_size("bytes 0-0/*"), -1)
+        self.assertEqual(api_interface._content_range_size(None), -1)
+
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_download_falls_back_when_range_is_ignored(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: MockContext(
+            mock_download_ignores_range(*args, **kwargs)
+        )
+
+        api_interface.download_file("test_url", self.path, False)
+
+        self.assertEqual(self.read(), CONTENT)
+
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_download_resumes_after_dropped_connection(self, mock_get):
+        def dropped(*args, **kwargs):
+            response = mock_download(*args, **kwargs)
+            response.raw = DroppedConnection(CONTENT, 4321)
+            return MockContext(response)
+
+        mock_get.side_effect = dropped
+
+        with patch.object(api_interface.CONFIG, "download_workers", 1):
+            with self.assertRaises(DownloadError):
+                api_interface.download_file("test_url", self.path, False)
+
+        self.assertFalse(os.path.exists(self.path))
+        self.assertTrue(os.path.exists(self.path + ".part"))
+        self.assertTrue(os.path.exists(self.path + ".part.json"))
+
+        mock_get.reset_mock()
+        mock_get.side_effect = lambda *args, **kwargs: MockContext(mock_download(*args, **kwargs))
+
+        api_interface.download_file("test_url", self.path, False)
+
+        self.assertEqual(self.read(), CONTENT)
+        self.assertEqual(sorted(os.listdir(self.dir.name)), ["file"])
+
+        ranges = [call[1]["headers"]["Range"] for call in mock_get.call_args_list[1:]]
+        self.assertEqual(ranges[0], "bytes=4321-5320")
+        self.assertEqual(len(ranges), 6)
+
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_download_verifies_sha1(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: MockContext(mock_download(*args, **kwargs))
+        sha1 = hashlib.sha1(CONTENT).hexdigest()
+
+        for workers in (1, 4):
+            with patch.object(api_interface.CONFIG, "download_workers", workers):
+                api_interface.download_file(
+                    "test_url", self.path, False, sha1=sha1, size_in_bytes=len(CONTENT)
+                )
+
+            self.assertEqual(self.read(), CONTENT)
+
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_download_sha1_out_of_order_ranges(self, mock_get):
+        def reversed_ranges(*args, **kwargs):
+            # finish later ranges before earlier ones
+            if "headers" in kwargs:
+                start = int(kwargs["headers"]["Range"][len("bytes=") :].split("-")[0])
+                time.sleep((len(CONTENT) - start) / 1e5)
+            return MockContext(mock_download(*args, **kwargs))
+
+        mock_get.side_effect = reversed_ranges
+
+        api_interface.download_file(
+            "test_url", self.path, False, sha1=hashlib.sha1(CONTENT).hexdigest()
+        )
+
+        self.assertEqual(self.read(), CONTENT)
+
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_download_sha1_mismatch(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: MockContext(mock_download(*args, **kwargs))
+
+        for workers in (1, 4):
+            with patch.object(api_interface.CONFIG, "download_workers", workers):
+                with self.assertRaises(DownloadError) as de:
+                    api_interface.download_file("test_url", self.path, False, sha1="bad")
+
+            self.assertIn("SHA-1 mismatch", str(de.exception))
+            # the bad download is thrown away rather than resumed
+            self.assertEqual(os.listdir(self.dir.name), [])
+
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_download_size_mismatch(self, mock_get):
+        mock_get.side_effect = lambda *args, **kwargs: MockContext(mock_download(*args, **kwargs))
+
+        with self.assertRaises(DownloadError):
+            api_interface.download_file("test_url", self.path, False, size_in_bytes=5)
+
+        self.assertEqual(os.listdir(self.dir.name), [])
+
+
+class MockContext:
+    def __init__(self, response):
+        self.response = response
+
+    def __enter__(self):
+        return self.response
+
+    def __exit__(self, *args):
+        pass
@@ -0,0 +1,65 @@
+import io
+import os
+import tarfile
+import tempfile
+import unittest
+import zipfile
+
+from pyrefinebio import archive
+from pyrefinebio.exceptions import MissingFile
+
+FILES = {
+    "dataset/aggregated_metadata.json": b'{"experiments": {}}',
+    "dataset/metadata_SRP1.tsv": b"refinebio_accession_code\tsex\nSRR1\tfemale\n",
+    "dataset/SRP1.tsv": b"Gene\tSRR1\nENSG1\t1.5\n",
+}
+
+
+class ArchiveTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+
+        self.zip_path = os.path.join(self.dir.name, "dataset.zip")
+        with zipfile.ZipFile(self.zip_path, "w") as z:
+            for name, data in FILES.items():
+                z.writestr(name, data)
+
+        self.tar_path = os.path.join(self.dir.name, "dataset.tar.gz")
+        with tarfile.open(self.tar_path, "w:gz") as t:
+            for name, data in FILES.items():
+                info = tarfile.TarInfo(name)
+                info.size = len(data)
+                t.addfile(info, io.BytesIO(data))
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_list_members(self):
+        for path in (self.zip_path, self.tar_path):
+            self.assertEqual(sorted(archive.list_members(path)), sorted(FILES))
+
+    def test_extract_members(self):
+        for path in (self.zip_path, self.tar_path):
+            destination = os.path.join(self.dir.name, os.path.basename(path) + "-out")
+
+            extracted = archive.extract_members(path, ["*.json", "*/metadata_*"], destination)
+
+            self.assertEqual(len(extracted), 2)
+            self.assertEqual(
+                sorted(os.listdir(os.path.join(destination, "dataset"))),
+                ["aggregated_metadata.json", "metadata_SRP1.tsv"],
+            )
+
+    def test_open_member(self):
+        for path in (self.zip_path, self.tar_path):
+            with archive.open_member(path, "dataset/SRP1.tsv") as f:
+                self.assertEqual(f.read(), FILES["dataset/SRP1.tsv"])
+
+            with archive.open_member(path, "dataset/metadata_SRP1.tsv", encoding="utf-8") as f:
+                self.assertEqual(f.readline(), "refinebio_accession_code\tsex\n")
+
+    def test_open_missing_member(self):
+        for path in (self.zip_path, self.tar_path):
+            with self.assertRaises(MissingFile):
+                with archive.open_member(path, "dataset/missing.tsv"):
+                    pass
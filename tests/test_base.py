@@ -0,0 +1,50 @@
+import unittest
+from unittest.mock import patch
+
+import pyrefinebio
+from tests.custom_assertions import CustomAssertions
+from tests.mocks import MockResponse
+
+processor = {"id": 1, "name": "test", "version": 1, "docker_image": "test", "environment": {}}
+
+
+def mock_request(method, url, **kwargs):
+    if url == "https://api.refine.bio/v1/processors/1/":
+        return MockResponse(processor, url)
+
+
+class BaseTests(unittest.TestCase, CustomAssertions):
+    def test_attribute_access_is_not_intercepted(self):
+        self.assertIs(pyrefinebio.Sample.__getattribute__, object.__getattribute__)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_set_attributes_do_not_fetch(self, mock_request):
+        p = pyrefinebio.Processor(id=1, name="test")
+
+        self.assertEqual(p.name, "test")
+        mock_request.assert_not_called()
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_unset_attributes_fetch_once(self, mock_request):
+        p = pyrefinebio.Processor(id=1)
+
+        self.assertEqual(p.docker_image, "test")
+        self.assertEqual(p.environment, {})
+        self.assertEqual(p.version, 1)
+
+        self.assertEqual(len(mock_request.call_args_list), 1)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_fetched_objects_do_not_fetch(self, mock_request):
+        p = pyrefinebio.Processor(id=1)
+        p._fetched = True
+
+        self.assertIsNone(p.docker_image)
+        mock_request.assert_not_called()
+
+    def test_missing_attribute(self):
+        with self.assertRaises(AttributeError):
+            pyrefinebio.Processor(id=1).foo
+
+    def test_str_includes_unset_attributes(self):
+        self.assertIn("'docker_image': None", str(pyrefinebio.Processor(id=1)))
@@ -4,7 +4,7 @@ from unittest.mock import Mock, patch
 
 import pyrefinebio
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 
 compendium_object_1 = {
     "id": 1,
@@ -76,22 +76,23 @@ def mock_request(method, url, **kwargs):
 
 
 class CompendiumTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_compendium_get(self, mock_request):
         result = pyrefinebio.Compendium.get(1)
         self.assertObject(result, compendium_object_1)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_compendium_500(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.ServerError):
             pyrefinebio.Compendium.get(500)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_compendium_get_404(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.NotFound):
             pyrefinebio.Compendium.get(0)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_compendium_search_no_filters(self, mock_request):
         results = pyrefinebio.Compendium.search()
 
@@ -112,15 +113,21 @@ class CompendiumTests(unittest.TestCase, CustomAssertions):
 
     # just mock download - it's already tested in depth in test_dataset
     @patch("pyrefinebio.compendia.download_file")
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_compendium_download(self, mock_request, mock_download):
         result = pyrefinebio.Compendium.get(1)
 
         result.download("test-path")
 
-        mock_download.assert_called_with("test_download_url", os.path.abspath("test-path"), True)
+        mock_download.assert_called_with(
+            "test_download_url",
+            os.path.abspath("test-path"),
+            True,
+            sha1="3c5de2dba42c2768e7542a0262d2b9a1e9fc9f45",
+            size_in_bytes=5000,
+        )
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_compendium_download_no_url(self, mock_request):
         result = pyrefinebio.Compendium.get(42)  # 42 has no download_url
 
@@ -139,4 +146,4 @@ class CompendiumTests(unittest.TestCase, CustomAssertions):
 
         c.extract()
 
-        mock_unpack.assert_called_with("foo")
+        mock_unpack.assert_called_with("foo", None)
@@ -3,7 +3,7 @@ from unittest.mock import patch
 
 import pyrefinebio
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 
 computational_result_1 = {
     "id": 1,
@@ -136,22 +136,23 @@ def mock_request(method, url, **kwargs):
 
 
 class ComputationalResultTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_computational_result_get(self, mock_request):
         result = pyrefinebio.ComputationalResult.get(1)
         self.assertObject(result, computational_result_1)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_computational_result_500(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.ServerError):
             pyrefinebio.ComputationalResult.get(500)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_computational_result_get_404(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.NotFound):
             pyrefinebio.ComputationalResult.get(0)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_computational_result_search_no_filters(self, mock_request):
         results = pyrefinebio.ComputationalResult.search()
 
@@ -4,7 +4,7 @@ from unittest.mock import Mock, patch
 
 import pyrefinebio
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 
 computed_file_1 = {
     "id": 1,
@@ -224,22 +224,23 @@ def mock_request(method, url, **kwargs):
 
 
 class ComputedFileTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_computed_file_get(self, mock_request):
         result = pyrefinebio.ComputedFile.get(1)
         self.assertObject(result, computed_file_1)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_computed_file_500(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.ServerError):
             pyrefinebio.ComputedFile.get(500)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_computed_file_get_404(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.NotFound):
             pyrefinebio.ComputedFile.get(0)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_computed_file_search_no_filters(self, mock_request):
         results = pyrefinebio.ComputedFile.search()
 
@@ -259,15 +260,21 @@ class ComputedFileTests(unittest.TestCase, CustomAssertions):
 
     # just mock download - it's already tested in depth in test_dataset
     @patch("pyrefinebio.computed_file.download_file")
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_computed_file_download(self, mock_request, mock_download):
         result = pyrefinebio.ComputedFile.get(1)
 
         result.download("test-path")
 
-        mock_download.assert_called_with("test_download_url", os.path.abspath("test-path"), True)
+        mock_download.assert_called_with(
+            "test_download_url",
+            os.path.abspath("test-path"),
+            True,
+            sha1="77ea7dd477fa9a9ec5f33bc91f46c0e224edeb92",
+            size_in_bytes=191,
+        )
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_computed_file_download_no_url(self, mock_request):
         result = pyrefinebio.ComputedFile.get(2)  # 2 has no download_url
 
@@ -282,7 +289,7 @@ class ComputedFileTests(unittest.TestCase, CustomAssertions):
 
         cf.extract()
 
-        mock_unpack.assert_called_with("foo")
+        mock_unpack.assert_called_with("foo", None)
 
     def test_computed_file_samples_are_fully_populated(self):
         # ComputedFile.Sample looks like this when retrieved from the API
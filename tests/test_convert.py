@@ -0,0 +1,98 @@
+import os
+import tempfile
+import unittest
+import unittest.mock
+import zipfile
+
+import pyrefinebio
+from pyrefinebio import convert
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+try:
+    import pyarrow.parquet
+except ImportError:
+    pyarrow = None
+
+MATRIX = "Gene\tSRR1\tSRR2\n" + "".join(
+    "ENSG{0}\t{0}.0\t{1}\n".format(i, "NA" if i == 3 else i * 2) for i in range(7)
+)
+
+
+@unittest.skipUnless(numpy, "requires numpy")
+class ConvertTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "dataset-1.zip")
+
+        with zipfile.ZipFile(self.path, "w") as z:
+            z.writestr("SRP1/SRP1.tsv", MATRIX)
+            z.writestr("SRP1/metadata_SRP1.tsv", "refinebio_accession_code\nSRR1\nSRR2\n")
+            z.writestr("aggregated_metadata.json", "{}")
+            z.writestr("README.md", "readme")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_convert_npy(self):
+        # 3 genes of 2 samples in each chunk
+        with unittest.mock.patch.object(convert, "CHUNK_CELLS", 6):
+            converted = convert.convert(self.path, "npy")
+
+        destination = os.path.join(self.dir.name, "dataset-1_npy")
+        self.assertEqual(converted, [os.path.join(destination, "SRP1", "SRP1")])
+        self.assertEqual(
+            sorted(os.listdir(converted[0])),
+            ["index.json", "values-00000.npy", "values-00001.npy", "values-00002.npy"],
+        )
+
+        # the metadata is copied next to the matrices
+        self.assertTrue(os.path.exists(os.path.join(destination, "SRP1", "metadata_SRP1.tsv")))
+        self.assertTrue(os.path.exists(os.path.join(destination, "aggregated_metadata.json")))
+        self.assertFalse(os.path.exists(os.path.join(destination, "README.md")))
+
+        m = convert.load_npy(converted[0])
+
+        self.assertEqual(m.genes, ["ENSG{0}".format(i) for i in range(7)])
+        self.assertEqual(m.samples, ["SRR1", "SRR2"])
+        self.assertEqual(m.values.dtype, numpy.float32)
+        self.assertEqual(float(m.values[6, 1]), 12.0)
+        self.assertTrue(numpy.isnan(m.values[3, 1]))
+
+    def test_chunks_by_cells(self):
+        with unittest.mock.patch.object(convert, "CHUNK_CELLS", 5):
+            chunks = list(convert._chunks(self.path, "SRP1/SRP1.tsv", numpy))
+
+        # only 2 genes of 2 samples fit in 5 values
+        self.assertEqual([len(genes) for genes, values in chunks[1:]], [2, 2, 2, 1])
+
+        # a gene that doesn't fit is still written on its own
+        with unittest.mock.patch.object(convert, "CHUNK_CELLS", 1):
+            chunks = list(convert._chunks(self.path, "SRP1/SRP1.tsv", numpy))
+
+        self.assertEqual([values.shape for genes, values in chunks[1:]], [(1, 2)] * 7)
+
+    def test_convert_unknown_format(self):
+        with self.assertRaises(ValueError):
+            convert.convert(self.path, "csv")
+
+    @unittest.skipUnless(pyarrow, "requires pyarrow")
+    def test_convert_parquet(self):
+        converted = convert.convert(self.path, "parquet")
+
+        table = pyarrow.parquet.read_table(converted[0])
+
+        self.assertEqual(table.column_names, ["Gene", "SRR1", "SRR2"])
+        self.assertEqual(table.num_rows, 7)
+
+    def test_dataset_convert(self):
+        dataset = pyrefinebio.Dataset()
+        dataset._downloaded_path = self.path
+
+        destination = os.path.join(self.dir.name, "out")
+        converted = dataset.convert("npy", destination)
+
+        self.assertEqual(converted, [os.path.join(destination, "SRP1", "SRP1")])
@@ -1,12 +1,15 @@
+import io
 import json
 import os
+import tempfile
 import unittest
+import zipfile
 from unittest.mock import Mock, patch
 
 import pyrefinebio
 from pyrefinebio.config import Config
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 
 dataset = {
     "id": "test-dataset",
@@ -71,7 +74,7 @@ class DatasetTests(unittest.TestCase, CustomAssertions):
     def tearDownClass(cls):
         os.environ.pop("REFINEBIO_CONFIG_FILE", None)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_dataset_get(self, mock_request):
         result = pyrefinebio.Dataset.get("test-dataset")
         self.assertObject(result, dataset)
@@ -80,7 +83,8 @@ class DatasetTests(unittest.TestCase, CustomAssertions):
         with self.assertRaises(pyrefinebio.exceptions.NotFound):
             pyrefinebio.Dataset.get("this-does-not-exist")
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_dataset_500(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.ServerError):
             pyrefinebio.Dataset.get("500")
@@ -184,7 +188,7 @@ class DatasetTests(unittest.TestCase, CustomAssertions):
         args, kwargs = mock_put_by_endpoint.call_args
         self.assertTrue(kwargs["payload"].get("notify_me", None))
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_dataset_process(self, mock_request):
         ds = pyrefinebio.Dataset(
             data={"test-experiment": ["sample-1", "sample-2"]}, email_address="test-email"
@@ -233,7 +237,7 @@ class DatasetTests(unittest.TestCase, CustomAssertions):
             br.exception.base_message, "Bad Request: You must provide an email address."
         )
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_dataset_check(self, mock_request):
         ds = pyrefinebio.Dataset(id="test-dataset")
         is_done = ds.check()
@@ -242,29 +246,32 @@ class DatasetTests(unittest.TestCase, CustomAssertions):
         self.assertTrue(ds.is_processing)
         self.assertTrue(ds.is_processed)
 
-    @patch("pyrefinebio.api_interface.shutil.copyfileobj")
-    @patch("pyrefinebio.api_interface.open")
-    @patch("pyrefinebio.api_interface.requests.get")
-    def test_dataset_download(self, mock_get, mock_open, mock_copy):
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_dataset_download(self, mock_get):
         ds = pyrefinebio.Dataset(download_url="test_download_url")
 
         mr = MockResponse(None, "test_download_url", headers={"content-length": 3})
 
-        setattr(mr, "raw", "raw")
+        setattr(mr, "raw", io.BytesIO(b"zip"))
 
         mock_get.return_value.__enter__.return_value = mr
-        mock_open.return_value.__enter__.return_value = "file"
 
-        ds.download("test_path")
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, "test_path")
+            ds.download(path)
+
+            mock_get.assert_called_with(
+                "test_download_url", headers={"Range": "bytes=0-0"}, stream=True
+            )
+
+            with open(path, "rb") as f:
+                self.assertEqual(f.read(), b"zip")
 
-        mock_get.assert_called_with("test_download_url", stream=True)
-        mock_open.assert_called_with(os.path.abspath("test_path"), "wb")
-        mock_copy.assert_called_with("raw", "file")
+            self.assertEqual(os.listdir(dir), ["test_path"])
 
-    @patch("pyrefinebio.api_interface.shutil.copyfileobj")
     @patch("pyrefinebio.api_interface.input")
-    @patch("pyrefinebio.api_interface.requests.get")
-    def test_dataset_download_big_file(self, mock_get, mock_input, mock_copy):
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_dataset_download_big_file(self, mock_get, mock_input):
         ds = pyrefinebio.Dataset(download_url="test_download_url")
 
         mr = MockResponse(None, "test_download_url", headers={"content-length": 1000000000000})
@@ -274,12 +281,15 @@ class DatasetTests(unittest.TestCase, CustomAssertions):
         mock_get.return_value.__enter__.return_value = mr
         mock_input.return_value = "n"
 
-        ds.download("test_path")
+        with tempfile.TemporaryDirectory() as dir:
+            ds.download(os.path.join(dir, "test_path"))
 
-        mock_get.assert_called_with("test_download_url", stream=True)
-        mock_copy.assert_not_called()
+            mock_get.assert_called_with(
+                "test_download_url", headers={"Range": "bytes=0-0"}, stream=True
+            )
+            self.assertEqual(os.listdir(dir), [])
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_dataset_download_no_url(self, mock_request):
         ds = pyrefinebio.Dataset(id="non-processed-dataset", download_url=None)
         with self.assertRaises(pyrefinebio.exceptions.DownloadError) as de:
@@ -290,10 +300,9 @@ class DatasetTests(unittest.TestCase, CustomAssertions):
             "Unable to download Dataset\nDownload url not found - you must process the Dataset before downloading.",
         )
 
-    @patch("pyrefinebio.api_interface.shutil.copyfileobj")
     @patch("pyrefinebio.api_interface.input")
-    @patch("pyrefinebio.api_interface.requests.get")
-    def test_dataset_download_no_size_header(self, mock_get, mock_input, mock_copy):
+    @patch("pyrefinebio.api_interface.requests.Session.get")
+    def test_dataset_download_no_size_header(self, mock_get, mock_input):
         ds = pyrefinebio.Dataset(download_url="test_download_url")
 
         mr = MockResponse(None, "test_download_url", headers={})
@@ -303,10 +312,13 @@ class DatasetTests(unittest.TestCase, CustomAssertions):
         mock_get.return_value.__enter__.return_value = mr
         mock_input.return_value = "n"
 
-        ds.download("test_path")
+        with tempfile.TemporaryDirectory() as dir:
+            ds.download(os.path.join(dir, "test_path"))
 
-        mock_get.assert_called_with("test_download_url", stream=True)
-        mock_copy.assert_not_called()
+            mock_get.assert_called_with(
+                "test_download_url", headers={"Range": "bytes=0-0"}, stream=True
+            )
+            self.assertEqual(os.listdir(dir), [])
 
     def test_add_samples(self):
         dataset = pyrefinebio.Dataset()
@@ -339,4 +351,27 @@ class DatasetTests(unittest.TestCase, CustomAssertions):
 
         ds.extract()
 
-        mock_unpack.assert_called_with("foo")
+        mock_unpack.assert_called_with("foo", None)
+
+    def test_dataset_read_files(self):
+        with tempfile.TemporaryDirectory() as dir:
+            path = os.path.join(dir, "dataset.zip")
+
+            with zipfile.ZipFile(path, "w") as z:
+                z.writestr("metadata.tsv", "accession_code\nSRR1\n")
+                z.writestr("SRP1/SRP1.tsv", "Gene\tSRR1\n")
+
+            ds = pyrefinebio.Dataset()
+            ds._downloaded_path = path
+
+            self.assertEqual(ds.list_files(), ["metadata.tsv", "SRP1/SRP1.tsv"])
+
+            with ds.open_file("metadata.tsv", encoding="utf-8") as f:
+                self.assertEqual(f.read(), "accession_code\nSRR1\n")
+
+            ds.extract(pattern="metadata*", path=os.path.join(dir, "out"))
+            self.assertEqual(os.listdir(os.path.join(dir, "out")), ["metadata.tsv"])
+
+    def test_dataset_read_files_not_downloaded(self):
+        with self.assertRaises(pyrefinebio.exceptions.MissingFile):
+            pyrefinebio.Dataset().list_files()
@@ -0,0 +1,102 @@
+import hashlib
+import io
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from pyrefinebio import api_interface
+from pyrefinebio.download_cache import DownloadCache
+from tests.mocks import MockResponse
+
+CONTENT = b"compendium" * 100
+SHA1 = hashlib.sha1(CONTENT).hexdigest()
+
+
+def mock_get(url, headers=None, stream=False):
+    response = MockResponse(None, url, headers={"content-length": str(len(CONTENT))})
+    response.raw = io.BytesIO(CONTENT)
+
+    return MockContext(response)
+
+
+class MockContext:
+    def __init__(self, response):
+        self.response = response
+
+    def __enter__(self):
+        return self.response
+
+    def __exit__(self, *args):
+        pass
+
+
+class DownloadCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.cache_dir = os.path.join(self.dir.name, "cache")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def write(self, name, data):
+        path = os.path.join(self.dir.name, name)
+        with open(path, "wb") as f:
+            f.write(data)
+        return path
+
+    def test_store_and_fetch(self):
+        cache = DownloadCache(self.cache_dir, 1000)
+        source = self.write("source", b"data")
+
+        self.assertFalse(cache.fetch("abc123", os.path.join(self.dir.name, "missing")))
+
+        cache.store("abc123", source)
+
+        destination = os.path.join(self.dir.name, "destination")
+        self.assertTrue(cache.fetch("ABC123", destination))
+
+        with open(destination, "rb") as f:
+            self.assertEqual(f.read(), b"data")
+
+        # hardlinked rather than copied
+        self.assertTrue(os.path.samefile(destination, cache.path("abc123")))
+
+    def test_evicts_least_recently_used(self):
+        cache = DownloadCache(self.cache_dir, 12)
+
+        for i, name in enumerate(["aa", "bb", "cc"]):
+            cache.store(name, self.write(name, b"1234"))
+            os.utime(cache.path(name), (i, i))
+
+        # using "aa" makes "bb" the least recently used
+        cache.fetch("aa", os.path.join(self.dir.name, "used"))
+        cache.store("dd", self.write("dd", b"1234"))
+
+        self.assertTrue(os.path.exists(cache.path("aa")))
+        self.assertFalse(os.path.exists(cache.path("bb")))
+        self.assertTrue(os.path.exists(cache.path("cc")))
+        self.assertTrue(os.path.exists(cache.path("dd")))
+
+    @patch("pyrefinebio.api_interface.requests.Session.get", side_effect=mock_get)
+    def test_download_file_uses_cache(self, mock_get):
+        with patch.object(api_interface.CONFIG, "download_cache_dir", self.cache_dir):
+            first = os.path.join(self.dir.name, "first.zip")
+            api_interface.download_file("test_url", first, False, sha1=SHA1)
+
+            second = os.path.join(self.dir.name, "second.zip")
+            api_interface.download_file("test_url", second, False, sha1=SHA1)
+
+        self.assertEqual(mock_get.call_count, 1)
+
+        with open(second, "rb") as f:
+            self.assertEqual(f.read(), CONTENT)
+
+    @patch("pyrefinebio.api_interface.requests.Session.get", side_effect=mock_get)
+    def test_download_file_without_sha1_is_not_cached(self, mock_get):
+        with patch.object(api_interface.CONFIG, "download_cache_dir", self.cache_dir):
+            for name in ("first.zip", "second.zip"):
+                api_interface.download_file("test_url", os.path.join(self.dir.name, name), False)
+
+        self.assertEqual(mock_get.call_count, 2)
+        self.assertEqual(DownloadCache(self.cache_dir, 0).entries(), [])
@@ -5,7 +5,7 @@ from unittest.mock import patch
 import pyrefinebio
 from pyrefinebio import original_file as prb_original_file
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 
 job_1 = {
     "id": 1,
@@ -84,22 +84,23 @@ def mock_request(method, url, **kwargs):
 
 
 class DownloaderJobTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_downloader_job_get(self, mock_request):
         result = pyrefinebio.DownloaderJob.get(1)
         self.assertObject(result, job_1_object_dict)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_downloader_job_500(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.ServerError):
             pyrefinebio.DownloaderJob.get(500)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_downloader_job_get_404(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.NotFound):
             pyrefinebio.DownloaderJob.get(0)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_downloader_job_search_no_filters(self, mock_request):
         results = pyrefinebio.DownloaderJob.search()
 
@@ -3,7 +3,7 @@ from unittest.mock import Mock, patch
 
 import pyrefinebio
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 
 experiment = {
     "id": 0,
@@ -128,22 +128,23 @@ def mock_request(method, url, **kwargs):
 
 
 class ExperimentTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_experiments_get(self, mock_request):
         result = pyrefinebio.Experiment.get("SRP150473")
         self.assertObject(result, experiment)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_experiments_500(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.ServerError):
             pyrefinebio.Experiment.get("force-500-error")
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_experiments_get_404(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.NotFound):
             pyrefinebio.Experiment.get("bad-accession-code")
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_experiments_search_no_filters(self, mock_request):
         results = pyrefinebio.Experiment.search()
 
@@ -0,0 +1,84 @@
+import unittest
+from unittest.mock import patch
+
+import pyrefinebio
+from pyrefinebio import base
+from pyrefinebio.exceptions import MissingObjects
+from tests.mocks import mock_request, sample
+
+
+class GetManyTests(unittest.TestCase):
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_samples(self, mock_request):
+        codes = ["SAMPLE{0}".format(i) for i in range(250)]
+
+        samples = pyrefinebio.Sample.get_many(list(reversed(codes)))
+
+        self.assertEqual([s.accession_code for s in samples], list(reversed(codes)))
+        # in batches of 100
+        self.assertEqual(len(mock_request.call_args_list), 3)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_experiments(self, mock_request):
+        experiments = pyrefinebio.Experiment.get_many(["GSE2", "GSE1", "GSE2"])
+
+        self.assertEqual([e.accession_code for e in experiments], ["GSE2", "GSE1", "GSE2"])
+        self.assertEqual(len(mock_request.call_args_list), 1)
+        self.assertEqual(mock_request.call_args[1]["params"]["accession_code"], ["GSE2", "GSE1"])
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_files(self, mock_request):
+        computed_files = pyrefinebio.ComputedFile.get_many([3, 1, 2])
+        original_files = pyrefinebio.OriginalFile.get_many([5, 4])
+
+        self.assertEqual(
+            [f.filename for f in computed_files], ["file-3.tsv", "file-1.tsv", "file-2.tsv"]
+        )
+        self.assertEqual([f.filename for f in original_files], ["file-5.tsv", "file-4.tsv"])
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_missing(self, mock_request):
+        with self.assertRaises(MissingObjects) as context:
+            pyrefinebio.Sample.get_many(["SAMPLE1", "MISSING", "SAMPLE2"])
+
+        self.assertEqual(context.exception.missing, ["MISSING"])
+        self.assertEqual(context.exception.results[1], None)
+
+        files = pyrefinebio.ComputedFile.get_many([1, 404], ignore_missing=True)
+
+        self.assertEqual(files[0].filename, "file-1.tsv")
+        self.assertIsNone(files[1])
+
+    def test_batches(self):
+        self.assertEqual(list(base._batches([1, 2, 3, 4, 5], 2, 0)), [[1, 2], [3, 4], [5]])
+
+        codes = ["x" * 1000] * 9
+        self.assertEqual([len(batch) for batch in base._batches(codes, 100, 10)], [3, 3, 3])
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_resolve_experiments(self, mock_request):
+        samples = [
+            pyrefinebio.Sample(**sample("SAMPLE1")),
+            pyrefinebio.Sample(**sample("SAMPLE2")),
+            pyrefinebio.Sample(**sample("SAMPLE0")),
+            # not fetched yet, so its experiment accession codes aren't known
+            pyrefinebio.Sample(accession_code="SAMPLE3"),
+            # not fetched and can't be found
+            pyrefinebio.Sample(accession_code="MISSING"),
+        ]
+
+        pyrefinebio.Sample.resolve_experiments(samples)
+
+        # one search for the unfetched samples and one for every experiment
+        self.assertEqual(len(mock_request.call_args_list), 2)
+        self.assertEqual(
+            mock_request.call_args[1]["params"]["accession_code"], ["GSE1", "GSE2", "MISSING"]
+        )
+
+        self.assertEqual([e.accession_code for e in samples[0].experiments], ["GSE1", "GSE2"])
+        self.assertIs(samples[1].experiments[0], samples[0].experiments[1])
+        self.assertEqual(samples[2].experiments, [])
+        self.assertEqual(samples[3].experiments, [])
+        self.assertEqual(samples[4].experiments, [])
+
+        self.assertEqual(len(mock_request.call_args_list), 2)
@@ -37,7 +37,9 @@ class HighLevelFunctionTests(unittest.TestCase, CustomAssertions):
             },
         )
 
-        mock_download.assert_called_with("test_url", os.path.abspath("test"), True)
+        mock_download.assert_called_with(
+            "test_url", os.path.abspath("test"), True, sha1=None, size_in_bytes=None
+        )
 
     @patch("pyrefinebio.dataset.download_file")
     @patch("pyrefinebio.dataset.get_by_endpoint")
@@ -69,7 +71,9 @@ class HighLevelFunctionTests(unittest.TestCase, CustomAssertions):
             },
         )
 
-        mock_download.assert_called_with("test_url", os.path.abspath("test"), True)
+        mock_download.assert_called_with(
+            "test_url", os.path.abspath("test"), True, sha1=None, size_in_bytes=None
+        )
 
     @patch("pyrefinebio.dataset.download_file")
     @patch("pyrefinebio.dataset.get_by_endpoint")
@@ -101,7 +105,9 @@ class HighLevelFunctionTests(unittest.TestCase, CustomAssertions):
             },
         )
 
-        mock_download.assert_called_with("test_url", os.path.abspath("test"), True)
+        mock_download.assert_called_with(
+            "test_url", os.path.abspath("test"), True, sha1=None, size_in_bytes=None
+        )
 
     @patch("pyrefinebio.dataset.shutil.unpack_archive")
     @patch("pyrefinebio.dataset.download_file")
@@ -121,8 +127,10 @@ class HighLevelFunctionTests(unittest.TestCase, CustomAssertions):
 
         expected_path = os.path.abspath("dataset-test_dataset.zip")
 
-        mock_download.assert_called_with("test_url", expected_path, True)
-        mock_unpack.assert_called_with(expected_path)
+        mock_download.assert_called_with(
+            "test_url", expected_path, True, sha1=None, size_in_bytes=None
+        )
+        mock_unpack.assert_called_with(expected_path, None)
 
     def test_download_dataset_both(self):
         with self.assertRaises(pyrefinebio.exceptions.DownloadError):
@@ -151,10 +159,13 @@ class HighLevelFunctionTests(unittest.TestCase, CustomAssertions):
                 "primary_organism__name": "test_organism",
                 "quant_sf_only": False,
                 "latest_version": True,
+                "limit": 1000,
             },
         )
 
-        mock_download.assert_called_with("test_url", os.path.abspath("test"), True)
+        mock_download.assert_called_with(
+            "test_url", os.path.abspath("test"), True, sha1=None, size_in_bytes=None
+        )
 
     @patch("pyrefinebio.compendia.shutil.unpack_archive")
     @patch("pyrefinebio.compendia.download_file")
@@ -174,8 +185,10 @@ class HighLevelFunctionTests(unittest.TestCase, CustomAssertions):
 
         expected_path = os.path.abspath("compendium-123.zip")
 
-        mock_download.assert_called_with("test_url", expected_path, True)
-        mock_unpack.assert_called_with(expected_path)
+        mock_download.assert_called_with(
+            "test_url", expected_path, True, sha1=None, size_in_bytes=None
+        )
+        mock_unpack.assert_called_with(expected_path, None)
 
     def test_download_compendium_no_results(self):
         with self.assertRaises(pyrefinebio.exceptions.DownloadError):
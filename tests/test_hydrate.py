@@ -0,0 +1,63 @@
+import unittest
+from unittest.mock import patch
+
+import pyrefinebio
+from tests.custom_assertions import CustomAssertions
+from tests.mocks import computed_file, mock_request
+
+
+class HydrateTests(unittest.TestCase, CustomAssertions):
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_hydrate_samples(self, mock_request):
+        samples = [pyrefinebio.Sample(accession_code="SAMPLE" + str(i)) for i in range(3)]
+
+        pyrefinebio.hydrate(samples)
+
+        self.assertEqual(len(mock_request.call_args_list), 1)
+        self.assertEqual(
+            mock_request.call_args_list[0][1]["params"]["accession_codes"],
+            "SAMPLE0,SAMPLE1,SAMPLE2",
+        )
+
+        for i, s in enumerate(samples):
+            self.assertEqual(s.title, "test SAMPLE" + str(i))
+
+        self.assertEqual(len(mock_request.call_args_list), 1)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_hydrate_fields(self, mock_request):
+        samples = [
+            pyrefinebio.Sample(accession_code="SAMPLE1"),
+            pyrefinebio.Sample(accession_code="SAMPLE2"),
+        ]
+
+        pyrefinebio.hydrate(samples, fields=["computed_files"])
+
+        # the samples are hydrated with one search and each distinct computed file once
+        self.assertEqual(len(mock_request.call_args_list), 3)
+
+        self.assertObject(samples[0].computed_files[0], computed_file(1))
+        self.assertObject(samples[0].computed_files[1], computed_file(2))
+        self.assertObject(samples[1].computed_files[0], computed_file(2))
+
+        self.assertEqual(len(mock_request.call_args_list), 3)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_hydrate_missing(self, mock_request):
+        missing = pyrefinebio.Sample(accession_code="MISSING")
+
+        pyrefinebio.hydrate([missing])
+
+        self.assertFalse(missing._fetched)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_hydrate_fields_missing(self, mock_request):
+        found = pyrefinebio.Sample(accession_code="SAMPLE2")
+        missing = pyrefinebio.Sample(accession_code="MISSING")
+
+        pyrefinebio.hydrate([found, missing], fields=["computed_files"])
+
+        self.assertObject(found.computed_files[0], computed_file(2))
+        self.assertFalse(missing._fetched)
+        # one search for the samples and one get for the computed file
+        self.assertEqual(len(mock_request.call_args_list), 2)
@@ -0,0 +1,94 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+import pyrefinebio
+from pyrefinebio import identity
+from tests.mocks import mock_request
+
+
+class IdentityMapTests(unittest.TestCase):
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_without_map(self, mock_request):
+        first = pyrefinebio.Sample.get("SAMPLE1")
+        second = pyrefinebio.Sample.get("SAMPLE1")
+
+        self.assertIsNot(first, second)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_same_instance(self, mock_request):
+        with pyrefinebio.identity_map() as objects:
+            sample = pyrefinebio.Sample.get("SAMPLE1")
+            found = pyrefinebio.Sample.search(accession_codes="SAMPLE1,SAMPLE2")
+
+            self.assertIs(found[0], sample)
+            self.assertIsNot(found[1], sample)
+
+            # one Sample each and their two shared ComputedFiles
+            self.assertEqual(len(objects), 4)
+
+        self.assertIsNot(pyrefinebio.Sample.get("SAMPLE1"), sample)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_shared_fetch(self, mock_request):
+        with pyrefinebio.identity_map():
+            samples = pyrefinebio.Sample.search(accession_codes="SAMPLE1,SAMPLE2")
+
+            self.assertIs(samples[0].computed_files[1], samples[1].computed_files[0])
+
+            sizes = [s.computed_files[-1].size_in_bytes for s in samples]
+
+        self.assertEqual(sizes, [200, 200])
+        # one search and a single get for the shared computed file
+        self.assertEqual(len(mock_request.call_args_list), 2)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_merge_keeps_values(self, mock_request):
+        with pyrefinebio.identity_map():
+            computed = pyrefinebio.ComputedFile.get(1)
+            stub = pyrefinebio.ComputedFile(id=1)
+
+        self.assertIs(stub, computed)
+        self.assertEqual(stub.filename, "file-1.tsv")
+        self.assertEqual(len(mock_request.call_args_list), 1)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_merge_into_stub(self, mock_request):
+        with pyrefinebio.identity_map():
+            stub = pyrefinebio.ComputedFile(id=1)
+            computed = pyrefinebio.ComputedFile.get(1)
+
+            self.assertIs(computed, stub)
+            self.assertEqual(stub.filename, "file-1.tsv")
+            # the response didn't have a sha1, and it isn't fetched again to look for one
+            self.assertIsNone(stub.sha1)
+
+        self.assertEqual(len(mock_request.call_args_list), 1)
+
+    def test_threads_have_their_own_map(self):
+        entered = threading.Barrier(2)
+        maps = []
+
+        def worker():
+            with pyrefinebio.identity_map() as objects:
+                entered.wait()
+                maps.append(identity.current() is objects)
+                entered.wait()
+
+            maps.append(identity.current())
+
+        threads = [threading.Thread(target=worker) for _ in range(2)]
+        [t.start() for t in threads]
+        [t.join() for t in threads]
+
+        self.assertEqual(maps, [True, True, None, None])
+        self.assertIsNone(identity.current())
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_worker_threads_use_map(self, mock_request):
+        with pyrefinebio.identity_map():
+            sample = pyrefinebio.Sample.get("SAMPLE1")
+            # get_many searches in a thread pool
+            found = pyrefinebio.Sample.get_many(["SAMPLE1", "SAMPLE2"])
+
+        self.assertIs(found[0], sample)
@@ -0,0 +1,137 @@
+import os
+import tempfile
+import unittest
+import unittest.mock
+import zipfile
+
+import pyrefinebio
+from pyrefinebio import matrix
+
+try:
+    import numpy
+except ImportError:
+    numpy = None
+
+MATRIX = (
+    "Gene\tSRR1\tSRR2\tSRR3\n"
+    "ENSG1\t1.5\t2.5\t3.5\n"
+    "ENSG2\t4.0\tNA\t6.0\n"
+    "ENSG3\t7.0\t8.0\t9.0\n"
+)
+
+
+@unittest.skipUnless(numpy, "requires numpy")
+class MatrixTests(unittest.TestCase):
+    def setUp(self):
+        self.dir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.dir.name, "compendium-1.zip")
+
+        with zipfile.ZipFile(self.path, "w") as z:
+            z.writestr("HOMO_SAPIENS/HOMO_SAPIENS.tsv", MATRIX)
+            z.writestr("HOMO_SAPIENS/metadata_HOMO_SAPIENS.tsv", "refinebio_accession_code\n")
+            z.writestr("aggregated_metadata.json", "{}")
+
+    def tearDown(self):
+        self.dir.cleanup()
+
+    def test_expression_files(self):
+        self.assertEqual(matrix.expression_files(self.path), ["HOMO_SAPIENS/HOMO_SAPIENS.tsv"])
+
+    def test_load_matrix(self):
+        for by in ("gene", "sample"):
+            m = matrix.load_matrix(self.path, by=by)
+
+            self.assertIsInstance(m.values, numpy.memmap)
+            self.assertEqual(m.shape, (3, 3))
+            self.assertEqual(m.genes, ["ENSG1", "ENSG2", "ENSG3"])
+            self.assertEqual(m.samples, ["SRR1", "SRR2", "SRR3"])
+            self.assertEqual(m.values.dtype, numpy.float32)
+            self.assertTrue(numpy.isnan(m.values[1, 1]))
+
+            subset = m.subset(genes=["ENSG3", "ENSG1"], samples=["SRR3"])
+            numpy.testing.assert_array_equal(subset.values, [[9.0], [3.5]])
+            self.assertEqual(subset.genes, ["ENSG3", "ENSG1"])
+
+    def test_load_matrix_converts_once(self):
+        matrix.load_matrix(self.path)
+
+        converted = os.path.join(
+            self.dir.name, "compendium-1_matrices", "HOMO_SAPIENS__HOMO_SAPIENS.gene"
+        )
+        mtime = os.stat(converted + ".f32").st_mtime_ns
+
+        m = matrix.load_matrix(self.path)
+
+        self.assertEqual(os.stat(converted + ".f32").st_mtime_ns, mtime)
+        self.assertEqual(float(m.values[2, 0]), 7.0)
+
+    def test_unknown_gene(self):
+        m = matrix.load_matrix(self.path)
+
+        with self.assertRaises(KeyError):
+            m.subset(genes=["ENSG4"])
+
+    def test_compendium_load_matrix(self):
+        compendium = pyrefinebio.Compendium()
+        compendium._downloaded_path = self.path
+
+        m = compendium.load_matrix()
+
+        numpy.testing.assert_array_equal(m.subset(genes=["ENSG1"]).values, [[1.5, 2.5, 3.5]])
+
+    def test_dataset_with_several_matrices(self):
+        path = os.path.join(self.dir.name, "dataset.zip")
+
+        with zipfile.ZipFile(path, "w") as z:
+            z.writestr("SRP1/SRP1.tsv", MATRIX)
+            z.writestr("SRP2/SRP2.tsv", MATRIX)
+
+        dataset = pyrefinebio.Dataset()
+        dataset._downloaded_path = path
+
+        with self.assertRaises(ValueError):
+            dataset.load_matrix()
+
+        self.assertEqual(dataset.load_matrix("SRP2/SRP2.tsv").shape, (3, 3))
+
+    def test_open_matrix(self):
+        reader = matrix.open_matrix(self.path)
+
+        self.assertEqual(reader.genes, ["ENSG1", "ENSG2", "ENSG3"])
+        self.assertEqual(reader.samples, ["SRR1", "SRR2", "SRR3"])
+        self.assertIs(matrix.open_matrix(self.path), reader)
+
+        m = reader.read(genes=["ENSG3", "ENSG2"])
+        self.assertEqual(m.genes, ["ENSG3", "ENSG2"])
+        numpy.testing.assert_array_equal(m.values, [[7.0, 8.0, 9.0], [4.0, numpy.nan, 6.0]])
+
+        m = reader.read(samples=["SRR3", "SRR1"])
+        numpy.testing.assert_array_equal(m.values, [[3.5, 1.5], [6.0, 4.0], [9.0, 7.0]])
+
+        m = reader.read(genes=["ENSG1"], samples=["SRR2"])
+        numpy.testing.assert_array_equal(m.values, [[2.5]])
+
+    def test_matrix_reader_reuses_index(self):
+        path = matrix.open_matrix(self.path).path
+
+        with open(path + ".index.json") as f:
+            index = f.read()
+
+        # a new reader loads the saved offsets instead of scanning the file again
+        with unittest.mock.patch.object(matrix.MatrixReader, "_build_index") as mock_build:
+            reader = matrix.MatrixReader(path)
+
+        mock_build.assert_not_called()
+        lines = MATRIX.splitlines(keepends=True)
+        self.assertEqual(
+            reader.offsets, [len("".join(lines[:i])) for i in range(1, len(lines))]
+        )
+        self.assertTrue(index)
+
+    def test_compendium_read_matrix(self):
+        compendium = pyrefinebio.Compendium()
+        compendium._downloaded_path = self.path
+
+        m = compendium.read_matrix(genes=["ENSG2"], samples=["SRR1", "SRR3"])
+
+        numpy.testing.assert_array_equal(m.values, [[4.0, 6.0]])
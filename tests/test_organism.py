@@ -3,7 +3,7 @@ from unittest.mock import Mock, patch
 
 import pyrefinebio
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 
 gorilla = {
     "name": "GORILLA",
@@ -43,22 +43,23 @@ def mock_request(method, url, **kwargs):
 
 
 class OrganismTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_organism_get(self, mock_request):
         result = pyrefinebio.Organism.get("GORILLA")
         self.assertObject(result, gorilla)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_organism_500(self, mock_request):
         with self.assertRaises(Exception):
             pyrefinebio.Organism.get(500)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_organism_get_404(self, mock_request):
         with self.assertRaises(Exception):
             pyrefinebio.Organism.get("HUMAN")
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_organism_search_no_filters(self, mock_request):
         results = pyrefinebio.Organism.search()
 
@@ -5,7 +5,7 @@ from unittest.mock import patch
 import pyrefinebio
 from pyrefinebio import job as prb_job, original_file as prb_original_file
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 
 processor_job = {
     "id": 29708302,
@@ -146,29 +146,30 @@ def mock_request(method, url, **kwargs):
 
 
 class OriginalFileTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_original_file_get(self, mock_request):
         result = pyrefinebio.OriginalFile.get(1)
         self.assertObject(result, og_file_1)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_original_file_500(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.ServerError):
             pyrefinebio.OriginalFile.get(500)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_original_file_get_404(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.NotFound):
             pyrefinebio.OriginalFile.get(0)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_original_file_search_no_filters(self, mock_request):
         results = pyrefinebio.OriginalFile.search()
 
         self.assertObject(results[0], og_file_list_1)
         self.assertObject(results[1], og_file_list_2)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_original_file_search_fully_populated(self, mock_request):
         # for some reason /original_files search endpoint doesn't return is_downloaded
         # make sure this property is populated correctly
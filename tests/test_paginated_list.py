@@ -1,6 +1,12 @@
 import unittest
 from unittest.mock import Mock, patch
 
+try:
+    import numpy
+    import pandas
+except ImportError:
+    numpy = pandas = None
+
 import pyrefinebio
 from tests.custom_assertions import CustomAssertions
 from tests.mocks import MockResponse
@@ -62,8 +68,27 @@ def mock_request(method, url, **kwargs):
         )
 
 
+def mock_window_request(method, url, **kwargs):
+    params = kwargs["params"]
+
+    if url == "https://api.refine.bio/v1/processors/":
+        offset = params.get("offset", 0)
+        # cap the limit like the api would
+        limit = min(params["limit"], 4)
+
+        return MockResponse(
+            {
+                "count": 8,
+                "next": "foo",
+                "previous": None,
+                "results": [processor(i) for i in range(offset, min(offset + limit, 8))],
+            },
+            url,
+        )
+
+
 class PaginatedListTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_indexing(self, mock_request):
         T = pyrefinebio.Processor
         response = MockResponse(page1, "https://api.refine.bio/v1/test/")
@@ -83,7 +108,7 @@ class PaginatedListTests(unittest.TestCase, CustomAssertions):
         with self.assertRaises(IndexError):
             paginatedList[-5]
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_iteration(self, mock_request):
         T = pyrefinebio.Processor
         response = MockResponse(page1, "https://api.refine.bio/v1/test/")
@@ -97,7 +122,7 @@ class PaginatedListTests(unittest.TestCase, CustomAssertions):
             self.assertObject(processor, actual[i])
             i += 1
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_slicing(self, mock_request):
         paginatedList = pyrefinebio.Processor.search(limit=10)
 
@@ -118,7 +143,7 @@ class PaginatedListTests(unittest.TestCase, CustomAssertions):
 
         self.assertEqual(len(mock_request.call_args_list), 2)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_slicing_with_step(self, mock_request):
         paginatedList = pyrefinebio.Processor.search(limit=10)
 
@@ -134,7 +159,7 @@ class PaginatedListTests(unittest.TestCase, CustomAssertions):
 
         self.assertEqual(len(mock_request.call_args_list), 2)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_slicing_negative_indices(self, mock_request):
         paginatedList = pyrefinebio.Processor.search(limit=10)
 
@@ -155,7 +180,7 @@ class PaginatedListTests(unittest.TestCase, CustomAssertions):
 
         self.assertEqual(len(mock_request.call_args_list), 2)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_slicing_negative_step(self, mock_request):
         paginatedList = pyrefinebio.Processor.search(limit=10)
 
@@ -176,7 +201,7 @@ class PaginatedListTests(unittest.TestCase, CustomAssertions):
 
         self.assertEqual(len(mock_request.call_args_list), 2)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_slicing_default_start_stop(self, mock_request):
         paginatedList = pyrefinebio.Processor.search(limit=10)
 
@@ -189,7 +214,7 @@ class PaginatedListTests(unittest.TestCase, CustomAssertions):
         self.assertObject(actual[2], processor(10))
         self.assertObject(actual[3], processor(15))
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_slicing_default_start_stop_negative_step(self, mock_request):
         paginatedList = pyrefinebio.Processor.search(limit=10)
 
@@ -201,3 +226,160 @@ class PaginatedListTests(unittest.TestCase, CustomAssertions):
         self.assertObject(actual[1], processor(14))
         self.assertObject(actual[2], processor(9))
         self.assertObject(actual[3], processor(4))
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_iterate_prefetch(self, mock_request):
+        paginatedList = pyrefinebio.Processor.search(limit=10)
+
+        actual = list(paginatedList.iterate(prefetch=2))
+
+        self.assertEqual(len(actual), 20)
+
+        for i in range(20):
+            self.assertObject(actual[i], processor(i))
+
+        self.assertEqual(len(mock_request.call_args_list), 2)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_iterate_prefetch_list_changed(self, mock_request):
+        paginatedList = pyrefinebio.Processor.search(limit=10)
+        paginatedList.total_items = 21
+
+        with self.assertRaises(RuntimeError):
+            list(paginatedList.iterate(prefetch=2))
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_independent_iterators(self, mock_request):
+        paginatedList = pyrefinebio.Processor.search(limit=10)
+
+        first = iter(paginatedList)
+        second = iter(paginatedList)
+
+        self.assertObject(next(first), processor(0))
+        self.assertObject(next(first), processor(1))
+        self.assertObject(next(second), processor(0))
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_iteration_without_cached_pages(self, mock_request):
+        paginatedList = pyrefinebio.Processor.search(limit=10)
+        paginatedList.max_cached_pages = 0
+
+        self.assertEqual(len(list(paginatedList)), 20)
+        self.assertEqual(len(list(paginatedList)), 20)
+
+        # the second page is requested again for each pass
+        self.assertEqual(len(mock_request.call_args_list), 3)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_iteration_with_cached_pages(self, mock_request):
+        paginatedList = pyrefinebio.Processor.search(limit=10)
+        paginatedList.max_cached_pages = 1
+
+        self.assertEqual(len(list(paginatedList)), 20)
+        self.assertEqual(len(list(paginatedList)), 20)
+
+        self.assertEqual(len(mock_request.call_args_list), 2)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_window_request)
+    def test_slicing_fetches_consecutive_pages_together(self, mock_request):
+        paginatedList = pyrefinebio.Processor.search(limit=2)
+
+        actual = paginatedList[1:5]
+
+        self.assertEqual([p.id for p in actual], [1, 2, 3, 4])
+        self.assertEqual(
+            mock_request.call_args_list[1][1]["params"], {"offset": 2, "limit": 4},
+        )
+        self.assertEqual(len(mock_request.call_args_list), 2)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_window_request)
+    def test_slicing_with_capped_limit(self, mock_request):
+        paginatedList = pyrefinebio.Processor.search(limit=2)
+
+        actual = paginatedList[2:]
+
+        self.assertEqual([p.id for p in actual], [2, 3, 4, 5, 6, 7])
+
+        # the api only returned two of the three requested pages, so the last is requested alone
+        self.assertEqual(
+            mock_request.call_args_list[1][1]["params"], {"offset": 2, "limit": 6},
+        )
+        self.assertEqual(
+            mock_request.call_args_list[2][1]["params"], {"offset": 6, "limit": 2},
+        )
+        self.assertEqual(len(mock_request.call_args_list), 3)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_window_request)
+    def test_search_uses_configured_page_size(self, mock_request):
+        config = pyrefinebio.config.Config()
+        page_size = config.page_size
+
+        try:
+            config.page_size = 4
+            pyrefinebio.Processor.search()
+        finally:
+            config.page_size = page_size
+
+        self.assertEqual(mock_request.call_args_list[0][1]["params"], {"limit": 4})
+
+    def test_base_url_drops_pagination(self):
+        response = MockResponse(
+            page1, "https://api.refine.bio/v1/test/?limit=2&offset=0&is_processed=True"
+        )
+        paginatedList = pyrefinebio.util.create_paginated_list(pyrefinebio.Processor, response)
+
+        self.assertEqual(
+            paginatedList.base_url, "https://api.refine.bio/v1/test/?is_processed=True"
+        )
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_compact(self, mock_request):
+        paginatedList = pyrefinebio.Processor.search(limit=10).compact()
+
+        actual = list(paginatedList)
+
+        self.assertEqual(len(actual), 20)
+        self.assertIsInstance(actual[0], pyrefinebio.record.Record)
+        self.assertFalse(hasattr(actual[0], "__dict__"))
+
+        for i in range(20):
+            self.assertEqual(actual[i].to_dict(), processor(i))
+            self.assertObject(actual[i].to_model(), processor(i))
+
+        with self.assertRaises(AttributeError):
+            actual[0].name = "foo"
+
+    @unittest.skipUnless(numpy, "requires numpy")
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_to_columns(self, mock_request):
+        paginatedList = pyrefinebio.Processor.search(limit=10)
+
+        with patch.object(pyrefinebio.Processor, "__init__") as mock_init:
+            columns = paginatedList.to_columns(categorical=["name"], prefetch=1)
+
+        mock_init.assert_not_called()
+
+        self.assertEqual(columns["id"].dtype, numpy.int64)
+        self.assertEqual(list(columns["id"]), list(range(20)))
+        self.assertEqual(columns["name"].categories, ["test-4"])
+        self.assertEqual(list(columns["name"].codes), [0] * 20)
+
+    @unittest.skipUnless(pandas, "requires pandas")
+    def test_to_dataframe(self):
+        results = [
+            {"accession_code": "1", "organism": {"name": "HUMAN"}, "age": 1.5},
+            {"accession_code": "2", "organism": {"name": "MOUSE"}, "age": None},
+            {"accession_code": "3", "organism": {"name": "HUMAN"}, "age": 3},
+        ]
+        response = MockResponse(
+            {"count": 3, "results": results}, "https://api.refine.bio/v1/samples/"
+        )
+        paginatedList = pyrefinebio.util.create_paginated_list(pyrefinebio.Sample, response)
+
+        df = paginatedList.to_dataframe()
+
+        self.assertEqual(list(df.columns), ["accession_code", "organism__name", "age"])
+        self.assertEqual(str(df["organism__name"].dtype), "category")
+        self.assertEqual(list(df["organism__name"]), ["HUMAN", "MOUSE", "HUMAN"])
+        self.assertEqual(df["age"].dtype, numpy.float64)
+        self.assertTrue(numpy.isnan(df["age"][1]))
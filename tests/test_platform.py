@@ -20,7 +20,7 @@ def mock_request(method, url, **kwargs):
 
 
 class PlatfromTest(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_computed_file_get(self, mock_request):
         result = pyrefinebio.Platform.search()
 
@@ -3,7 +3,7 @@ from unittest.mock import Mock, patch
 
 import pyrefinebio
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 
 processor_1 = {
     "id": 1,
@@ -62,22 +62,23 @@ def mock_request(method, url, **kwargs):
 
 
 class ProcessorTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_processor_get(self, mock_request):
         result = pyrefinebio.Processor.get(1)
         self.assertObject(result, processor_1)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_processor_500(self, mock_request):
         with self.assertRaises(Exception):
             pyrefinebio.Processor.get(500)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_processor_get_404(self, mock_request):
         with self.assertRaises(Exception):
             pyrefinebio.Processor.get(0)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_processor_search_no_filters(self, mock_request):
         results = pyrefinebio.Processor.search()
 
@@ -1,9 +1,10 @@
+import os
 import unittest
 from unittest.mock import Mock, patch
 
 import pyrefinebio
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 
 qn_target_organisms = [
     {"name": "MUSTELA_PUTORIUS_FURO", "taxonomy_id": 9669},
@@ -89,22 +90,23 @@ def mock_request(method, url, **kwargs):
 
 
 class QNTargetTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_qn_target_get(self, mock_request):
         result = pyrefinebio.QNTarget.get("MUSTELA_PUTORIUS_FURO")
         self.assertObject(result, qn_target)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_qn_target_500(self, mock_request):
         with self.assertRaises(Exception):
             pyrefinebio.QNTarget.get(500)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_qn_target_404(self, mock_request):
         with self.assertRaises(Exception):
             pyrefinebio.QNTarget.get(0)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_qn_target_search(self, mock_request):
         result = pyrefinebio.QNTarget.search()
 
@@ -112,3 +114,20 @@ class QNTargetTests(unittest.TestCase, CustomAssertions):
 
         for i in range(len(result)):
             self.assertObject(result[i], qn_target_organisms[i])
+
+    # just mock download - it's already tested in depth in test_api_interface
+    @patch("pyrefinebio.qn_target.download_file")
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_qn_target_download(self, mock_request, mock_download):
+        result = pyrefinebio.QNTarget.get("MUSTELA_PUTORIUS_FURO")
+
+        result.download("test-path")
+
+        mock_download.assert_called_with(
+            qn_target["s3_url"],
+            os.path.abspath("test-path"),
+            True,
+            sha1=qn_target["sha1"],
+            size_in_bytes=qn_target["size_in_bytes"],
+        )
+        self.assertEqual(result._downloaded_path, os.path.abspath("test-path"))
@@ -0,0 +1,92 @@
+import os
+import tempfile
+import threading
+import unittest
+from unittest.mock import Mock, patch
+
+from pyrate_limiter import BucketFullException
+
+from pyrefinebio.file_lock import FileLock
+from pyrefinebio.rate_limit import DEFAULT_RETRY_AFTER, Throttle, create_limiter, retry_after
+
+
+class RateLimitTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "rate_limit.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def config(self, path):
+        return Mock(api_max_calls_per_second=3, api_rate_limit_path=path)
+
+    def test_shared_limiter(self):
+        # two limiters stand in for two processes using the same file
+        first = create_limiter(self.config(self.path))
+        second = create_limiter(self.config(self.path))
+
+        first.try_acquire("refinebio")
+        first.try_acquire("refinebio")
+        second.try_acquire("refinebio")
+
+        with self.assertRaises(BucketFullException):
+            second.try_acquire("refinebio")
+
+        with self.assertRaises(BucketFullException):
+            first.try_acquire("refinebio")
+
+    def test_separate_limiters(self):
+        first = create_limiter(self.config(None))
+        second = create_limiter(self.config(None))
+
+        for _ in range(3):
+            first.try_acquire("refinebio")
+            second.try_acquire("refinebio")
+
+    def test_retry_after(self):
+        self.assertEqual(retry_after(Mock(headers={"Retry-After": "12"})), 12)
+        self.assertEqual(retry_after(Mock(headers={})), DEFAULT_RETRY_AFTER)
+        self.assertEqual(retry_after(Mock(headers=None)), DEFAULT_RETRY_AFTER)
+        self.assertEqual(retry_after(Mock(headers={"Retry-After": "soon"})), DEFAULT_RETRY_AFTER)
+
+    @patch("pyrefinebio.rate_limit.time.time", return_value=788918367)
+    def test_retry_after_date(self, mock_time):
+        response = Mock(headers={"Retry-After": "Sat, 31 Dec 1994 23:59:57 GMT"})
+        self.assertEqual(retry_after(response), 30)
+
+    @patch("pyrefinebio.rate_limit.time.sleep")
+    def test_shared_throttle(self, mock_sleep):
+        path = self.path + ".retry-after"
+        first = Throttle(path)
+        second = Throttle(path)
+
+        self.assertEqual(second.remaining(), 0)
+
+        first.pause(30)
+
+        self.assertAlmostEqual(second.remaining(), 30, delta=1)
+
+        second.wait()
+        self.assertAlmostEqual(mock_sleep.call_args[0][0], 30, delta=1)
+
+    def test_file_lock(self):
+        path = os.path.join(self.tmp.name, "test.lock")
+        lock = FileLock(path)
+        events = []
+
+        def worker():
+            with FileLock(path):
+                events.append("worker")
+
+        with lock:
+            # re-entrant in the same thread
+            with lock:
+                thread = threading.Thread(target=worker)
+                thread.start()
+                thread.join(0.2)
+                events.append("main")
+
+        thread.join()
+
+        self.assertEqual(events, ["main", "worker"])
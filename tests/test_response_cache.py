@@ -0,0 +1,151 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+import pyrefinebio
+from pyrefinebio import api_interface
+from pyrefinebio.response_cache import ResponseCache
+
+BASE_URL = "https://api.refine.bio/v1/"
+
+organism = {"name": "HOMO_SAPIENS", "taxonomy_id": 9606}
+
+
+def make_response(url, body=None, status=200, headers=None):
+    response = requests.Response()
+    response.status_code = status
+    response.url = url
+    response.encoding = "utf-8"
+    response._content = json.dumps(body).encode("utf-8") if body is not None else b""
+    response.headers.update(headers or {})
+    return response
+
+
+def mock_request(method, url, params=None, data=None, headers=None):
+    if headers.get("If-None-Match") == '"v1"':
+        return make_response(url, status=304, headers={"ETag": '"v1"'})
+
+    return make_response(url, organism, headers={"ETag": '"v1"'})
+
+
+class ResponseCacheTests(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmp.name, "responses.sqlite")
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_ttl(self):
+        cache = ResponseCache(BASE_URL, ttls={"samples": 5})
+
+        self.assertEqual(cache.ttl(BASE_URL + "organisms/HOMO_SAPIENS/"), 24 * 60 * 60)
+        self.assertEqual(cache.ttl(BASE_URL + "samples/"), 5)
+        self.assertEqual(cache.ttl(BASE_URL + "dataset/id/"), 0)
+        self.assertEqual(cache.ttl("https://example.com/organisms/"), 0)
+
+    def test_key(self):
+        cache = ResponseCache(BASE_URL)
+
+        self.assertEqual(
+            cache.key(BASE_URL + "samples/", {"offset": 0, "limit": 10}),
+            cache.key(BASE_URL + "samples/", {"limit": 10, "offset": 0}),
+        )
+
+    def test_memory_lru(self):
+        cache = ResponseCache(BASE_URL, max_entries=2)
+
+        cache.set("a", {"body": "a"})
+        cache.set("b", {"body": "b"})
+        cache.get("a")
+        cache.set("c", {"body": "c"})
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_sqlite(self):
+        cache = ResponseCache(BASE_URL, max_entries=0, path=self.path)
+        cache.set("a", {"body": "a"})
+
+        # a later run with a new cache
+        self.assertEqual(ResponseCache(BASE_URL, path=self.path).get("a"), {"body": "a"})
+
+    def test_sqlite_lru(self):
+        cache = ResponseCache(BASE_URL, max_entries=0, path=self.path, max_path_entries=2)
+
+        cache.set("a", {"body": "a"})
+        cache.set("b", {"body": "b"})
+        cache.get("a")
+        cache.set("c", {"body": "c"})
+
+        self.assertIsNotNone(cache.get("a"))
+        self.assertIsNone(cache.get("b"))
+        self.assertIsNotNone(cache.get("c"))
+
+    def test_sqlite_expired(self):
+        cache = ResponseCache(BASE_URL, max_entries=0, path=self.path)
+        cache.set("old", {"body": "old", "expires": time.time() - 1})
+        cache.set("new", {"body": "new", "expires": time.time() + 60})
+
+        # expired responses are kept for revalidation until the database is opened again
+        self.assertIsNotNone(cache.get("old"))
+
+        cache = ResponseCache(BASE_URL, max_entries=0, path=self.path)
+
+        self.assertIsNone(cache.get("old"))
+        self.assertIsNotNone(cache.get("new"))
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_cached_get(self, mock_request):
+        with patch.object(api_interface, "response_cache", ResponseCache(BASE_URL)):
+            first = pyrefinebio.Organism.get("HOMO_SAPIENS")
+            second = pyrefinebio.Organism.get("HOMO_SAPIENS")
+
+        self.assertEqual(first.name, "HOMO_SAPIENS")
+        self.assertEqual(second.taxonomy_id, 9606)
+        self.assertEqual(mock_request.call_count, 1)
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_revalidate(self, mock_request):
+        cache = ResponseCache(BASE_URL, ttls={"organisms": 1})
+
+        with patch.object(api_interface, "response_cache", cache):
+            pyrefinebio.Organism.get("HOMO_SAPIENS")
+
+            with patch("pyrefinebio.response_cache.time.time", return_value=1e12):
+                result = pyrefinebio.Organism.get("HOMO_SAPIENS")
+
+        self.assertEqual(result.name, "HOMO_SAPIENS")
+        self.assertEqual(mock_request.call_count, 2)
+        self.assertEqual(mock_request.call_args[1]["headers"]["If-None-Match"], '"v1"')
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_token_key(self, mock_request):
+        cache = ResponseCache(BASE_URL)
+
+        with patch.object(api_interface, "response_cache", cache):
+            with patch.object(api_interface.CONFIG, "token", None):
+                api_interface.get_by_endpoint("computed_files/1")
+                pyrefinebio.Token(id="test-token").agree_to_terms_and_conditions()
+                api_interface.get_by_endpoint("computed_files/1")
+
+        gets = [call for call in mock_request.call_args_list if call[0][0] == "GET"]
+
+        # the response without a token isn't used once a token is activated
+        self.assertEqual(len(gets), 2)
+        self.assertEqual(gets[1][1]["headers"]["API-KEY"], "test-token")
+        self.assertNotIn("If-None-Match", gets[1][1]["headers"])
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
+    def test_uncached_endpoint(self, mock_request):
+        with patch.object(api_interface, "response_cache", ResponseCache(BASE_URL)):
+            api_interface.get_by_endpoint("jobs/processor")
+            api_interface.get_by_endpoint("jobs/processor")
+
+        self.assertEqual(mock_request.call_count, 2)
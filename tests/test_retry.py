@@ -0,0 +1,52 @@
+import unittest
+from unittest.mock import patch
+
+from pyrefinebio.retry import RetryPolicy
+from tests.mocks import MockResponse
+
+
+class RetryPolicyTests(unittest.TestCase):
+    def test_should_retry(self):
+        policy = RetryPolicy(max_retries=2)
+
+        self.assertTrue(policy.should_retry("GET", 0))
+        self.assertTrue(policy.should_retry("get", 1, MockResponse(None, "url", 503)))
+        self.assertFalse(policy.should_retry("GET", 0, MockResponse(None, "url", 200)))
+        self.assertFalse(policy.should_retry("GET", 0, MockResponse(None, "url", 404)))
+        self.assertFalse(policy.should_retry("POST", 0, MockResponse(None, "url", 503)))
+        self.assertFalse(policy.should_retry("GET", 2))
+
+        self.assertEqual(policy.stats()["gave up"], 1)
+
+    def test_backoff(self):
+        policy = RetryPolicy(backoff=1, max_backoff=5, jitter=False)
+
+        self.assertEqual([policy.delay(attempt) for attempt in range(5)], [1, 2, 4, 5, 5])
+
+    @patch("pyrefinebio.retry.random.uniform", side_effect=lambda low, high: high / 2)
+    def test_jitter(self, mock_uniform):
+        policy = RetryPolicy(backoff=1)
+
+        self.assertEqual(policy.delay(2), 2)
+        mock_uniform.assert_called_with(0, 4)
+
+    def test_retry_after(self):
+        policy = RetryPolicy(backoff=1, jitter=False)
+        response = MockResponse(None, "url", 503, {"Retry-After": "30"})
+
+        self.assertEqual(policy.delay(0, response), 30)
+        self.assertEqual(policy.delay(0, MockResponse(None, "url", 503, {})), 1)
+
+    def test_stats(self):
+        policy = RetryPolicy(jitter=False)
+
+        policy.delay(0)
+        policy.delay(1, MockResponse(None, "url", 503))
+        policy.delay(0, MockResponse(None, "url", 503))
+
+        self.assertEqual(
+            policy.stats(), {"retries": 3, "gave up": 0, "connection error": 1, 503: 2}
+        )
+
+        policy.reset_stats()
+        self.assertEqual(policy.stats(), {"retries": 0, "gave up": 0})
@@ -5,7 +5,7 @@ from unittest.mock import patch
 import pyrefinebio
 from pyrefinebio import computed_file as prb_computed_file, original_file as prb_original_file
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 from tests.test_experiment import experiment_search_result_1, experiment_search_result_2
 
 sample_1 = {
@@ -311,28 +311,29 @@ def mock_request(method, url, **kwargs):
 
 
 class SampleTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_sample_get(self, mock_request):
         result = pyrefinebio.Sample.get("SRR5445147")
         self.assertObject(result, sample_1_object_dict)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_sample_500(self, mock_request):
         with self.assertRaises(Exception):
             pyrefinebio.Sample.get(500)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_sample_404(self, mock_request):
         with self.assertRaises(Exception):
             pyrefinebio.Sample.get(0)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_sample_result_is_fully_populated(self, mock_request):
         result = pyrefinebio.Sample.get("SRR5445147")
         self.assertIsNotNone(result.results[1].is_ccdl)
         self.assertIsNotNone(result.results[1].commands)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_sample_search_no_filters(self, mock_request):
         results = pyrefinebio.Sample.search()
 
@@ -362,7 +363,7 @@ class SampleTests(unittest.TestCase, CustomAssertions):
         with self.assertRaises(pyrefinebio.exceptions.MultipleErrors):
             pyrefinebio.Sample.search(age="foo", organism="bar")
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_sample_get_experiments(self, mock_request):
         result = pyrefinebio.Sample.get("SRR5445147")
         experiments = list(result.experiments)
@@ -34,6 +34,7 @@ class ScriptTests(unittest.TestCase):
             False,
             timeout=None,
             notify_me=False,
+            convert=None,
         )
 
     @patch("pyrefinebio.script.hlf.download_dataset")
@@ -62,6 +63,7 @@ class ScriptTests(unittest.TestCase):
             False,
             timeout=None,
             notify_me=True,
+            convert=None,
         )
 
     @patch("pyrefinebio.script.hlf.download_dataset")
@@ -89,6 +91,7 @@ class ScriptTests(unittest.TestCase):
             False,
             timeout=None,
             notify_me=False,
+            convert=None,
         )
 
     @patch("pyrefinebio.script.hlf.download_dataset")
@@ -108,6 +111,7 @@ class ScriptTests(unittest.TestCase):
             False,
             timeout=None,
             notify_me=False,
+            convert=None,
         )
 
     def test_download_dataset_both(self):
@@ -0,0 +1,118 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import patch
+
+import pyrefinebio
+from pyrefinebio import aio
+from pyrefinebio.single_flight import AsyncSingleFlight, SingleFlight
+from tests.mocks import MockResponse
+
+
+def mock_slow_request(method, url, **kwargs):
+    time.sleep(0.2)
+    return MockResponse({"name": "GORILLA", "taxonomy_id": 9593}, url)
+
+
+class SingleFlightTests(unittest.TestCase):
+    def test_coalesce(self):
+        flight = SingleFlight()
+        started = threading.Event()
+        release = threading.Event()
+        calls = []
+
+        def function():
+            calls.append(1)
+            started.set()
+            release.wait()
+            return object()
+
+        with ThreadPoolExecutor(max_workers=5) as executor:
+            leader = executor.submit(flight.do, "key", function)
+            started.wait()
+
+            followers = [executor.submit(flight.do, "key", function) for _ in range(4)]
+
+            while flight.coalesced < 4:
+                time.sleep(0.01)
+
+            release.set()
+            results = [leader.result()] + [f.result() for f in followers]
+
+        self.assertEqual(len(calls), 1)
+        self.assertTrue(all(result is results[0] for result in results))
+
+        # the call is over so the next one runs again
+        flight.do("key", function)
+        self.assertEqual(len(calls), 2)
+
+    def test_errors(self):
+        flight = SingleFlight()
+
+        def function():
+            raise ValueError("bad")
+
+        with self.assertRaises(ValueError):
+            flight.do("key", function)
+
+        self.assertEqual(flight.do("key", lambda: 1), 1)
+
+    def test_async_coalesce(self):
+        flight = AsyncSingleFlight()
+        calls = []
+
+        async def function():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return object()
+
+        async def main():
+            return await asyncio.gather(*[flight.do("key", function) for _ in range(5)])
+
+        results = asyncio.get_event_loop().run_until_complete(main())
+
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.coalesced, 4)
+        self.assertTrue(all(result is results[0] for result in results))
+
+    def test_async_errors(self):
+        flight = AsyncSingleFlight()
+
+        async def function():
+            await asyncio.sleep(0.01)
+            raise ValueError("bad")
+
+        async def main():
+            return await asyncio.gather(
+                *[flight.do("key", function) for _ in range(3)], return_exceptions=True
+            )
+
+        results = asyncio.get_event_loop().run_until_complete(main())
+
+        self.assertTrue(all(isinstance(result, ValueError) for result in results))
+
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_slow_request)
+    def test_concurrent_get(self, mock_request):
+        with ThreadPoolExecutor(max_workers=4) as executor:
+            organisms = list(executor.map(pyrefinebio.Organism.get, ["GORILLA"] * 4))
+
+        self.assertEqual(mock_request.call_count, 1)
+        self.assertTrue(all(organism.taxonomy_id == 9593 for organism in organisms))
+
+    @patch("pyrefinebio.aio._send")
+    def test_aio_concurrent_get(self, mock_send):
+        async def send(method, url, params=None, payload=None, headers=None):
+            await asyncio.sleep(0.05)
+            return aio.Response(url, 200, {}, {"name": "GORILLA"})
+
+        mock_send.side_effect = send
+
+        async def main():
+            return await asyncio.gather(*[aio.Organism.get("GORILLA") for _ in range(3)])
+
+        organisms = asyncio.get_event_loop().run_until_complete(main())
+
+        self.assertEqual(mock_send.call_count, 1)
+        self.assertEqual([organism.name for organism in organisms], ["GORILLA"] * 3)
@@ -35,14 +35,14 @@ class TokenTests(unittest.TestCase, CustomAssertions):
 
         os.environ.pop("REFINEBIO_CONFIG_FILE", None)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_token_create(self, mock_request):
         result = pyrefinebio.Token(email_address="")
         self.assertEqual(result.id, token["id"])
 
     @patch("pyrefinebio.config.yaml.dump")
     @patch("pyrefinebio.config.open")
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_token_save(self, mock_request, mock_open, mock_yaml):
         os.environ["REFINEBIO_CONFIG_FILE"] = "test"
         mock_open.return_value.__enter__.return_value = "file"
@@ -56,11 +56,25 @@ class TokenTests(unittest.TestCase, CustomAssertions):
                 "token": token.id,
                 "base_url": "https://api.refine.bio/v1/",
                 "api_max_calls_per_second": 10,
+                "api_pool_size": 10,
+                "api_rate_limit_path": None,
+                "api_max_retries": 3,
+                "api_retry_backoff": 0.5,
+                "api_retry_statuses": [500, 502, 503, 504],
+                "api_cache_size": 0,
+                "api_cache_path": None,
+                "api_cache_path_size": 10000,
+                "api_cache_ttls": {},
+                "page_size": 1000,
+                "download_workers": 1,
+                "download_chunk_size": 67108864,
+                "download_cache_dir": None,
+                "download_cache_size": 53687091200,
             },
             "file",
         )
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_token_save_creates_file(self, mock_request):
         os.environ["REFINEBIO_CONFIG_FILE"] = "./temp"
 
@@ -84,7 +98,7 @@ class TokenTests(unittest.TestCase, CustomAssertions):
             "Please create a new token using pyrefinebio.Token().",
         )
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_token_save_unactivated(self, mock_request):
         with self.assertRaises(pyrefinebio.exceptions.BadRequest) as br:
             token = pyrefinebio.Token(id="123456789")
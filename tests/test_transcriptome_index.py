@@ -3,7 +3,7 @@ from unittest.mock import Mock, patch
 
 import pyrefinebio
 from tests.custom_assertions import CustomAssertions
-from tests.mocks import MockResponse
+from tests.mocks import MockResponse, no_retries
 
 index_1 = {
     "id": 1,
@@ -55,22 +55,23 @@ def mock_request(method, url, **kwargs):
 
 
 class TranscriptomeIndexTests(unittest.TestCase, CustomAssertions):
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_transcriptome_index_get(self, mock_request):
         result = pyrefinebio.TranscriptomeIndex.get(1)
         self.assertObject(result, index_1)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @no_retries
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_transcriptome_index_500(self, mock_request):
         with self.assertRaises(Exception):
             pyrefinebio.TranscriptomeIndex.get(500)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_transcriptome_index_404(self, mock_request):
         with self.assertRaises(Exception):
             pyrefinebio.TranscriptomeIndex.get(0)
 
-    @patch("pyrefinebio.api_interface.requests.request", side_effect=mock_request)
+    @patch("pyrefinebio.api_interface.requests.Session.request", side_effect=mock_request)
     def test_transcriptome_index_search_no_filters(self, mock_request):
         results = pyrefinebio.TranscriptomeIndex.search()
 